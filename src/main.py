@@ -2,7 +2,8 @@ import logging
 import sys
 import os
 import asyncio
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from fastmcp import FastMCP
 from simplybook.auth.routes import AuthRoutes
 from simplybook.bookings.routes import BookingsRoutes
@@ -17,7 +18,16 @@ from simplybook.notes.routes import NotesRoutes
 from simplybook.products.routes import ProductsRoutes
 from simplybook.subscription.routes import SubscriptionRoutes
 from simplybook.payments.routes import PaymentsRoutes
+from simplybook.health.routes import HealthRoutes
 from simplybook.exceptions import SimplyBookException
+from simplybook.http_client import create_http_client
+from simplybook.auth.client import AuthClient
+from simplybook.auth.token_manager import TokenManager
+from simplybook.auth.token_auth import TokenAuth
+from simplybook.middleware import CorrelationMiddleware
+from simplybook.metrics import is_metrics_enabled
+from simplybook.health.metrics import register_metrics_route
+from simplybook.tracing import configure_tracing, shutdown_tracing
 
 def setup_logging() -> None:
     logging.basicConfig(
@@ -53,27 +63,34 @@ def get_server_config() -> Dict[str, Any]:
 def create_mcp_server() -> FastMCP:
     try:
         mcp = FastMCP("simplybook")
+        # Un ID por invocación de herramienta, propagado hasta las peticiones HTTP
+        mcp.add_middleware(CorrelationMiddleware())
         return mcp
     except Exception as e:
         logging.getLogger(__name__).critical(f"Failed to create MCP server: {str(e)}")
         raise
 
-def register_routers(mcp: FastMCP, company: str, login: str, password: str) -> None:
+def register_routers(mcp: FastMCP, company: str, login: str, password: str,
+                     http_client: Optional[httpx.AsyncClient] = None,
+                     token_manager: Optional[TokenManager] = None) -> None:
     logger = logging.getLogger(__name__)
+    # Un único TokenManager para que todos los routers compartan el token
+    token_manager = token_manager or TokenManager()
     routers = [
         # AuthRoutes ya no se registra como herramienta pública
-        BookingsRoutes(company, login, password),
-        ClientsRoutes(company, login, password),
-        ServicesRoutes(company, login, password),
-        ProvidersRoutes(company, login, password),
-        StatisticsRoutes(company, login, password),
-        TicketsRoutes(company, login, password),
-        MembershipsRoutes(company, login, password),
-        CouponsRoutes(company, login, password),
-        NotesRoutes(company, login, password),
-        ProductsRoutes(company, login, password),
-        SubscriptionRoutes(company, login, password),
-        PaymentsRoutes(company, login, password)
+        BookingsRoutes(company, login, password, http_client, token_manager),
+        ClientsRoutes(company, login, password, http_client, token_manager),
+        ServicesRoutes(company, login, password, http_client, token_manager),
+        ProvidersRoutes(company, login, password, http_client, token_manager),
+        StatisticsRoutes(company, login, password, http_client, token_manager),
+        TicketsRoutes(company, login, password, http_client, token_manager),
+        MembershipsRoutes(company, login, password, http_client, token_manager),
+        CouponsRoutes(company, login, password, http_client, token_manager),
+        NotesRoutes(company, login, password, http_client, token_manager),
+        ProductsRoutes(company, login, password, http_client, token_manager),
+        SubscriptionRoutes(company, login, password, http_client, token_manager),
+        PaymentsRoutes(company, login, password, http_client, token_manager),
+        HealthRoutes(company, login, password, http_client, token_manager)
     ]
 
     for router in routers:
@@ -84,16 +101,50 @@ def register_routers(mcp: FastMCP, company: str, login: str, password: str) -> N
             logger.error(f"Failed to register router {router.__class__.__name__}: {str(e)}")
             raise
 
-async def run_sse_server(mcp: FastMCP, host: str, port: int) -> None:
-    """Ejecuta el servidor SSE"""
+def configure_token_auth(http_client: httpx.AsyncClient, token_manager: TokenManager,
+                         company: str, login: str, password: str) -> None:
+    """Instala en el pool compartido la rotación transparente del token ante un 401"""
+    auth_client = AuthClient(http_client, token_manager)
+    http_client.auth = TokenAuth(
+        token_manager,
+        company,
+        lambda: auth_client.authenticate(company, login, password)
+    )
+
+def start_token_refresh(token_manager: TokenManager, http_client: Optional[httpx.AsyncClient],
+                        company: str, login: str, password: str) -> None:
+    """Inicia la renovación del token en segundo plano (login inicial incluido)"""
+    auth_client = AuthClient(http_client, token_manager)
+    token_manager.start_auto_refresh(
+        company,
+        lambda refresh_token: auth_client.refresh_token(company, refresh_token),
+        lambda: auth_client.authenticate(company, login, password)
+    )
+
+async def run_sse_server(mcp: FastMCP, host: str, port: int,
+                         http_client: Optional[httpx.AsyncClient] = None,
+                         token_manager: Optional[TokenManager] = None,
+                         credentials: Optional[tuple] = None) -> None:
+    """Ejecuta el servidor SSE y libera los recursos compartidos al terminar"""
     logger = logging.getLogger(__name__)
     logger.info(f"Starting SSE server on {host}:{port}")
     
+    if token_manager is not None and credentials is not None:
+        start_token_refresh(token_manager, http_client, *credentials)
+    
     # Agregar un delay para asegurar que el servidor esté completamente inicializado
     await asyncio.sleep(1)
     logger.info("Server initialization complete, ready to accept connections")
     
-    await mcp.run_async(transport="sse", host=host, port=port)
+    try:
+        await mcp.run_async(transport="sse", host=host, port=port)
+    finally:
+        if token_manager is not None:
+            await token_manager.stop_auto_refresh()
+        if http_client is not None:
+            logger.info("Closing shared HTTP connection pool...")
+            await http_client.aclose()
+        shutdown_tracing()
 
 def main() -> None:
     setup_logging()
@@ -109,15 +160,31 @@ def main() -> None:
         logger.info("Credentials loaded successfully")
         logger.info(f"SSE Server configuration: {config}")
         
+        # Trazas OpenTelemetry opcionales (SIMPLYBOOK_TRACING_ENABLED)
+        configure_tracing()
+        
         mcp = create_mcp_server()
         
+        # Pool de conexiones HTTP y cache de tokens compartidos por todos los clientes
+        http_client = create_http_client()
+        token_manager = TokenManager()
+        configure_token_auth(http_client, token_manager, company, login, password)
+        
         logger.info("Registering routers...")
-        register_routers(mcp, company, login, password)
+        register_routers(mcp, company, login, password, http_client, token_manager)
         logger.info("All routers registered successfully")
         
+        # Métricas en formato Prometheus en GET /metrics, servidas por la misma app SSE
+        if is_metrics_enabled():
+            register_metrics_route(mcp, http_client)
+            logger.info("Prometheus metrics available at /metrics")
+        
         # Ejecutar servidor SSE
         logger.info(f"Starting SSE server on port {config['port']}...")
-        asyncio.run(run_sse_server(mcp, config['host'], config['port']))
+        asyncio.run(run_sse_server(
+            mcp, config['host'], config['port'],
+            http_client, token_manager, (company, login, password)
+        ))
             
     except Exception as e:
         logger.critical(f"Fatal error: {str(e)}")
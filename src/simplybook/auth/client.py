@@ -1,21 +1,26 @@
 import httpx
-import json
-import os
-import tempfile
-import time
 import asyncio
+import logging
 from typing import Dict, Any, Optional
 from ..http_client import LoggingHTTPClient
+from ..endpoints import get_base_url, endpoint_url
+from ..tracing import traced_client
+from ..retry import retry_policy
+from ..exceptions import CircuitOpenError, DeadlineExceededError
+from .token_manager import TokenManager
 
+@traced_client
 class AuthClient:
-    def __init__(self):
-        self.base_url = "https://user-api-v2.simplybook.me"
-        self.auth_url = "https://user-api-v2.simplybook.me/admin/auth"
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None,
+                 token_manager: Optional[TokenManager] = None):
+        self.http_client = http_client
+        # Cache de tokens en memoria; se comparte entre routers cuando se inyecta
+        self.token_manager = token_manager or TokenManager()
+        self.base_url = get_base_url()
+        self.auth_url = endpoint_url("auth")
         self.token_file = None
-        self.last_request_time = 0
-        self.min_request_interval = 1.0  # 1 segundo entre solicitudes
         self.max_retries = 3
-        self.retry_delay = 5.0  # 5 segundos entre reintentos
+        self.logger = logging.getLogger(__name__)
 
     async def authenticate(self, company: str, login: str, password: str) -> Dict[str, Any]:
         """
@@ -35,25 +40,29 @@ class AuthClient:
         """
         for attempt in range(self.max_retries):
             try:
-                await self._rate_limit()
-                
                 async with LoggingHTTPClient(self.base_url, {
                     "Content-Type": "application/json",
                     "User-Agent": "SimplyBook-MCP/1.0"
-                }) as client:
+                }, self.http_client) as client:
+                    # El login no tiene efectos secundarios: los errores de red y 5xx
+                    # los reintenta la política global con backoff
                     response = await client.post(
                         "/admin/auth",
                         json={
                             "company": company,
                             "login": login,
                             "password": password
-                        }
+                        },
+                        idempotent=True
                     )
                     
                     if response.status_code == 403:
                         if attempt < self.max_retries - 1:
-                            print(f"⚠️  Error 403 en intento {attempt + 1}, reintentando en {self.retry_delay} segundos...")
-                            await asyncio.sleep(self.retry_delay)
+                            # SimplyBook responde 403 al limitar los logins; el limitador
+                            # global ya redujo la tasa, esperar con backoff y reintentar
+                            delay = retry_policy.backoff(attempt)
+                            self.logger.warning(f"Auth 403 on attempt {attempt + 1}, retrying in {delay:.2f}s")
+                            await asyncio.sleep(delay)
                             self.clear_token(company)
                             continue
                         else:
@@ -68,11 +77,12 @@ class AuthClient:
                     
                     if "token" in result:
                         token = result["token"]
-                        self._save_token(company, token)
+                        self._save_token(company, token, result.get("refresh_token"))
                         
                         return {
                             "success": True,
                             "token": token,
+                            "refresh_token": result.get("refresh_token"),
                             "message": "Autenticación exitosa",
                             "token_file": self._get_token_file_path(company)
                         }
@@ -83,17 +93,16 @@ class AuthClient:
                             "error": result.get("error", "No se recibió token en la respuesta")
                         }
                         
+            except (CircuitOpenError, DeadlineExceededError):
+                raise
             except Exception as e:
-                if attempt < self.max_retries - 1:
-                    print(f"⚠️  Error de conexión en intento {attempt + 1}, reintentando en {self.retry_delay} segundos...")
-                    await asyncio.sleep(self.retry_delay)
-                    continue
-                else:
-                    return {
-                        "success": False,
-                        "message": "Error de conexión",
-                        "error": str(e)
-                    }
+                # Los reintentos de red ya los agotó la política global de LoggingHTTPClient
+                self.logger.error(f"Auth connection error for {company}: {str(e)}")
+                return {
+                    "success": False,
+                    "message": "Error de conexión",
+                    "error": str(e)
+                }
 
     async def authenticate_2fa(self, company: str, session_id: str, code: str, type_2fa: str) -> Dict[str, Any]:
         """
@@ -112,12 +121,10 @@ class AuthClient:
             AccessDenied: Si el acceso es denegado
             BadRequest: Si los datos proporcionados son inválidos
         """
-        await self._rate_limit()
-        
         async with LoggingHTTPClient(self.base_url, {
             "Content-Type": "application/json",
             "User-Agent": "SimplyBook-MCP/1.0"
-        }) as client:
+        }, self.http_client) as client:
             response = await client.post(
                 "/admin/auth/2fa",
                 json={
@@ -142,12 +149,10 @@ class AuthClient:
             AccessDenied: Si el acceso es denegado
             BadRequest: Si los datos proporcionados son inválidos
         """
-        await self._rate_limit()
-        
         async with LoggingHTTPClient(self.base_url, {
             "Content-Type": "application/json",
             "User-Agent": "SimplyBook-MCP/1.0"
-        }) as client:
+        }, self.http_client) as client:
             response = await client.get(
                 "/admin/auth/sms",
                 params={
@@ -172,12 +177,10 @@ class AuthClient:
             AccessDenied: Si el acceso es denegado
             BadRequest: Si los datos proporcionados son inválidos
         """
-        await self._rate_limit()
-        
         async with LoggingHTTPClient(self.base_url, {
             "Content-Type": "application/json",
             "User-Agent": "SimplyBook-MCP/1.0"
-        }) as client:
+        }, self.http_client) as client:
             response = await client.post(
                 "/admin/auth/refresh-token",
                 json={
@@ -189,7 +192,8 @@ class AuthClient:
             result = response.json()
             
             if "token" in result:
-                self._save_token(company, result["token"])
+                # SimplyBook puede rotar el refresh_token; conservar el anterior si no lo hace
+                self._save_token(company, result["token"], result.get("refresh_token") or refresh_token)
             
             return result
 
@@ -205,10 +209,8 @@ class AuthClient:
             AccessDenied: Si el acceso es denegado
             BadRequest: Si los datos proporcionados son inválidos
         """
-        await self._rate_limit()
-        
         headers = self.get_auth_headers(company)
-        async with LoggingHTTPClient(self.base_url, headers) as client:
+        async with LoggingHTTPClient(self.base_url, headers, self.http_client) as client:
             response = await client.post(
                 "/admin/auth/logout",
                 json={
@@ -220,50 +222,15 @@ class AuthClient:
 
     def _get_token_file_path(self, company: str) -> str:
         """Obtiene la ruta del archivo temporal para almacenar el token"""
-        temp_dir = tempfile.gettempdir()
-        return os.path.join(temp_dir, f"simplybook_token_{company}.json")
-        
-    def _save_token(self, company: str, token: str) -> None:
-        """Guarda el token en un archivo temporal"""
-        token_data = {
-            "company": company,
-            "token": token,
-            "timestamp": str(int(time.time())),
-            "created_at": time.time()
-        }
-        token_file_path = self._get_token_file_path(company)
+        return self.token_manager.get_token_file_path(company)
         
-        with open(token_file_path, 'w') as f:
-            json.dump(token_data, f)
+    def _save_token(self, company: str, token: str, refresh_token: Optional[str] = None) -> None:
+        """Guarda el token y su refresh_token en memoria (y en disco para arranques en caliente)"""
+        self.token_manager.set_token(company, token, refresh_token)
             
     def _load_token(self, company: str) -> Optional[str]:
-        """Carga el token desde el archivo temporal"""
-        token_file_path = self._get_token_file_path(company)
-        
-        if os.path.exists(token_file_path):
-            try:
-                with open(token_file_path, 'r') as f:
-                    token_data = json.load(f)
-                    # Verificar si el token no es muy antiguo (máximo 1 hora)
-                    created_at = token_data.get("created_at", 0)
-                    if time.time() - created_at < 3600:  # 1 hora
-                        return token_data.get("token")
-                    else:
-                        # Token muy antiguo, eliminarlo
-                        self.clear_token(company)
-            except (json.JSONDecodeError, KeyError):
-                pass
-        return None
-        
-    async def _rate_limit(self):
-        """Implementa rate limiting para evitar errores 403"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            await asyncio.sleep(self.min_request_interval - time_since_last)
-            
-        self.last_request_time = time.time()
+        """Carga el token vigente desde la cache en memoria"""
+        return self.token_manager.get_token(company)
         
     def get_auth_headers(self, company: str) -> Dict[str, str]:
         """
@@ -295,11 +262,4 @@ class AuthClient:
         Returns:
             True si se eliminó correctamente
         """
-        token_file_path = self._get_token_file_path(company)
-        if os.path.exists(token_file_path):
-            try:
-                os.remove(token_file_path)
-                return True
-            except OSError:
-                return False
-        return True
\ No newline at end of file
+        return self.token_manager.clear_token(company)
\ No newline at end of file
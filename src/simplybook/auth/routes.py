@@ -1,11 +1,14 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from ..base_routes import BaseRoutes
 from .client import AuthClient
+from .token_manager import TokenManager
 
 class AuthRoutes(BaseRoutes):
-    def __init__(self):
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None,
+                 token_manager: Optional[TokenManager] = None):
         # AuthRoutes no necesita credenciales iniciales
-        self.auth_client = AuthClient()
+        self.auth_client = AuthClient(http_client, token_manager)
     
     def register_tools(self, mcp):
         # No se registran herramientas públicas de autenticación
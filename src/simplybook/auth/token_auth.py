@@ -0,0 +1,62 @@
+import httpx
+from typing import Dict, Any, Callable, Awaitable, AsyncGenerator
+from .token_manager import TokenManager
+
+
+def is_token_rejected(response: httpx.Response) -> bool:
+    """Detectar respuestas de token inválido o expirado"""
+    if response.status_code == 401:
+        return True
+    if response.status_code == 403:
+        # SimplyBook.me responde 403 con un mensaje de token cuando lo revoca
+        return "token" in response.text.lower()
+    return False
+
+
+class TokenAuth(httpx.Auth):
+    """
+    Autenticación httpx para el pool compartido que rota el token ante un 401
+
+    Se instala en el httpx.AsyncClient compartido, por lo que aplica a todas las
+    peticiones autenticadas (las que llevan X-Token) de cualquier cliente. Usa
+    siempre el token vigente del TokenManager y, si la API lo rechaza, invalida
+    el token, se re-autentica una sola vez y repite la petición.
+    """
+
+    requires_response_body = True
+
+    def __init__(self, token_manager: TokenManager, company: str,
+                 authenticate: Callable[[], Awaitable[Dict[str, Any]]]):
+        """
+        Args:
+            token_manager: Cache de tokens compartida
+            company: Company login
+            authenticate: Corrutina que realiza el login y guarda el token
+        """
+        self.token_manager = token_manager
+        self.company = company
+        self.authenticate = authenticate
+
+    async def async_auth_flow(self, request: httpx.Request) -> AsyncGenerator[httpx.Request, httpx.Response]:
+        # Las peticiones de /admin/auth no llevan X-Token y no se reintentan
+        if "X-Token" not in request.headers:
+            yield request
+            return
+
+        token = self.token_manager.get_token(self.company)
+        if token:
+            request.headers["X-Token"] = token
+
+        response = yield request
+
+        if not is_token_rejected(response):
+            return
+
+        new_token = await self.token_manager.reauthenticate(
+            self.company,
+            request.headers["X-Token"],
+            self.authenticate
+        )
+        if new_token:
+            request.headers["X-Token"] = new_token
+            yield request
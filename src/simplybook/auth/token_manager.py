@@ -0,0 +1,328 @@
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Dict, Any, Optional, Callable, Awaitable
+
+from ..metrics import auth_refreshes
+
+
+def get_token_config() -> Dict[str, float]:
+    """
+    Obtener configuración de vida y renovación del token desde variables de entorno
+    
+    Variables:
+        SIMPLYBOOK_TOKEN_TTL: Vida útil del token en segundos (default: 3600)
+        SIMPLYBOOK_TOKEN_REFRESH_MARGIN: Segundos antes de expirar en que se renueva (default: 300)
+        SIMPLYBOOK_TOKEN_RETRY_DELAY: Espera tras una renovación fallida (default: 30)
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    return {
+        "ttl": _float('SIMPLYBOOK_TOKEN_TTL', 3600.0),
+        "refresh_margin": _float('SIMPLYBOOK_TOKEN_REFRESH_MARGIN', 300.0),
+        "retry_delay": _float('SIMPLYBOOK_TOKEN_RETRY_DELAY', 30.0)
+    }
+
+
+class TokenManager:
+    """
+    Cache en memoria de los tokens de SimplyBook.me compartido por todos los routers
+
+    El token vive en memoria; el archivo temporal solo se usa para arrancar en
+    caliente (se lee una única vez por empresa) y se escribe al obtener un token
+    nuevo. Un lock por empresa garantiza que, cuando el token expira, solo una
+    corrutina se autentique mientras las demás esperan su resultado.
+
+    Con start_auto_refresh() una tarea en segundo plano renueva el token con el
+    refresh_token antes de que expire, de modo que las llamadas de herramientas
+    nunca pagan la latencia del login.
+    """
+
+    def __init__(self, max_age: Optional[float] = None, persist: bool = True,
+                 refresh_margin: Optional[float] = None):
+        """
+        Args:
+            max_age: Antigüedad máxima del token en segundos (default: SIMPLYBOOK_TOKEN_TTL)
+            persist: Guardar el token en disco para arranques en caliente
+            refresh_margin: Segundos antes de expirar en que se renueva el token
+        """
+        config = get_token_config()
+        self.max_age = max_age if max_age is not None else config["ttl"]
+        self.refresh_margin = refresh_margin if refresh_margin is not None else config["refresh_margin"]
+        self.retry_delay = config["retry_delay"]
+        self.persist = persist
+        self.logger = logging.getLogger(__name__)
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._warm_started: set = set()
+        self._refresh_tasks: Dict[str, asyncio.Task] = {}
+
+    def get_token_file_path(self, company: str) -> str:
+        """Obtiene la ruta del archivo temporal para almacenar el token"""
+        temp_dir = tempfile.gettempdir()
+        return os.path.join(temp_dir, f"simplybook_token_{company}.json")
+
+    def get_token(self, company: str) -> Optional[str]:
+        """
+        Obtiene el token vigente desde memoria
+
+        Args:
+            company: Company login
+
+        Returns:
+            El token o None si no existe o expiró
+        """
+        entry = self._tokens.get(company)
+
+        if entry is None and company not in self._warm_started:
+            self._warm_started.add(company)
+            entry = self._load_from_disk(company)
+            if entry is not None:
+                self._tokens[company] = entry
+
+        if entry is None:
+            return None
+
+        if time.time() - entry.get("created_at", 0) >= self.max_age:
+            # Token muy antiguo, eliminarlo
+            self.clear_token(company)
+            return None
+
+        return entry.get("token")
+
+    def get_refresh_token(self, company: str) -> Optional[str]:
+        """Obtiene el refresh_token asociado al token vigente"""
+        entry = self._tokens.get(company)
+        return entry.get("refresh_token") if entry else None
+
+    def seconds_until_refresh(self, company: str) -> float:
+        """
+        Segundos que faltan para renovar el token (0 si no hay token o ya toca)
+
+        Args:
+            company: Company login
+        """
+        if self.get_token(company) is None:
+            return 0.0
+        entry = self._tokens[company]
+        refresh_at = entry.get("created_at", 0) + self.max_age - self.refresh_margin
+        return max(0.0, refresh_at - time.time())
+
+    def set_token(self, company: str, token: str, refresh_token: Optional[str] = None) -> None:
+        """
+        Guarda el token en memoria y, si está habilitado, en disco
+
+        Args:
+            company: Company login
+            token: Token obtenido en la autenticación
+            refresh_token: Refresh token del TokenEntity para renovar sin password
+        """
+        entry = {
+            "company": company,
+            "token": token,
+            "refresh_token": refresh_token,
+            "timestamp": str(int(time.time())),
+            "created_at": time.time()
+        }
+        self._tokens[company] = entry
+        self._warm_started.add(company)
+
+        if self.persist:
+            self._save_to_disk(company, entry)
+
+    def clear_token(self, company: str) -> bool:
+        """
+        Elimina el token de memoria y de disco
+
+        Args:
+            company: Company login
+
+        Returns:
+            True si se eliminó correctamente
+        """
+        self._tokens.pop(company, None)
+        token_file_path = self.get_token_file_path(company)
+        if os.path.exists(token_file_path):
+            try:
+                os.remove(token_file_path)
+                return True
+            except OSError:
+                return False
+        return True
+
+    async def get_or_authenticate(self, company: str,
+                                  authenticate: Callable[[], Awaitable[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Devuelve el token vigente o se autentica una sola vez (single-flight)
+
+        Si varias corrutinas llegan sin token, solo la primera ejecuta
+        authenticate(); las demás esperan el lock y reutilizan el token obtenido.
+
+        Args:
+            company: Company login
+            authenticate: Corrutina que realiza la autenticación y guarda el token
+
+        Returns:
+            El token vigente o None si la autenticación falló
+        """
+        token = self.get_token(company)
+        if token:
+            return token
+
+        async with self._get_lock(company):
+            # Otra corrutina pudo haberse autenticado mientras esperábamos
+            token = self.get_token(company)
+            if token:
+                return token
+
+            await authenticate()
+            return self._count_refresh("login", self.get_token(company))
+
+    async def reauthenticate(self, company: str, stale_token: Optional[str],
+                             authenticate: Callable[[], Awaitable[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Invalida un token rechazado por la API y se autentica una sola vez
+
+        Si varias peticiones reciben 401 con el mismo token, solo la primera
+        hace login; las demás encuentran el token ya rotado y lo reutilizan.
+
+        Args:
+            company: Company login
+            stale_token: Token que la API rechazó
+            authenticate: Corrutina que realiza la autenticación y guarda el token
+
+        Returns:
+            El nuevo token o None si la autenticación falló
+        """
+        async with self._get_lock(company):
+            current = self.get_token(company)
+            if current and current != stale_token:
+                return current
+
+            self.logger.warning(f"Token rejected by SimplyBook for {company}, re-authenticating")
+            self.clear_token(company)
+            await authenticate()
+            return self._count_refresh("token_rejected", self.get_token(company))
+
+    def start_auto_refresh(self, company: str,
+                           refresh: Callable[[str], Awaitable[Dict[str, Any]]],
+                           authenticate: Callable[[], Awaitable[Dict[str, Any]]]) -> asyncio.Task:
+        """
+        Inicia la tarea en segundo plano que mantiene el token siempre vigente
+
+        Si no hay token se autentica de inmediato (arranque en caliente); luego
+        renueva con el refresh_token refresh_margin segundos antes de expirar y,
+        si la renovación falla, vuelve a hacer login con password.
+
+        Args:
+            company: Company login
+            refresh: Corrutina que recibe el refresh_token y guarda el nuevo token
+            authenticate: Corrutina que realiza el login completo y guarda el token
+
+        Returns:
+            La tarea de asyncio creada
+        """
+        task = self._refresh_tasks.get(company)
+        if task is None or task.done():
+            task = asyncio.create_task(self._auto_refresh_loop(company, refresh, authenticate))
+            self._refresh_tasks[company] = task
+        return task
+
+    async def stop_auto_refresh(self) -> None:
+        """Detiene todas las tareas de renovación en segundo plano"""
+        tasks = list(self._refresh_tasks.values())
+        self._refresh_tasks.clear()
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def refresh(self, company: str,
+                      refresh: Callable[[str], Awaitable[Dict[str, Any]]],
+                      authenticate: Callable[[], Awaitable[Dict[str, Any]]]) -> Optional[str]:
+        """
+        Renueva el token ahora, con el refresh_token o con login completo
+
+        Comparte el lock con get_or_authenticate(), así que nunca hay una
+        renovación y un login en paralelo para la misma empresa.
+
+        Returns:
+            El nuevo token o None si no se pudo renovar
+        """
+        async with self._get_lock(company):
+            # Otra corrutina pudo haber renovado mientras esperábamos
+            if self.get_token(company) and self.seconds_until_refresh(company) > 0:
+                return self.get_token(company)
+
+            refresh_token = self.get_refresh_token(company)
+            if refresh_token:
+                try:
+                    await refresh(refresh_token)
+                    token = self.get_token(company)
+                    if token and self.seconds_until_refresh(company) > 0:
+                        return self._count_refresh("refresh", token)
+                    self._count_refresh("refresh", None)
+                except Exception as e:
+                    self._count_refresh("refresh", None)
+                    self.logger.warning(f"Token refresh failed for {company}, falling back to login: {str(e)}")
+
+            await authenticate()
+            return self._count_refresh("refresh_fallback", self.get_token(company))
+
+    async def _auto_refresh_loop(self, company: str,
+                                 refresh: Callable[[str], Awaitable[Dict[str, Any]]],
+                                 authenticate: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+        while True:
+            await asyncio.sleep(self.seconds_until_refresh(company))
+            try:
+                token = await self.refresh(company, refresh, authenticate)
+            except Exception as e:
+                self.logger.error(f"Background token refresh error for {company}: {str(e)}")
+                token = None
+
+            if token is None or self.seconds_until_refresh(company) == 0:
+                # Evitar un bucle cerrado si SimplyBook rechaza la renovación
+                await asyncio.sleep(self.retry_delay)
+
+    @staticmethod
+    def _count_refresh(reason: str, token: Optional[str]) -> Optional[str]:
+        """Contar una obtención de token para /metrics y devolver el token"""
+        auth_refreshes.inc(reason=reason, result="success" if token else "failure")
+        return token
+
+    def _get_lock(self, company: str) -> asyncio.Lock:
+        lock = self._locks.get(company)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._locks[company] = lock
+        return lock
+
+    def _save_to_disk(self, company: str, entry: Dict[str, Any]) -> None:
+        try:
+            with open(self.get_token_file_path(company), 'w') as f:
+                json.dump(entry, f)
+        except OSError:
+            pass
+
+    def _load_from_disk(self, company: str) -> Optional[Dict[str, Any]]:
+        token_file_path = self.get_token_file_path(company)
+
+        if os.path.exists(token_file_path):
+            try:
+                with open(token_file_path, 'r') as f:
+                    token_data = json.load(f)
+                if token_data.get("token"):
+                    return token_data
+            except (json.JSONDecodeError, KeyError, OSError):
+                pass
+        return None
@@ -0,0 +1,284 @@
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Iterable, Tuple, TypeVar, Set
+
+import httpx
+
+T = TypeVar("T")
+
+
+def get_slot_search_concurrency() -> int:
+    """Consultas de disponibilidad en paralelo al buscar en varios proveedores (SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY, default: 4)"""
+    try:
+        return max(1, int(os.getenv('SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY', 4)))
+    except ValueError:
+        return 4
+
+
+def get_timeline_window_days() -> int:
+    """Días pedidos en cada llamada a /timeline/slots al buscar en un rango (SIMPLYBOOK_TIMELINE_WINDOW_DAYS, default: 7)"""
+    try:
+        return max(1, int(os.getenv('SIMPLYBOOK_TIMELINE_WINDOW_DAYS', 7)))
+    except ValueError:
+        return 7
+
+
+def split_date_range(date_from: str, date_to: str, window_days: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Dividir un rango de fechas en ventanas consecutivas
+
+    Args:
+        date_from: Fecha inicial (YYYY-MM-DD)
+        date_to: Fecha final inclusive (YYYY-MM-DD)
+        window_days: Días por ventana (default: SIMPLYBOOK_TIMELINE_WINDOW_DAYS)
+
+    Returns:
+        Lista de tuplas (desde, hasta) con fechas YYYY-MM-DD, en orden
+
+    Raises:
+        ValueError: Si las fechas no son válidas o date_to es anterior a date_from
+    """
+    start = date.fromisoformat(date_from)
+    end = date.fromisoformat(date_to)
+    if end < start:
+        raise ValueError("date_to no puede ser anterior a date_from")
+    step = timedelta(days=window_days or get_timeline_window_days())
+    windows = []
+    while start <= end:
+        window_end = min(start + step - timedelta(days=1), end)
+        windows.append((start.isoformat(), window_end.isoformat()))
+        start = window_end + timedelta(days=1)
+    return windows
+
+
+def timeline_free_slots(timeline: Any) -> List[Dict[str, Any]]:
+    """
+    Turnos libres de una respuesta de /timeline/slots
+
+    Cada Timeline_SlotsDateEntity trae {"date", "slots": [{"time",
+    "available_count", ...}]}; se devuelven los turnos con lugar libre
+    como {"date", "time", "available_count"}.
+    """
+    slots = []
+    for day in timeline or []:
+        for slot in day.get("slots") or []:
+            available = slot.get("available_count")
+            if available is None or available > 0:
+                slots.append({"date": day.get("date"), "time": slot.get("time"), "available_count": available})
+    return slots
+
+
+async def gather_limited(factories: Iterable[Callable[[], Awaitable[T]]],
+                         concurrency: int) -> List[T]:
+    """
+    Ejecutar corrutinas con como máximo `concurrency` a la vez
+
+    Devuelve los resultados en el orden de `factories`. Ante el primer
+    error se cancelan las pendientes y se propaga la excepción.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    tasks = [asyncio.ensure_future(run(factory)) for factory in factories]
+    try:
+        return list(await asyncio.gather(*tasks))
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+def booked_slots(*entities: Any) -> Set[Tuple[str, str]]:
+    """
+    Proveedores y fechas ocupados por reservas
+
+    Acepta BookingEntity, AdminBookingBuildEntity (provider_id y
+    start_datetime) y BookingResultEntity ({"bookings": [...]}).
+
+    Returns:
+        Conjunto de tuplas (ID de proveedor, fecha YYYY-MM-DD)
+    """
+    found = set()
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+        for booking in [entity, *(entity.get("bookings") or [])]:
+            if not isinstance(booking, dict):
+                continue
+            provider = booking.get("provider")
+            provider_id = booking.get("provider_id") or (provider.get("id") if isinstance(provider, dict) else None)
+            start = booking.get("start_datetime")
+            if provider_id is not None and isinstance(start, str) and len(start) >= 10:
+                found.add((str(provider_id), start[:10]))
+    return found
+
+
+def blocked_slots(*notes: Any) -> Optional[Set[Tuple[str, str]]]:
+    """
+    Proveedores y fechas que bloquean las notas del calendario
+
+    Acepta CalendarNoteEntity o los datos enviados para crearla
+    (provider_id, start_date_time, end_date_time). Las notas con
+    time_blocked falso no bloquean horario.
+
+    Returns:
+        Conjunto de tuplas (ID de proveedor, fecha YYYY-MM-DD), o None si
+        alguna nota bloquea a todos los proveedores
+    """
+    found = set()
+    for note in notes:
+        if not isinstance(note, dict) or note.get("time_blocked") is False:
+            continue
+        provider = note.get("provider")
+        provider_id = note.get("provider_id") or (provider.get("id") if isinstance(provider, dict) else None)
+        try:
+            start = date.fromisoformat(str(note.get("start_date_time"))[:10])
+            end = date.fromisoformat(str(note.get("end_date_time") or note.get("start_date_time"))[:10])
+        except ValueError:
+            continue
+        if provider_id is None:
+            return None
+        while start <= end:
+            found.add((str(provider_id), start.isoformat()))
+            start += timedelta(days=1)
+    return found
+
+
+def slot_start(slot: Dict[str, Any]) -> str:
+    """
+    Inicio de un turno como texto ordenable ("YYYY-MM-DD HH:MM:SS")
+
+    TimeSlotEntity trae "date" y "time"; algunas respuestas solo traen el
+    inicio completo en "id".
+    """
+    if slot.get("date") and slot.get("time"):
+        return f"{slot['date']} {slot['time']}"
+    return str(slot.get("id") or slot.get("time") or "")
+
+
+async def search_providers(fetch_slots: Callable[[str], Awaitable[List[Dict[str, Any]]]],
+                           provider_ids: Iterable[str],
+                           concurrency: Optional[int] = None) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Consultar los turnos libres de varios proveedores en paralelo y unirlos
+
+    Como máximo `concurrency` consultas a la vez. Un proveedor que responde
+    con error HTTP no invalida la búsqueda: su error se devuelve aparte. Los
+    demás errores (circuito abierto, tiempo límite agotado) cancelan las
+    consultas pendientes y se propagan.
+
+    Args:
+        fetch_slots: Corrutina que recibe el ID de proveedor y devuelve sus turnos
+        provider_ids: IDs de los proveedores a consultar
+        concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+
+    Returns:
+        Tupla (turnos ordenados por inicio con su "provider_id", errores por proveedor)
+    """
+    provider_ids = list(dict.fromkeys(str(provider_id) for provider_id in provider_ids))
+    errors: Dict[str, str] = {}
+
+    async def fetch(provider_id: str) -> List[Dict[str, Any]]:
+        try:
+            slots = await fetch_slots(provider_id)
+        except httpx.HTTPStatusError as e:
+            errors[provider_id] = f"HTTP {e.response.status_code}"
+            return []
+        return [{**slot, "provider_id": provider_id} for slot in slots or []]
+
+    results = await gather_limited(
+        [lambda provider_id=provider_id: fetch(provider_id) for provider_id in provider_ids],
+        concurrency or get_slot_search_concurrency()
+    )
+
+    slots = [slot for provider_slots in results for slot in provider_slots]
+    # sorted es estable: a igual horario se conserva el orden de los proveedores
+    slots.sort(key=slot_start)
+    return slots, errors
+
+
+def date_horizon(date_from: Optional[str], days: int) -> List[str]:
+    """Fechas YYYY-MM-DD de `days` días consecutivos a partir de date_from (default: hoy)"""
+    start = date.fromisoformat(date_from) if date_from else date.today()
+    return [(start + timedelta(days=offset)).isoformat() for offset in range(days)]
+
+
+async def earliest_slots(fetch_slots: Callable[[str, str], Awaitable[List[Dict[str, Any]]]],
+                         provider_ids: Iterable[str],
+                         dates: List[str],
+                         limit: int,
+                         concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Buscar los primeros `limit` turnos libres entre varios proveedores y días
+
+    Lanza una consulta por proveedor y día (como máximo `concurrency` a la
+    vez, los días más próximos primero). Cuando todas las consultas hasta un
+    día terminaron y ya suman `limit` turnos, ningún día posterior puede
+    aportar uno más temprano: las consultas pendientes se cancelan.
+
+    Args:
+        fetch_slots: Corrutina que recibe (ID de proveedor, fecha) y devuelve los turnos del día
+        provider_ids: IDs de los proveedores a consultar
+        dates: Fechas a consultar, en orden (YYYY-MM-DD)
+        limit: Cantidad de turnos buscada
+        concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+
+    Returns:
+        Dict con "slots" (hasta `limit`, ordenados por horario, con provider_id),
+        "errors" (por "proveedor@fecha") y "probes" (consultas planificadas, completadas y canceladas)
+    """
+    provider_ids = list(dict.fromkeys(str(provider_id) for provider_id in provider_ids))
+    semaphore = asyncio.Semaphore(concurrency or get_slot_search_concurrency())
+    errors: Dict[str, str] = {}
+
+    async def probe(provider_id: str, day: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                slots = await fetch_slots(provider_id, day)
+            except httpx.HTTPStatusError as e:
+                errors[f"{provider_id}@{day}"] = f"HTTP {e.response.status_code}"
+                return []
+        return [{**slot, "provider_id": provider_id} for slot in slots or []]
+
+    # Creadas en orden de día: el semáforo atiende primero los días más próximos
+    tasks_by_day = [[asyncio.ensure_future(probe(provider_id, day)) for provider_id in provider_ids]
+                    for day in dates]
+    tasks = [task for day_tasks in tasks_by_day for task in day_tasks]
+    found: List[Dict[str, Any]] = []
+    confirmed_days = 0
+    try:
+        pending = set(tasks)
+        while pending and len(found) < limit:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                # Circuito abierto o tiempo límite agotado: cortar toda la búsqueda
+                if task.exception() is not None:
+                    raise task.exception()
+            # Avanzar sobre los días completos; el primero con consultas en curso corta
+            while confirmed_days < len(tasks_by_day) and all(t.done() for t in tasks_by_day[confirmed_days]):
+                for task in tasks_by_day[confirmed_days]:
+                    found.extend(task.result())
+                confirmed_days += 1
+                if len(found) >= limit:
+                    break
+    finally:
+        cancelled = [task for task in tasks if not task.done()]
+        for task in cancelled:
+            task.cancel()
+        await asyncio.gather(*cancelled, return_exceptions=True)
+
+    found.sort(key=slot_start)
+    return {
+        "slots": found[:limit],
+        "errors": errors,
+        "probes": {
+            "planned": len(tasks),
+            "completed": len(tasks) - len(cancelled),
+            "cancelled": len(cancelled)
+        }
+    }
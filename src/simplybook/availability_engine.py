@@ -0,0 +1,304 @@
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Awaitable, Iterable, Tuple
+
+from .availability import gather_limited, get_slot_search_concurrency
+from .pagination import split_page, collect_items
+
+# Intervalo de tiempo [inicio, fin)
+Interval = Tuple[datetime, datetime]
+
+_START_KEYS = ("start_datetime", "start_date_time", "date_start")
+_END_KEYS = ("end_datetime", "end_date_time", "date_end")
+
+
+def parse_datetime(value: Any) -> Optional[datetime]:
+    """Fecha y hora de la API ("YYYY-MM-DD HH:MM:SS" o ISO 8601) o None si no es válida"""
+    if not isinstance(value, str) or len(value) < 16:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("T", " ")[:19])
+    except ValueError:
+        return None
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Ordenar y unir intervalos superpuestos o contiguos"""
+    merged: List[Interval] = []
+    for start, end in sorted(interval for interval in intervals if interval[0] < interval[1]):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_intervals(free: Iterable[Interval], busy: Iterable[Interval]) -> List[Interval]:
+    """Quitar de `free` los tramos ocupados por `busy`"""
+    busy = merge_intervals(busy)
+    result = []
+    for start, end in merge_intervals(free):
+        for busy_start, busy_end in busy:
+            if busy_end <= start or busy_start >= end:
+                continue
+            if busy_start > start:
+                result.append((start, busy_start))
+            start = max(start, busy_end)
+            if start >= end:
+                break
+        if start < end:
+            result.append((start, end))
+    return result
+
+
+def _entity_provider(entity: Dict[str, Any]) -> Optional[str]:
+    provider = entity.get("provider")
+    provider_id = entity.get("provider_id") or (provider.get("id") if isinstance(provider, dict) else None)
+    return str(provider_id) if provider_id is not None else None
+
+
+def _entity_interval(entity: Dict[str, Any]) -> Optional[Interval]:
+    start = next((parse_datetime(entity[key]) for key in _START_KEYS if entity.get(key)), None)
+    end = next((parse_datetime(entity[key]) for key in _END_KEYS if entity.get(key)), None)
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+def calendar_entries(calendar: Any) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Separar una respuesta de /calendar en reservas, notas y descansos
+
+    Calendar_DataEntity puede venir como lista de reservas o como objeto con
+    "bookings", "notes" y "breaks"; "notes" es None si la respuesta no las trae.
+    """
+    if isinstance(calendar, dict) and any(key in calendar for key in ("bookings", "notes", "breaks")):
+        return {
+            "bookings": list(calendar.get("bookings") or []),
+            "notes": list(calendar["notes"]) if calendar.get("notes") is not None else None,
+            "breaks": list(calendar.get("breaks") or calendar.get("break_times") or [])
+        }
+    bookings, _ = split_page(calendar)
+    return {"bookings": bookings, "notes": None, "breaks": []}
+
+
+class AvailabilityEngine:
+    """
+    Calcula turnos libres localmente a partir de jornadas, reservas y bloqueos
+
+    Cada proveedor tiene por servicio y día sus tramos de trabajo
+    (WorkDayEntity de /schedule, que depende del servicio) y sus tramos
+    ocupados (reservas activas, notas que bloquean horario y descansos del
+    calendario). Los turnos libres de un servicio salen de restar ambos
+    conjuntos, sin consultar la API por cada día.
+    """
+
+    def __init__(self):
+        # (proveedor, servicio o None = todos, fecha) -> tramos de trabajo
+        self._work: Dict[Tuple[str, Optional[str], str], List[Interval]] = {}
+        # (proveedor o None = todos, fecha) -> [(intervalo, servicio o None = todos)]
+        self._busy: Dict[Tuple[Optional[str], str], List[Tuple[Interval, Optional[str]]]] = {}
+
+    def add_work_day(self, provider_id: Any, work_day: Dict[str, Any], service_id: Any = None) -> None:
+        """
+        Registrar la jornada de un proveedor (WorkDayEntity), con sus descansos si los trae
+
+        Con service_id la jornada y sus descansos valen solo para ese servicio
+        (el /schedule del que salieron); sin él, para todos.
+        """
+        day = work_day.get("date")
+        time_from, time_to = work_day.get("time_from"), work_day.get("time_to")
+        if not day or work_day.get("is_day_off") or not time_from or not time_to:
+            return
+        start = parse_datetime(f"{day} {time_from}")
+        end = parse_datetime(f"{day} {time_to}")
+        if start is None or end is None:
+            return
+        service = str(service_id) if service_id is not None else None
+        key = (str(provider_id), service, day)
+        self._work[key] = merge_intervals(self._work.get(key, []) + [(start, end)])
+        for pause in work_day.get("breaks") or []:
+            pause_start = parse_datetime(f"{day} {pause.get('time_from') or pause.get('start_time')}")
+            pause_end = parse_datetime(f"{day} {pause.get('time_to') or pause.get('end_time')}")
+            if pause_start is not None and pause_end is not None:
+                self._add_busy(str(provider_id), (pause_start, pause_end), service)
+
+    def add_booking(self, booking: Dict[str, Any]) -> None:
+        """Registrar una reserva; las canceladas no ocupan horario"""
+        if str(booking.get("status", "")).lower() in ("canceled", "cancelled") or booking.get("is_canceled"):
+            return
+        provider_id = _entity_provider(booking)
+        interval = _entity_interval(booking)
+        if provider_id is not None and interval is not None:
+            self._add_busy(provider_id, interval, None)
+
+    def add_block(self, block: Dict[str, Any]) -> None:
+        """
+        Registrar una nota o descanso que bloquea horario
+
+        Sin proveedor bloquea a todos; con service_id solo bloquea ese servicio.
+        Las notas con time_blocked falso no ocupan horario.
+        """
+        if block.get("time_blocked") is False:
+            return
+        interval = _entity_interval(block)
+        if interval is None:
+            return
+        service_id = block.get("service_id")
+        self._add_busy(_entity_provider(block), interval, str(service_id) if service_id is not None else None)
+
+    def free_intervals(self, provider_id: Any, day: str, service_id: Any = None) -> List[Interval]:
+        """Tramos libres de un proveedor en un día (para un servicio, si se indica)"""
+        service = str(service_id) if service_id is not None else None
+        work = self._work_intervals(str(provider_id), service, day)
+        if not work:
+            return []
+        busy = [interval
+                for owner in (str(provider_id), None)
+                for interval, only_service in self._busy.get((owner, day), [])
+                if only_service is None or only_service == service]
+        return subtract_intervals(work, busy)
+
+    def free_slots(self, provider_id: Any, day: str, duration: int,
+                   service_id: Any = None, step: Optional[int] = None) -> List[str]:
+        """
+        Inicios de turno libres de un servicio en un día
+
+        Los turnos se alinean al inicio de la jornada cada `step` minutos
+        (default: la duración del servicio) y tienen que entrar completos en
+        un tramo libre.
+
+        Args:
+            provider_id: ID del proveedor
+            day: Fecha (YYYY-MM-DD)
+            duration: Duración del servicio en minutos
+            service_id: ID del servicio (para las notas que bloquean solo un servicio)
+            step: Minutos entre inicios de turno (default: duration)
+
+        Returns:
+            Horas de inicio "HH:MM:SS" en orden
+        """
+        work = self._work_intervals(str(provider_id), str(service_id) if service_id is not None else None, day)
+        if not work or duration <= 0:
+            return []
+        length = timedelta(minutes=duration)
+        increment = timedelta(minutes=step or duration)
+        free = self.free_intervals(provider_id, day, service_id)
+        slots = []
+        start, day_end = work[0][0], work[-1][1]
+        index = 0
+        while start + length <= day_end:
+            while index < len(free) and free[index][1] < start + length:
+                index += 1
+            if index == len(free):
+                break
+            if free[index][0] <= start:
+                slots.append(start.strftime("%H:%M:%S"))
+            start += increment
+        return slots
+
+    def _work_intervals(self, provider_id: str, service_id: Optional[str], day: str) -> List[Interval]:
+        # La jornada cargada para el servicio, o la que vale para todos los servicios
+        if service_id is not None and (provider_id, service_id, day) in self._work:
+            return self._work[(provider_id, service_id, day)]
+        return self._work.get((provider_id, None, day), [])
+
+    def _add_busy(self, provider_id: Optional[str], interval: Interval, service_id: Optional[str]) -> None:
+        # Una reserva o bloqueo que cruza la medianoche ocupa cada día que toca
+        day = interval[0].date()
+        while day <= (interval[1] - timedelta(microseconds=1)).date():
+            self._busy.setdefault((provider_id, day.isoformat()), []).append((interval, service_id))
+            day += timedelta(days=1)
+
+
+async def load_engine(bookings_client: Any, notes_client: Any, pairs: Iterable[Tuple[str, str]],
+                      date_from: str, date_to: str, concurrency: Optional[int] = None) -> AvailabilityEngine:
+    """
+    Descargar en bloque lo necesario para calcular la disponibilidad de un rango
+
+    Una consulta a /schedule por par proveedor/servicio (la jornada puede
+    cambiar según el servicio), una a /calendar con las reservas, notas y
+    descansos de todos los proveedores y, si el calendario no trae las
+    notas, el listado de /calendar-notes del rango.
+
+    Args:
+        bookings_client: BookingsClient autenticado
+        notes_client: NotesClient autenticado
+        pairs: Tuplas (ID de proveedor, ID de servicio) a calcular
+        date_from: Fecha inicial (YYYY-MM-DD)
+        date_to: Fecha final inclusive (YYYY-MM-DD)
+        concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+    """
+    engine = AvailabilityEngine()
+    pairs = list(dict.fromkeys((str(provider_id), str(service_id)) for provider_id, service_id in pairs))
+    schedules = await gather_limited(
+        [lambda provider_id=provider_id, service_id=service_id: bookings_client.get_schedule(
+            service_id=service_id, provider_id=provider_id, date_from=date_from, date_to=date_to
+        ) for provider_id, service_id in pairs],
+        concurrency or get_slot_search_concurrency()
+    )
+    for (provider_id, service_id), work_days in zip(pairs, schedules):
+        for work_day in work_days or []:
+            engine.add_work_day(provider_id, work_day, service_id=service_id)
+
+    calendar = calendar_entries(await bookings_client.get_calendar_data(
+        mode="provider",
+        providers=list(dict.fromkeys(provider_id for provider_id, _ in pairs)),
+        date_from=date_from,
+        date_to=date_to
+    ))
+    for booking in calendar["bookings"]:
+        engine.add_booking(booking)
+    notes = calendar["notes"]
+    if notes is None:
+        notes = await collect_items(notes_client.iter_notes(date_from=date_from, date_to=date_to))
+    for block in list(notes) + calendar["breaks"]:
+        engine.add_block(block)
+    return engine
+
+
+def sample_evenly(items: List[Any], count: int) -> List[Any]:
+    """Tomar `count` elementos repartidos a lo largo de la lista (todos si hay menos)"""
+    if count >= len(items):
+        return list(items)
+    if count <= 0:
+        return []
+    step = len(items) / count
+    return [items[int(i * step)] for i in range(count)]
+
+
+async def validate_engine(engine: AvailabilityEngine,
+                          fetch_slots: Callable[[str, str, str], Awaitable[List[Dict[str, Any]]]],
+                          checks: List[Tuple[str, str, str, int]],
+                          step: Optional[int] = None,
+                          concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Comparar los turnos calculados localmente con /schedule/available-slots
+
+    Args:
+        engine: Motor ya cargado
+        fetch_slots: Corrutina que recibe (proveedor, servicio, fecha) y devuelve los turnos de la API
+        checks: Tuplas (proveedor, servicio, fecha, duración) a verificar
+        step: Minutos entre inicios de turno usados en el cálculo local
+        concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+
+    Returns:
+        Dict con checked, matches y mismatches (con los horarios que solo
+        devuelve la API en "missing" y los que solo calculó el motor en "extra")
+    """
+    upstream = await gather_limited(
+        [lambda check=check: fetch_slots(check[0], check[1], check[2]) for check in checks],
+        concurrency or get_slot_search_concurrency()
+    )
+    mismatches = []
+    for (provider_id, service_id, day, duration), slots in zip(checks, upstream):
+        remote = {slot.get("time") or str(slot.get("id", ""))[11:] for slot in slots or []}
+        local = set(engine.free_slots(provider_id, day, duration, service_id=service_id, step=step))
+        if remote != local:
+            mismatches.append({
+                "provider_id": provider_id,
+                "service_id": service_id,
+                "date": day,
+                "missing": sorted(remote - local),
+                "extra": sorted(local - remote)
+            })
+    return {"checked": len(checks), "matches": len(checks) - len(mismatches), "mismatches": mismatches}
@@ -1,15 +1,25 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from fastmcp import FastMCP
 from .auth.client import AuthClient
+from .auth.token_manager import TokenManager
+from .exceptions import CircuitOpenError, DeadlineExceededError
+from .tracing import span
 import os
 
 class BaseRoutes:
-    def __init__(self, company: str = None, login: str = None, password: str = None):
+    def __init__(self, company: str = None, login: str = None, password: str = None,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 token_manager: Optional[TokenManager] = None):
         # Usar variables de entorno si no se proporcionan credenciales
         self.company = company or os.getenv('SIMPLYBOOK_COMPANY')
         self.login = login or os.getenv('SIMPLYBOOK_LOGIN')
         self.password = password or os.getenv('SIMPLYBOOK_PASSWORD')
-        self.auth_client = AuthClient()
+        # Pool de conexiones compartido, propiedad del ciclo de vida del servidor
+        self.http_client = http_client
+        # Cache de tokens compartida: todos los routers ven el mismo token en memoria
+        self.token_manager = token_manager or TokenManager()
+        self.auth_client = AuthClient(http_client, self.token_manager)
         self.client = None
 
     def register_tools(self, mcp: FastMCP) -> None:
@@ -24,32 +34,29 @@ class BaseRoutes:
             True si la autenticación es exitosa
         """
         try:
-            # Verificar si ya tenemos un token válido
-            try:
-                self.auth_client.get_auth_headers(self.company)
-                return True
-            except ValueError:
-                pass
-                
-            # Si no hay token válido, autenticar
-            auth_result = await self.auth_client.authenticate(
-                self.company, 
-                self.login, 
-                self.password
-            )
-            
-            if auth_result["success"]:
-                # Esperar un momento después de la autenticación exitosa
-                import asyncio
-                await asyncio.sleep(1)
-                return True
-            
-            return False
+            # Token en memoria o autenticación única compartida entre corrutinas
+            with span("BaseRoutes.ensure_authenticated", **{"simplybook.company": self.company}):
+                token = await self.token_manager.get_or_authenticate(
+                    self.company,
+                    self._authenticate
+                )
+            return token is not None
             
+        except (CircuitOpenError, DeadlineExceededError):
+            # Que la herramienta devuelva el error estructurado en vez de "No se pudo autenticar"
+            raise
         except Exception as e:
             print(f"Error en autenticación: {str(e)}")
             return False
             
+    async def _authenticate(self) -> Dict[str, Any]:
+        """Autentica contra SimplyBook.me; el token queda guardado en el TokenManager"""
+        return await self.auth_client.authenticate(
+            self.company, 
+            self.login, 
+            self.password
+        )
+            
     def get_auth_headers(self) -> Dict[str, str]:
         """
         Obtiene los headers de autenticación para las llamadas a la API
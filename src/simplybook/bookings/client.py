@@ -1,21 +1,90 @@
 import httpx
-from typing import Optional, Dict, Any, List
+import json
+from typing import Optional, Dict, Any, List, AsyncIterator
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..pagination import iter_items, fetch_all_pages, get_page_size
+from ..availability import (
+    search_providers, split_date_range, timeline_free_slots, gather_limited, get_slot_search_concurrency,
+    earliest_slots, date_horizon, booked_slots
+)
+from ..cache import slot_cache, slot_namespace, invalidate_slots, is_cache_enabled, get_ttl
 
+@traced_client
 class BookingsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
-    async def get_all_bookings_simple(self) -> List[Dict[str, Any]]:
-        """Obtener lista básica de reservas sin filtros"""
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.get("/bookings")
-            response.raise_for_status()
-            return response.json()
+    def _invalidate_slots(self, *entities: Any, everything: bool = False) -> None:
+        """
+        Invalidar los turnos cacheados que una reserva ocupó o liberó
+        
+        Si no se puede saber qué proveedor y fecha se afectaron (o con
+        everything=True) se invalidan todos los turnos de la empresa.
+        """
+        company = self.headers.get("X-Company-Login", "")
+        affected = set() if everything else booked_slots(*entities)
+        if not affected:
+            invalidate_slots(company)
+        for provider_id, day in affected:
+            invalidate_slots(company, provider_id, day)
+
+    async def get_all_bookings_simple(self, max_items: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtener lista básica de reservas sin filtros (recorre todas las páginas)"""
+        return await self.fetch_all_bookings(max_items=max_items)
+
+    def iter_bookings(self,
+                      max_items: Optional[int] = None,
+                      on_page: Optional[int] = None,
+                      **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las reservas página por página
+        
+        Args:
+            max_items: Máximo de reservas a devolver (None = todas)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_booking_list (status, services, date_from, ...)
+            
+        Returns:
+            Iterador asíncrono de AdminReportBookingEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_booking_list(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
+    async def fetch_all_bookings(self,
+                                 max_items: Optional[int] = None,
+                                 on_page: Optional[int] = None,
+                                 concurrency: Optional[int] = None,
+                                 **filters) -> List[Dict[str, Any]]:
+        """
+        Descargar todas las reservas que cumplen los filtros con páginas en paralelo
+        
+        Args:
+            **filters: Filtros de get_booking_list (status, services, date_from, ...)
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            concurrency: Páginas descargadas a la vez (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+            
+        Returns:
+            Lista de AdminReportBookingEntity en el orden de la API
+        """
+        on_page = on_page or get_page_size()
+        return await fetch_all_pages(
+            lambda page: self.get_booking_list(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items,
+            concurrency=concurrency
+        )
 
     async def get_booking_list(self, 
                               page: Optional[int] = None,
@@ -93,7 +162,7 @@ class BookingsClient:
             for field, value in additional_fields.items():
                 params[f"filter[additional_fields][{field}]"] = value
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/bookings", params=params)
             response.raise_for_status()
             return response.json()
@@ -129,13 +198,15 @@ class BookingsClient:
             AccessDenied: Si el usuario no tiene acceso a la reserva
             BadRequest: Si los datos proporcionados son inválidos
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post(
                 "/bookings", 
                 json=booking_data
             )
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        self._invalidate_slots(booking_data, result)
+        return result
 
     async def edit_booking(self, booking_id: str, booking_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -170,13 +241,16 @@ class BookingsClient:
             BadRequest: Si los datos proporcionados son inválidos
             NotFound: Si la reserva no existe
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/bookings/{booking_id}",
                 json=booking_data
             )
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        # El horario anterior no viene en la respuesta: se liberó en un proveedor y fecha desconocidos
+        self._invalidate_slots(everything=True)
+        return result
 
     async def get_booking_details(self, booking_id: str) -> Dict[str, Any]:
         """
@@ -188,19 +262,21 @@ class BookingsClient:
         Returns:
             Dict con los detalles de la reserva
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/bookings/{booking_id}")
             response.raise_for_status()
             return response.json()
 
     async def cancel_booking(self, booking_id: str) -> Dict[str, Any]:
         """Cancelar una reserva"""
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(
                 f"/bookings/{booking_id}"
             )
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        self._invalidate_slots(result)
+        return result
 
     async def approve_booking(self, booking_id: str) -> Dict[str, Any]:
         """
@@ -212,7 +288,7 @@ class BookingsClient:
         Returns:
             Dict con los detalles de la reserva actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/bookings/{booking_id}/approve"
             )
@@ -230,7 +306,7 @@ class BookingsClient:
         Returns:
             Dict con los detalles de la reserva actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/bookings/{booking_id}/status",
                 json={"status_id": status_id}
@@ -248,7 +324,7 @@ class BookingsClient:
         Returns:
             Dict con los enlaces de la reserva
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/bookings/{booking_id}/links")
             response.raise_for_status()
             return response.json()
@@ -264,7 +340,7 @@ class BookingsClient:
         Returns:
             Dict con los detalles de la reserva actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/bookings/{booking_id}/comment",
                 json={"comment": comment}
@@ -289,7 +365,7 @@ class BookingsClient:
         Returns:
             Lista de objetos WorkDayEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(
                 "/schedule",
                 params={
@@ -317,7 +393,7 @@ class BookingsClient:
         Returns:
             Lista de objetos TimeSlotEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(
                 "/schedule/slots",
                 params={
@@ -334,7 +410,8 @@ class BookingsClient:
                                 provider_id: int,
                                 date: str,
                                 count: Optional[int] = None,
-                                products: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+                                products: Optional[List[int]] = None,
+                                use_cache: bool = True) -> List[Dict[str, Any]]:
         """
         Obtener slots disponibles para reservar
         
@@ -344,10 +421,32 @@ class BookingsClient:
             date: Fecha (YYYY-MM-DD)
             count: Cantidad para reserva grupal
             products: Lista de IDs de productos adicionales
+            use_cache: Usar la cache de turnos (False = consultar siempre la API)
             
         Returns:
             Lista de objetos TimeSlotEntity
         """
+        ttl = get_ttl("available_slots")
+        if not use_cache or not is_cache_enabled() or ttl <= 0:
+            return await self._fetch_available_slots(service_id, provider_id, date, count, products)
+        
+        # Las consultas repetidas mientras se negocia un horario con el cliente salen de la cache
+        company = self.headers.get("X-Company-Login", "")
+        key = json.dumps([company, str(service_id), str(provider_id), date, count,
+                          sorted(products) if products else None], default=str)
+        return await slot_cache.get_or_load(
+            key,
+            slot_namespace(company, provider_id, date),
+            lambda: self._fetch_available_slots(service_id, provider_id, date, count, products),
+            ttl=ttl
+        )
+
+    async def _fetch_available_slots(self,
+                                     service_id: int,
+                                     provider_id: int,
+                                     date: str,
+                                     count: Optional[int] = None,
+                                     products: Optional[List[int]] = None) -> List[Dict[str, Any]]:
         params = {
             "service_id": service_id,
             "provider_id": provider_id,
@@ -360,11 +459,90 @@ class BookingsClient:
         if products:
             params["products"] = products
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/schedule/available-slots", params=params)
             response.raise_for_status()
             return response.json()
 
+    async def search_available_slots(self,
+                                     service_id: int,
+                                     provider_ids: List[str],
+                                     date: str,
+                                     count: Optional[int] = None,
+                                     products: Optional[List[int]] = None,
+                                     concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Buscar slots disponibles de un servicio en varios proveedores a la vez
+        
+        Args:
+            service_id: ID del servicio
+            provider_ids: IDs de los proveedores a consultar
+            date: Fecha (YYYY-MM-DD)
+            count: Cantidad para reserva grupal
+            products: Lista de IDs de productos adicionales
+            concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+            
+        Returns:
+            Dict con "slots" (TimeSlotEntity con provider_id, ordenados por horario)
+            y "errors" (proveedores que respondieron con error)
+        """
+        slots, errors = await search_providers(
+            lambda provider_id: self.get_available_slots(
+                service_id=service_id,
+                provider_id=provider_id,
+                date=date,
+                count=count,
+                products=products
+            ),
+            provider_ids,
+            concurrency=concurrency
+        )
+        return {"slots": slots, "errors": errors}
+
+    async def find_next_available_slots(self,
+                                        service_id: int,
+                                        provider_ids: List[str],
+                                        date_from: Optional[str],
+                                        days: int,
+                                        limit: int,
+                                        count: Optional[int] = None,
+                                        products: Optional[List[int]] = None,
+                                        concurrency: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Buscar los primeros slots disponibles entre varios proveedores y días
+        
+        Consulta proveedor por proveedor y día por día en paralelo y cancela
+        las consultas pendientes en cuanto los primeros `limit` slots están
+        confirmados.
+        
+        Args:
+            service_id: ID del servicio
+            provider_ids: IDs de los proveedores a consultar
+            date_from: Primera fecha a consultar (YYYY-MM-DD, None = hoy)
+            days: Cantidad de días a consultar desde date_from
+            limit: Cantidad de slots buscada
+            count: Cantidad para reserva grupal
+            products: Lista de IDs de productos adicionales
+            concurrency: Consultas simultáneas (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+            
+        Returns:
+            Dict con "slots" (TimeSlotEntity con provider_id, ordenados por horario),
+            "errors" y "probes" (ver availability.earliest_slots)
+        """
+        return await earliest_slots(
+            lambda provider_id, day: self.get_available_slots(
+                service_id=service_id,
+                provider_id=provider_id,
+                date=day,
+                count=count,
+                products=products
+            ),
+            provider_ids,
+            date_horizon(date_from, days),
+            limit,
+            concurrency=concurrency
+        )
+
     async def get_first_available_slot(self,
                                      service_id: int,
                                      provider_id: int,
@@ -391,7 +569,7 @@ class BookingsClient:
         if count is not None:
             params["count"] = count
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/schedule/first-available-slot", params=params)
             response.raise_for_status()
             return response.json()
@@ -441,11 +619,57 @@ class BookingsClient:
         if product_ids:
             params["product_ids"] = product_ids
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/timeline/slots", params=params)
             response.raise_for_status()
             return response.json()
 
+    async def get_available_slots_range(self,
+                                        service_id: int,
+                                        provider_id: int,
+                                        date_from: str,
+                                        date_to: str,
+                                        count: Optional[int] = None,
+                                        product_ids: Optional[List[int]] = None,
+                                        window_days: Optional[int] = None,
+                                        concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Obtener los slots disponibles de un rango de fechas con /timeline/slots
+        
+        Una llamada trae varios días; los rangos largos se dividen en ventanas
+        de `window_days` días que se piden en paralelo.
+        
+        Args:
+            service_id: ID del servicio
+            provider_id: ID del proveedor
+            date_from: Fecha inicial (YYYY-MM-DD)
+            date_to: Fecha final inclusive (YYYY-MM-DD)
+            count: Cantidad para reserva grupal
+            product_ids: Lista de IDs de productos adicionales
+            window_days: Días por llamada (default: SIMPLYBOOK_TIMELINE_WINDOW_DAYS)
+            concurrency: Ventanas pedidas a la vez (default: SIMPLYBOOK_SLOT_SEARCH_CONCURRENCY)
+            
+        Returns:
+            Lista de slots libres {"date", "time", "available_count"} en orden cronológico
+        """
+        windows = split_date_range(date_from, date_to, window_days)
+        timelines = await gather_limited(
+            [lambda window=window: self.get_slots_timeline(
+                service_id=service_id,
+                provider_id=provider_id,
+                date_from=window[0],
+                date_to=window[1],
+                count=count,
+                with_available_slots=True,
+                product_ids=product_ids
+            ) for window in windows],
+            concurrency or get_slot_search_concurrency()
+        )
+        slots = []
+        for timeline in timelines:
+            slots.extend(timeline_free_slots(timeline))
+        return slots
+
     async def get_calendar_data(self,
                               mode: str,
                               upcoming_only: Optional[bool] = None,
@@ -515,7 +739,7 @@ class BookingsClient:
             for field, value in additional_fields.items():
                 params[f"filter[additional_fields][{field}]"] = value
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/calendar", params=params)
             response.raise_for_status()
             return response.json()
@@ -586,7 +810,7 @@ class BookingsClient:
         if booking_type:
             data["filter"]["booking_type"] = booking_type
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/detailed-report", json=data)
             response.raise_for_status()
             return response.json()
@@ -601,7 +825,7 @@ class BookingsClient:
         Returns:
             Dict con los datos del reporte
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/detailed-report/{report_id}")
             response.raise_for_status()
             return response.json()
@@ -614,7 +838,7 @@ class BookingsClient:
             booking_id: ID de la reserva
             status: Estado ('negative', 'positive', etc.)
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/medical-test/status/{booking_id}",
                 json={"status": status}
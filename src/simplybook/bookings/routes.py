@@ -1,10 +1,24 @@
 from typing import Dict, Any, List, Optional
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import BookingsClient
+from ..providers.client import ProvidersClient
+from ..services.client import ServicesClient
+from ..notes.client import NotesClient
+from ..availability import split_date_range, date_horizon
+from ..availability_engine import load_engine, validate_engine, sample_evenly
+from ..pagination import lookahead_limit, limited_result
 from pydantic import Field
 from typing import Annotated
 
 class BookingsRoutes(BaseRoutes):
+    async def _service_providers(self, service_id: str) -> Dict[str, Optional[str]]:
+        """Proveedores que pueden dar un servicio: ID -> nombre"""
+        providers = await ProvidersClient(self.get_auth_headers(), self.http_client).fetch_all_providers(
+            service_id=service_id
+        )
+        return {str(p.get("id")): p.get("name") for p in providers if p.get("id") is not None}
+
     def register_tools(self, mcp):
         @mcp.tool(
             description="Obtener lista básica de reservas sin filtros",
@@ -16,13 +30,53 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 bookings = await self.client.get_all_bookings_simple()
                 return {
                     "success": True,
                     "bookings": bookings,
                     "count": len(bookings)
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error obteniendo reservas: {str(e)}"}
+
+        @mcp.tool(
+            description="Obtener todas las reservas que cumplen los filtros, recorriendo todas las páginas",
+            tags={"bookings", "list", "all"}
+        )
+        async def get_all_bookings(
+            upcoming_only: Optional[Annotated[bool, Field(description="Solo reservas futuras")]] = None,
+            status: Optional[Annotated[str, Field(description="Estado de la reserva", pattern="^(confirmed|confirmed_pending|pending|canceled)$")]] = None,
+            services: Optional[Annotated[List[str], Field(description="Lista de IDs de servicios para filtrar")]] = None,
+            providers: Optional[Annotated[List[str], Field(description="Lista de IDs de proveedores para filtrar")]] = None,
+            client_id: Optional[Annotated[str, Field(description="ID del cliente para filtrar")]] = None,
+            date_from: Optional[Annotated[str, Field(description="Fecha desde (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            date_to: Optional[Annotated[str, Field(description="Fecha hasta (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            search: Optional[Annotated[str, Field(description="String de búsqueda (por código, datos del cliente)")]] = None,
+            max_items: Optional[Annotated[int, Field(description="Máximo de elementos a devolver (por defecto todos)", ge=1)]] = None
+        ) -> Dict[str, Any]:
+            """Obtener todas las reservas que cumplen los filtros (paginación automática)"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
+                items = await self.client.fetch_all_bookings(
+                    max_items=lookahead_limit(max_items),
+                    upcoming_only=upcoming_only,
+                    status=status,
+                    services=services,
+                    providers=providers,
+                    client_id=client_id,
+                    date_from=date_from,
+                    date_to=date_to,
+                    search=search
+                )
+                return limited_result(items, max_items)
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo reservas: {str(e)}"}
 
@@ -64,7 +118,7 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_booking_list(
                     page=page,
                     on_page=on_page,
@@ -73,7 +127,9 @@ class BookingsRoutes(BaseRoutes):
                     services=services,
                     providers=providers,
                     client_id=client_id,
-                    date=date,
+                    # El cliente filtra por rango: una fecha es un rango de un día
+                    date_from=date,
+                    date_to=date,
                     search=search,
                     additional_fields=additional_fields
                 )
@@ -81,6 +137,8 @@ class BookingsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo reservas filtradas: {str(e)}"}
 
@@ -178,12 +236,14 @@ class BookingsRoutes(BaseRoutes):
                 if payment_processor:
                     booking_data["payment_processor"] = payment_processor
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.create_booking(booking_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando reserva: {str(e)}"}
 
@@ -208,12 +268,14 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.edit_booking(booking_id, booking_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error editando reserva: {str(e)}"}
 
@@ -229,12 +291,14 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 booking = await self.client.get_booking_details(booking_id)
                 return {
                     "success": True,
                     "booking": booking
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo detalles de reserva: {str(e)}"}
 
@@ -250,12 +314,14 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.cancel_booking(booking_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error cancelando reserva: {str(e)}"}
 
@@ -271,12 +337,14 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.approve_booking(booking_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error aprobando reserva: {str(e)}"}
 
@@ -296,7 +364,7 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 slots = await self.client.get_available_slots(
                     service_id=service_id,
                     provider_id=provider_id,
@@ -308,9 +376,224 @@ class BookingsRoutes(BaseRoutes):
                     "success": True,
                     "slots": slots
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo horarios: {str(e)}"}
 
+        @mcp.tool(
+            description="Buscar horarios disponibles de un servicio en varios proveedores a la vez (por defecto, todos los que lo ofrecen)",
+            tags={"bookings", "slots", "search"}
+        )
+        async def search_available_slots(
+            service_id: Annotated[str, Field(description="ID del servicio")],
+            date: Annotated[str, Field(description="Fecha para buscar slots (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")],
+            provider_ids: Optional[Annotated[List[str], Field(description="IDs de proveedores a consultar (default: todos los que ofrecen el servicio)")]] = None,
+            count: Optional[Annotated[int, Field(description="Cantidad para reserva grupal")]] = None,
+            products: Optional[Annotated[List[int], Field(description="Lista de IDs de productos adicionales")]] = None
+        ) -> Dict[str, Any]:
+            """Buscar horarios disponibles de un servicio en varios proveedores a la vez"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                provider_names = {}
+                if not provider_ids:
+                    provider_names = await self._service_providers(service_id)
+                    provider_ids = list(provider_names)
+                    
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
+                result = await self.client.search_available_slots(
+                    service_id=service_id,
+                    provider_ids=provider_ids,
+                    date=date,
+                    count=count,
+                    products=products
+                )
+                slots = result["slots"]
+                if provider_names:
+                    slots = [{**slot, "provider_name": provider_names.get(slot["provider_id"])} for slot in slots]
+                return {
+                    "success": True,
+                    "slots": slots,
+                    "count": len(slots),
+                    "providers": provider_ids,
+                    "errors": result["errors"]
+                }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error buscando horarios: {str(e)}"}
+
+        @mcp.tool(
+            description="Buscar horarios disponibles de un servicio y proveedor entre dos fechas (una consulta por rango, no por día)",
+            tags={"bookings", "slots", "range"}
+        )
+        async def find_availability(
+            service_id: Annotated[str, Field(description="ID del servicio")],
+            provider_id: Annotated[str, Field(description="ID del proveedor")],
+            date_from: Annotated[str, Field(description="Fecha desde (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")],
+            date_to: Annotated[str, Field(description="Fecha hasta inclusive (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")],
+            count: Optional[Annotated[int, Field(description="Cantidad para reserva grupal")]] = None,
+            products: Optional[Annotated[List[int], Field(description="Lista de IDs de productos adicionales")]] = None
+        ) -> Dict[str, Any]:
+            """Buscar horarios disponibles de un servicio y proveedor entre dos fechas"""
+            try:
+                split_date_range(date_from, date_to)
+            except ValueError as e:
+                return {"error": f"Rango de fechas inválido: {str(e)}"}
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
+                slots = await self.client.get_available_slots_range(
+                    service_id=service_id,
+                    provider_id=provider_id,
+                    date_from=date_from,
+                    date_to=date_to,
+                    count=count,
+                    product_ids=products
+                )
+                dates = sorted({slot["date"] for slot in slots if slot.get("date")})
+                return {
+                    "success": True,
+                    "slots": slots,
+                    "count": len(slots),
+                    "dates_with_availability": dates
+                }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error buscando horarios: {str(e)}"}
+
+        @mcp.tool(
+            description="Buscar los próximos horarios libres de un servicio entre todos los proveedores que lo ofrecen",
+            tags={"bookings", "slots", "search"}
+        )
+        async def find_next_available_slots(
+            service_id: Annotated[str, Field(description="ID del servicio")],
+            limit: Annotated[int, Field(description="Cantidad de horarios a devolver", ge=1, le=50)] = 5,
+            date_from: Optional[Annotated[str, Field(description="Primera fecha a buscar (YYYY-MM-DD, por defecto hoy)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            days: Annotated[int, Field(description="Cantidad de días a buscar desde date_from", ge=1, le=60)] = 14,
+            provider_ids: Optional[Annotated[List[str], Field(description="IDs de proveedores a consultar (default: todos los que ofrecen el servicio)")]] = None,
+            count: Optional[Annotated[int, Field(description="Cantidad para reserva grupal")]] = None,
+            products: Optional[Annotated[List[int], Field(description="Lista de IDs de productos adicionales")]] = None
+        ) -> Dict[str, Any]:
+            """Buscar los próximos horarios libres de un servicio entre todos los proveedores que lo ofrecen"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                provider_names = {}
+                if not provider_ids:
+                    provider_names = await self._service_providers(service_id)
+                    provider_ids = list(provider_names)
+                    
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
+                result = await self.client.find_next_available_slots(
+                    service_id=service_id,
+                    provider_ids=provider_ids,
+                    date_from=date_from,
+                    days=days,
+                    limit=limit,
+                    count=count,
+                    products=products
+                )
+                slots = result["slots"]
+                if provider_names:
+                    slots = [{**slot, "provider_name": provider_names.get(slot["provider_id"])} for slot in slots]
+                return {
+                    "success": True,
+                    "slots": slots,
+                    "count": len(slots),
+                    "providers": provider_ids,
+                    "errors": result["errors"],
+                    "probes": result["probes"]
+                }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error buscando horarios: {str(e)}"}
+
+        @mcp.tool(
+            description="Calcular la disponibilidad de cada proveedor y servicio para los próximos días a partir de horarios y reservas (para planificar capacidad), con validación opcional contra la API",
+            tags={"bookings", "slots", "capacity"}
+        )
+        async def compute_availability(
+            date_from: Optional[Annotated[str, Field(description="Primera fecha (YYYY-MM-DD, por defecto hoy)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            days: Annotated[int, Field(description="Cantidad de días a calcular desde date_from", ge=1, le=92)] = 30,
+            service_ids: Optional[Annotated[List[str], Field(description="IDs de servicios (default: todos)")]] = None,
+            provider_ids: Optional[Annotated[List[str], Field(description="IDs de proveedores (default: todos)")]] = None,
+            step_minutes: Optional[Annotated[int, Field(description="Minutos entre inicios de turno (default: duración del servicio)", ge=1)]] = None,
+            include_slots: Annotated[bool, Field(description="Incluir los horarios libres además de la cantidad")] = False,
+            validate: Annotated[bool, Field(description="Comparar una muestra con /schedule/available-slots")] = False,
+            validate_samples: Annotated[int, Field(description="Combinaciones proveedor/servicio/día a comparar", ge=1, le=200)] = 20
+        ) -> Dict[str, Any]:
+            """Calcular la disponibilidad de cada proveedor y servicio para un rango de días"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                headers = self.get_auth_headers()
+                services = await ServicesClient(headers, self.http_client).fetch_all_services()
+                if service_ids:
+                    services = [s for s in services if str(s.get("id")) in {str(i) for i in service_ids}]
+                    
+                # Pares proveedor/servicio; ServiceEntity trae los proveedores que lo ofrecen
+                pairs = []
+                for service in services:
+                    if not service.get("duration"):
+                        continue
+                    service_providers = service.get("providers")
+                    if service_providers is None:
+                        service_providers = list(await self._service_providers(str(service["id"])))
+                    for provider_id in service_providers:
+                        if not provider_ids or str(provider_id) in {str(i) for i in provider_ids}:
+                            pairs.append((str(provider_id), str(service["id"]), int(service["duration"])))
+                            
+                dates = date_horizon(date_from, days)
+                # Cliente local: la validación lo usa después y self.client lo reemplazan otras invocaciones
+                client = BookingsClient(headers, self.http_client)
+                engine = await load_engine(client, NotesClient(headers, self.http_client),
+                                           [(provider_id, service_id) for provider_id, service_id, _ in pairs],
+                                           dates[0], dates[-1])
+                
+                availability = []
+                for day in dates:
+                    for provider_id, service_id, duration in pairs:
+                        slots = engine.free_slots(provider_id, day, duration, service_id=service_id, step=step_minutes)
+                        row = {"date": day, "provider_id": provider_id, "service_id": service_id, "free_slots": len(slots)}
+                        if include_slots:
+                            row["slots"] = slots
+                        availability.append(row)
+                        
+                result = {
+                    "success": True,
+                    "date_from": dates[0],
+                    "date_to": dates[-1],
+                    "availability": availability,
+                    "count": len(availability)
+                }
+                if validate:
+                    checks = sample_evenly([(provider_id, service_id, day, duration)
+                                            for day in dates for provider_id, service_id, duration in pairs],
+                                           validate_samples)
+                    result["validation"] = await validate_engine(
+                        engine,
+                        # La validación compara contra la API en vivo, no contra la cache de turnos
+                        lambda provider_id, service_id, day: client.get_available_slots(
+                            service_id=service_id, provider_id=provider_id, date=day, use_cache=False
+                        ),
+                        checks,
+                        step=step_minutes
+                    )
+                return result
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error calculando disponibilidad: {str(e)}"}
+
         @mcp.tool(
             description="Obtener datos del calendario para un período",
             tags={"bookings", "calendar"}
@@ -332,7 +615,7 @@ class BookingsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = BookingsClient(self.get_auth_headers())
+                self.client = BookingsClient(self.get_auth_headers(), self.http_client)
                 calendar_data = await self.client.get_calendar_data(
                     mode=mode,
                     upcoming_only=upcoming_only,
@@ -349,5 +632,7 @@ class BookingsRoutes(BaseRoutes):
                     "success": True,
                     "calendar_data": calendar_data
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo datos del calendario: {str(e)}"}
\ No newline at end of file
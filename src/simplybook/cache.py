@@ -0,0 +1,244 @@
+import asyncio
+import functools
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Callable, Awaitable, Tuple
+from .endpoints import get_endpoint_policy
+
+
+# TTL (segundos) de los grupos que no definen cache_ttl en el registro de endpoints
+DEFAULT_TTL = 300
+
+
+def is_cache_enabled() -> bool:
+    """Verificar si la cache de datos de referencia está habilitada"""
+    return os.getenv('SIMPLYBOOK_CACHE_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on')
+
+
+def get_ttl(namespace: str) -> float:
+    """
+    Obtener el TTL de un grupo de datos
+
+    El valor por defecto es el cache_ttl del endpoint con el mismo nombre en
+    el registro (ver endpoints.py). Se puede sobrescribir con
+    SIMPLYBOOK_CACHE_TTL_<NAMESPACE>, por ejemplo SIMPLYBOOK_CACHE_TTL_SERVICES=60.
+    """
+    default = get_endpoint_policy(namespace).get("cache_ttl", DEFAULT_TTL)
+    try:
+        return float(os.getenv(f'SIMPLYBOOK_CACHE_TTL_{namespace.upper()}', default))
+    except ValueError:
+        return default
+
+
+class TTLCache:
+    """
+    Cache asíncrona con expiración por entrada y desalojo LRU
+
+    Las lecturas concurrentes de una misma clave que no está en cache se
+    agrupan: solo la primera ejecuta el loader y las demás esperan su resultado.
+    Los errores no se guardan en cache.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries: Máximo de entradas (default: SIMPLYBOOK_CACHE_MAX_ENTRIES o 256)
+        """
+        if max_entries is None:
+            try:
+                max_entries = int(os.getenv('SIMPLYBOOK_CACHE_MAX_ENTRIES', 256))
+            except ValueError:
+                max_entries = 256
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any, str]]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[asyncio.Future, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def get_or_load(self, key: str, namespace: str, loader: Callable[[], Awaitable[Any]],
+                          ttl: Optional[float] = None) -> Any:
+        """
+        Devolver el valor en cache o cargarlo con loader()
+
+        Args:
+            key: Clave única de la entrada
+            namespace: Grupo de datos (para TTL e invalidación)
+            loader: Corrutina que obtiene el valor desde la API
+            ttl: TTL en segundos (default: get_ttl(namespace))
+
+        Returns:
+            El valor cacheado o recién cargado
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value, _ = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.hits += 1
+            try:
+                return await asyncio.shield(inflight[0])
+            except asyncio.CancelledError:
+                if not inflight[0].cancelled():
+                    raise
+            # Se canceló la invocación que cargaba (no esta): cargar de nuevo
+            self.hits -= 1
+            return await self.get_or_load(key, namespace, loader, ttl)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = (future, namespace)
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # La cancelación es de quien cargaba, no de los que esperan: que reintenten
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Evitar "exception was never retrieved" si nadie esperaba
+                future.exception()
+            raise
+        else:
+            future.set_result(value)
+            # Si el grupo se invalidó durante la carga, el valor puede estar desactualizado
+            if self._inflight.get(key, (None,))[0] is future:
+                self._store(key, namespace, value, get_ttl(namespace) if ttl is None else ttl)
+            return value
+        finally:
+            if self._inflight.get(key, (None,))[0] is future:
+                del self._inflight[key]
+
+    def invalidate(self, *namespaces: str) -> int:
+        """
+        Eliminar todas las entradas de los grupos indicados
+
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        return self._invalidate(lambda namespace: namespace in namespaces)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Eliminar todas las entradas cuyo grupo empieza con `prefix`
+
+        Returns:
+            Cantidad de entradas eliminadas
+        """
+        return self._invalidate(lambda namespace: namespace.startswith(prefix))
+
+    def clear(self) -> None:
+        """Vaciar la cache por completo"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Estadísticas de uso de la cache"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def _invalidate(self, matches: Callable[[str], bool]) -> int:
+        keys = [key for key, (_, _, namespace) in self._entries.items() if matches(namespace)]
+        for key in keys:
+            del self._entries[key]
+        # Las cargas en curso no se guardan y las lecturas nuevas no se agrupan con ellas
+        for key in [key for key, (_, namespace) in self._inflight.items() if matches(namespace)]:
+            del self._inflight[key]
+        return len(keys)
+
+    def _store(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value, namespace)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Instancia global de la cache de datos de referencia
+reference_cache = TTLCache()
+
+# Cache de turnos libres, separada para que sus entradas de vida corta no
+# desalojen los datos de referencia. Cada entrada pertenece al grupo de su
+# proveedor y fecha, que se invalida al reservar desde este servidor.
+slot_cache = TTLCache()
+
+
+def slot_namespace(company: str, provider_id: Any = None, day: Optional[str] = None) -> str:
+    """
+    Grupo de la cache de turnos de un proveedor y fecha
+
+    Sin fecha (o sin proveedor) devuelve el prefijo que abarca todos los
+    grupos del proveedor (o de la empresa), para invalidar con invalidate_prefix.
+    """
+    namespace = f"available_slots:{company}:"
+    if provider_id is None:
+        return namespace
+    namespace += f"{provider_id}:"
+    return namespace if day is None else namespace + day
+
+
+def invalidate_slots(company: str, provider_id: Any = None, day: Optional[str] = None) -> int:
+    """
+    Invalidar los turnos cacheados de un proveedor y fecha
+
+    Args:
+        company: Empresa (header X-Company-Login)
+        provider_id: Proveedor afectado (None = todos los de la empresa)
+        day: Fecha afectada YYYY-MM-DD (None = todas las del proveedor)
+
+    Returns:
+        Cantidad de entradas eliminadas
+    """
+    if provider_id is not None and day is not None:
+        return slot_cache.invalidate(slot_namespace(company, provider_id, day))
+    return slot_cache.invalidate_prefix(slot_namespace(company, provider_id))
+
+
+def cached(namespace: str):
+    """
+    Decorador para métodos de clientes que devuelven datos de referencia
+
+    La clave incluye la empresa (header X-Company-Login) y los argumentos.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            if not is_cache_enabled():
+                return await func(self, *args, **kwargs)
+
+            company = self.headers.get("X-Company-Login", "")
+            arguments = json.dumps([args, kwargs], sort_keys=True, default=str)
+            key = f"{namespace}:{company}:{func.__name__}:{arguments}"
+            return await reference_cache.get_or_load(
+                key,
+                namespace,
+                lambda: func(self, *args, **kwargs)
+            )
+        return wrapper
+    return decorator
+
+
+def invalidates(*namespaces: str):
+    """Decorador para métodos de escritura: invalida los grupos indicados si tienen éxito"""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            result = await func(self, *args, **kwargs)
+            reference_cache.invalidate(*namespaces)
+            return result
+        return wrapper
+    return decorator
@@ -0,0 +1,196 @@
+import logging
+import os
+import time
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from .exceptions import CircuitOpenError
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def get_circuit_breaker_config() -> Dict[str, Any]:
+    """
+    Obtener configuración de los circuit breakers desde variables de entorno
+
+    Variables:
+        SIMPLYBOOK_CIRCUIT_BREAKER_ENABLED: Habilitar los circuit breakers (default: true)
+        SIMPLYBOOK_CIRCUIT_FAILURE_THRESHOLD: Fallos consecutivos para abrir el circuito (default: 5)
+        SIMPLYBOOK_CIRCUIT_RECOVERY_TIMEOUT: Segundos abierto antes de probar de nuevo (default: 30)
+        SIMPLYBOOK_CIRCUIT_HALF_OPEN_PROBES: Peticiones de prueba simultáneas en half-open (default: 1)
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    return {
+        "enabled": os.getenv('SIMPLYBOOK_CIRCUIT_BREAKER_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on'),
+        "failure_threshold": max(1, int(_float('SIMPLYBOOK_CIRCUIT_FAILURE_THRESHOLD', 5))),
+        "recovery_timeout": _float('SIMPLYBOOK_CIRCUIT_RECOVERY_TIMEOUT', 30.0),
+        "half_open_probes": max(1, int(_float('SIMPLYBOOK_CIRCUIT_HALF_OPEN_PROBES', 1)))
+    }
+
+
+def endpoint_family(url: str) -> str:
+    """
+    Obtener la familia de endpoints de una URL de SimplyBook.me
+
+    Ejemplos:
+        https://user-api-v2.simplybook.me/admin/bookings/123 -> /bookings
+        https://user-api-v2.simplybook.me/admin/auth/refresh-token -> /admin/auth
+    """
+    segments = [segment for segment in urlparse(url).path.split("/") if segment]
+    if segments and segments[0] == "admin":
+        segments = segments[1:]
+        if segments and segments[0] == "auth":
+            return "/admin/auth"
+    return f"/{segments[0]}" if segments else "/"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de una familia de endpoints
+
+    Cerrado: las peticiones pasan y se cuentan los fallos consecutivos (errores
+    de red y respuestas 5xx). Al llegar a failure_threshold se abre y todas las
+    peticiones fallan de inmediato con CircuitOpenError. Pasado
+    recovery_timeout pasa a half-open y deja salir unas pocas peticiones de
+    prueba: si la prueba tiene éxito se cierra, si falla se vuelve a abrir.
+    """
+
+    def __init__(self, family: str, failure_threshold: int, recovery_timeout: float,
+                 half_open_probes: int = 1):
+        """
+        Args:
+            family: Familia de endpoints (p. ej. /bookings)
+            failure_threshold: Fallos consecutivos para abrir el circuito
+            recovery_timeout: Segundos abierto antes de probar de nuevo
+            half_open_probes: Peticiones de prueba simultáneas en half-open
+        """
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self.logger = logging.getLogger(__name__)
+
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """
+        Verificar si la petición puede salir
+
+        Raises:
+            CircuitOpenError: Si el circuito está abierto o sin cupo de pruebas
+        """
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.family, self.retry_in())
+            self.state = HALF_OPEN
+            self.probes_in_flight = 0
+            self.logger.info(f"Circuit {self.family} half-open, probing SimplyBook")
+
+        if self.state == HALF_OPEN:
+            if self.probes_in_flight >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpenError(self.family, 0.0)
+            self.probes_in_flight += 1
+
+    def record_success(self) -> None:
+        """Registrar una respuesta correcta"""
+        if self.state == HALF_OPEN:
+            self.logger.info(f"Circuit {self.family} closed, SimplyBook recovered")
+        self.state = CLOSED
+        self.failures = 0
+        self.probes_in_flight = 0
+
+    def release_probe(self) -> None:
+        """Liberar el cupo de prueba de una petición que terminó sin resultado"""
+        if self.state == HALF_OPEN and self.probes_in_flight > 0:
+            self.probes_in_flight -= 1
+
+    def record_failure(self) -> None:
+        """Registrar un error de red o una respuesta 5xx"""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                self.logger.warning(
+                    f"Circuit {self.family} open after {self.failures} failures, "
+                    f"failing fast for {self.recovery_timeout:.0f}s"
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.probes_in_flight = 0
+
+    def retry_in(self) -> float:
+        """Segundos que faltan para volver a probar (0 si no está abierto)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        """Estado y contadores del circuito"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": self.retry_in(),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers por familia de endpoints, creados bajo demanda"""
+
+    def __init__(self, enabled: Optional[bool] = None, failure_threshold: Optional[int] = None,
+                 recovery_timeout: Optional[float] = None, half_open_probes: Optional[int] = None):
+        """
+        Args:
+            enabled: Habilitar los circuit breakers (default: SIMPLYBOOK_CIRCUIT_BREAKER_ENABLED)
+            failure_threshold: Fallos para abrir (default: SIMPLYBOOK_CIRCUIT_FAILURE_THRESHOLD)
+            recovery_timeout: Segundos abierto (default: SIMPLYBOOK_CIRCUIT_RECOVERY_TIMEOUT)
+            half_open_probes: Pruebas en half-open (default: SIMPLYBOOK_CIRCUIT_HALF_OPEN_PROBES)
+        """
+        config = get_circuit_breaker_config()
+        self.enabled = enabled if enabled is not None else config["enabled"]
+        self.failure_threshold = failure_threshold if failure_threshold is not None else config["failure_threshold"]
+        self.recovery_timeout = recovery_timeout if recovery_timeout is not None else config["recovery_timeout"]
+        self.half_open_probes = half_open_probes if half_open_probes is not None else config["half_open_probes"]
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, family: str) -> CircuitBreaker:
+        """Obtener (o crear) el circuit breaker de una familia de endpoints"""
+        breaker = self._breakers.get(family)
+        if breaker is None:
+            breaker = CircuitBreaker(family, self.failure_threshold, self.recovery_timeout, self.half_open_probes)
+            self._breakers[family] = breaker
+        return breaker
+
+    def for_url(self, url: str) -> Optional[CircuitBreaker]:
+        """Circuit breaker que corresponde a una URL (None si están deshabilitados)"""
+        if not self.enabled:
+            return None
+        return self.get(endpoint_family(url))
+
+    def reset(self) -> None:
+        """Olvidar el estado de todos los circuitos"""
+        self._breakers.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Estado de cada familia de endpoints vista hasta ahora"""
+        return {family: breaker.stats() for family, breaker in sorted(self._breakers.items())}
+
+
+# Instancia global compartida por todos los clientes
+circuit_breakers = CircuitBreakerRegistry()
@@ -1,14 +1,20 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
 import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..cache import cached
+from ..pagination import iter_items, fetch_all_pages, get_page_size
 
+@traced_client
 class ClientsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_clients(self, 
                        page: Optional[int] = None,
@@ -37,11 +43,58 @@ class ClientsClient:
             # El filtro debe enviarse como filter[search] y no como un objeto anidado
             params["filter[search]"] = search
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/clients", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_clients(self,
+                     search: Optional[str] = None,
+                     max_items: Optional[int] = None,
+                     on_page: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todos los clientes página por página
+        
+        Args:
+            search: Texto de búsqueda (nombre, email, teléfono)
+            max_items: Máximo de clientes a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            
+        Returns:
+            Iterador asíncrono de ClientEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_clients(page=page, on_page=on_page, search=search),
+            on_page=on_page,
+            max_items=max_items
+        )
+
+    async def fetch_all_clients(self,
+                                search: Optional[str] = None,
+                                max_items: Optional[int] = None,
+                                on_page: Optional[int] = None,
+                                concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Descargar todos los clientes con páginas en paralelo
+        
+        Args:
+            search: Texto de búsqueda (nombre, email, teléfono)
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            concurrency: Páginas descargadas a la vez (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+            
+        Returns:
+            Lista de ClientEntity en el orden de la API
+        """
+        on_page = on_page or get_page_size()
+        return await fetch_all_pages(
+            lambda page: self.get_clients(page=page, on_page=on_page, search=search),
+            on_page=on_page,
+            max_items=max_items,
+            concurrency=concurrency
+        )
+
     async def get_client(self, client_id: str) -> Dict[str, Any]:
         """
         Obtener detalles de un cliente específico
@@ -52,7 +105,7 @@ class ClientsClient:
         Returns:
             Dict con los detalles del cliente
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/clients/{client_id}")
             response.raise_for_status()
             return response.json()
@@ -67,7 +120,7 @@ class ClientsClient:
         Returns:
             Dict con los datos del cliente creado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/clients", json=client_data)
             response.raise_for_status()
             return response.json()
@@ -83,7 +136,7 @@ class ClientsClient:
         Returns:
             Dict con los datos del cliente actualizado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/clients/{client_id}", json=client_data)
             response.raise_for_status()
             return response.json()
@@ -95,7 +148,7 @@ class ClientsClient:
         Args:
             client_id: ID del cliente
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/clients/{client_id}")
             response.raise_for_status()
 
@@ -150,11 +203,34 @@ class ClientsClient:
         if search:
             params["filter[search]"] = search
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/clients/memberships", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_client_memberships(self,
+                                max_items: Optional[int] = None,
+                                on_page: Optional[int] = None,
+                                **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las membresías de clientes página por página
+        
+        Args:
+            max_items: Máximo de membresías a devolver (None = todas)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_client_memberships (client_id, service_id, ...)
+            
+        Returns:
+            Iterador asíncrono de ClientMembershipPaymentEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_client_memberships(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
+    @cached("client_fields")
     async def get_client_fields(self) -> List[Dict[str, Any]]:
         """
         Obtener lista de campos de cliente
@@ -162,7 +238,7 @@ class ClientsClient:
         Returns:
             Lista de objetos Client_FieldDetailsEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/clients/fields")
             response.raise_for_status()
             return response.json()
@@ -177,7 +253,7 @@ class ClientsClient:
         Returns:
             Dict con los valores de los campos del cliente
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/clients/field-values/{client_id}")
             response.raise_for_status()
             return response.json()
@@ -198,7 +274,7 @@ class ClientsClient:
             "fields": field_values
         }
         
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/clients/field-values/{client_id}", json=data)
             response.raise_for_status()
             return response.json()
@@ -218,7 +294,7 @@ class ClientsClient:
             "fields": field_values
         }
         
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/clients/field-values", json=data)
             response.raise_for_status()
             return response.json()
\ No newline at end of file
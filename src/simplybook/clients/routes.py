@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import ClientsClient
+from ..pagination import collect_items, lookahead_limit, limited_result
 from pydantic import Field
 from typing import Annotated
 
@@ -20,7 +22,7 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_clients(
                     page=page,
                     on_page=on_page,
@@ -30,6 +32,32 @@ class ClientsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error obteniendo clientes: {str(e)}"}
+
+        @mcp.tool(
+            description="Obtener todos los clientes, recorriendo todas las páginas",
+            tags={"clients", "list", "all"}
+        )
+        async def get_all_clients(
+            search: Optional[Annotated[str, Field(description="Texto de búsqueda")]] = None,
+            max_items: Optional[Annotated[int, Field(description="Máximo de elementos a devolver (por defecto todos)", ge=1)]] = None
+        ) -> Dict[str, Any]:
+            """Obtener todos los clientes (paginación automática)"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
+                items = await self.client.fetch_all_clients(
+                    search=search,
+                    max_items=lookahead_limit(max_items)
+                )
+                return limited_result(items, max_items)
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo clientes: {str(e)}"}
 
@@ -45,12 +73,14 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_client(client_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo cliente: {str(e)}"}
 
@@ -76,12 +106,14 @@ class ClientsRoutes(BaseRoutes):
                 if phone:
                     client_data["phone"] = phone
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.create_client(client_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando cliente: {str(e)}"}
 
@@ -108,12 +140,14 @@ class ClientsRoutes(BaseRoutes):
                 if phone:
                     client_data["phone"] = phone
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.edit_client(client_id, client_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error editando cliente: {str(e)}"}
 
@@ -129,12 +163,14 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 await self.client.delete_client(client_id)
                 return {
                     "success": True,
                     "message": "Cliente eliminado correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando cliente: {str(e)}"}
 
@@ -157,7 +193,7 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_client_memberships(
                     page=page,
                     on_page=on_page,
@@ -172,6 +208,38 @@ class ClientsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error obteniendo membresías: {str(e)}"}
+
+        @mcp.tool(
+            description="Obtener todas las membresías de clientes, recorriendo todas las páginas",
+            tags={"clients", "memberships", "all"}
+        )
+        async def get_all_client_memberships(
+            client_id: Optional[Annotated[str, Field(description="ID del cliente")]] = None,
+            service_id: Optional[Annotated[str, Field(description="ID del servicio")]] = None,
+            active_only: Optional[Annotated[bool, Field(description="Solo membresías activas")]] = None,
+            search: Optional[Annotated[str, Field(description="Texto de búsqueda")]] = None,
+            max_items: Optional[Annotated[int, Field(description="Máximo de elementos a devolver (por defecto todos)", ge=1)]] = None
+        ) -> Dict[str, Any]:
+            """Obtener todas las membresías de clientes (paginación automática)"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
+                items = await collect_items(self.client.iter_client_memberships(
+                    max_items=lookahead_limit(max_items),
+                    client_id=client_id,
+                    service_id=service_id,
+                    active_only=active_only,
+                    search=search
+                ))
+                return limited_result(items, max_items)
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo membresías: {str(e)}"}
 
@@ -185,12 +253,14 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_client_fields()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo campos de cliente: {str(e)}"}
 
@@ -206,12 +276,14 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_client_field_values(client_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo valores de campos: {str(e)}"}
 
@@ -228,12 +300,14 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.edit_client_fields(client_id, field_values)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error editando campos: {str(e)}"}
 
@@ -249,11 +323,13 @@ class ClientsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ClientsClient(self.get_auth_headers())
+                self.client = ClientsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.create_client_with_fields(field_values)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando cliente: {str(e)}"}
\ No newline at end of file
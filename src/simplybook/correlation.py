@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Iterator, Tuple
+
+
+# Header con el que se envía el ID de cada petición a SimplyBook.me
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Alfabeto Base32 de Crockford (sin I, L, O, U), el mismo que usan los ULID
+_CROCKFORD = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_id_lock = threading.Lock()
+_last_ms = 0
+_last_random = 0
+
+# Invocación de herramienta MCP en curso: {"call_id": ..., "tool": ...}
+_tool_call: ContextVar[Optional[Dict[str, str]]] = ContextVar("simplybook_tool_call", default=None)
+
+# Tiempo límite de la invocación en curso: (instante en time.monotonic(), segundos totales)
+_deadline: ContextVar[Optional[Tuple[float, float]]] = ContextVar("simplybook_deadline", default=None)
+
+
+def new_request_id() -> str:
+    """
+    Generar un ID único y ordenable por tiempo (formato ULID, 26 caracteres)
+
+    48 bits de milisegundos seguidos de 80 bits aleatorios. Dentro del mismo
+    milisegundo la parte aleatoria se incrementa en vez de regenerarse, así
+    que los IDs de este proceso nunca se repiten y mantienen el orden de
+    creación aunque se generen miles por milisegundo.
+    """
+    global _last_ms, _last_random
+    now_ms = int(time.time() * 1000)
+    with _id_lock:
+        if now_ms <= _last_ms:
+            # Mismo milisegundo (o reloj que retrocede): continuar la secuencia
+            now_ms = _last_ms
+            _last_random = (_last_random + 1) & ((1 << 80) - 1)
+        else:
+            _last_ms = now_ms
+            _last_random = int.from_bytes(os.urandom(10), "big")
+        value = (now_ms << 80) | _last_random
+
+    chars = []
+    for _ in range(26):
+        chars.append(_CROCKFORD[value & 31])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def current_tool_call() -> Optional[Dict[str, str]]:
+    """Invocación de herramienta en curso ({"call_id", "tool"}) o None fuera de una herramienta"""
+    return _tool_call.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Segundos que le quedan a la invocación en curso (None si no tiene tiempo límite)"""
+    deadline = _deadline.get()
+    return deadline[0] - time.monotonic() if deadline is not None else None
+
+
+def deadline_budget() -> Optional[float]:
+    """Tiempo límite total en segundos de la invocación en curso (None si no tiene)"""
+    deadline = _deadline.get()
+    return deadline[1] if deadline is not None else None
+
+
+@contextmanager
+def tool_call(tool: str, call_id: Optional[str] = None, budget: Optional[float] = None) -> Iterator[str]:
+    """
+    Asociar todo lo que se ejecute dentro del bloque a una invocación de herramienta
+
+    El contexto viaja con la tarea de asyncio: BaseRoutes, los clientes y
+    LoggingHTTPClient lo leen sin tener que recibirlo como argumento.
+
+    Args:
+        tool: Nombre de la herramienta MCP
+        call_id: ID de la invocación (default: uno nuevo)
+        budget: Tiempo límite en segundos desde ahora (default: sin límite)
+
+    Yields:
+        El ID de la invocación
+    """
+    call_id = call_id or new_request_id()
+    token = _tool_call.set({"call_id": call_id, "tool": tool})
+    deadline_token = _deadline.set((time.monotonic() + budget, budget) if budget is not None else None)
+    try:
+        yield call_id
+    finally:
+        _deadline.reset(deadline_token)
+        _tool_call.reset(token)
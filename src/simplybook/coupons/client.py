@@ -1,47 +1,39 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional, List
 import httpx
+from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class CouponsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_promotions_list(self) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}promotions",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.get("/promotions")
             response.raise_for_status()
             return response.json()
 
     async def get_gift_cards_list(self) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}gift-cards",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.get("/promotions/gift-cards")
             response.raise_for_status()
             return response.json()
 
     async def get_coupons_list(self) -> List[Dict[str, Any]]:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}coupons",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.get("/promotions/coupons")
             response.raise_for_status()
             return response.json()
 
     async def issue_gift_card(self, gift_card_data: Dict[str, Any]) -> Dict[str, Any]:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}gift-cards",
-                json=gift_card_data,
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.post("/promotions/issue-gift-card", json=gift_card_data)
             response.raise_for_status()
             return response.json()
\ No newline at end of file
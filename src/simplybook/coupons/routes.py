@@ -1,6 +1,7 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
-from .client import CouponsClient
+from ..exceptions import CircuitOpenError, DeadlineExceededError
+from ..promotions.client import PromotionsClient
 from pydantic import Field
 from typing import Annotated
 
@@ -20,7 +21,7 @@ class CouponsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = CouponsClient(self.get_auth_headers())
+                self.client = PromotionsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_promotions(
                     service_id=service_id,
                     visible_only=visible_only,
@@ -30,6 +31,8 @@ class CouponsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo promociones: {str(e)}"}
 
@@ -62,7 +65,7 @@ class CouponsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = CouponsClient(self.get_auth_headers())
+                self.client = PromotionsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_gift_cards(
                     purchased_by_client_id=purchased_by_client_id,
                     used_by_client_id=used_by_client_id,
@@ -87,6 +90,8 @@ class CouponsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo tarjetas de regalo: {str(e)}"}
 
@@ -114,7 +119,7 @@ class CouponsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = CouponsClient(self.get_auth_headers())
+                self.client = PromotionsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_coupons(
                     used_by_client_id=used_by_client_id,
                     service_id=service_id,
@@ -134,6 +139,8 @@ class CouponsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo cupones: {str(e)}"}
 
@@ -158,7 +165,7 @@ class CouponsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = CouponsClient(self.get_auth_headers())
+                self.client = PromotionsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.issue_gift_card(
                     promotion_id=promotion_id,
                     start_date=start_date,
@@ -175,5 +182,7 @@ class CouponsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error emitiendo tarjetas de regalo: {str(e)}"}
\ No newline at end of file
@@ -0,0 +1,160 @@
+import os
+from typing import Dict, Any, Optional, List, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+
+DEFAULT_BASE_URL = "https://user-api-v2.simplybook.me"
+ADMIN_PATH = "/admin"
+
+# Registro de endpoints de la API: nombre -> ruta y políticas por defecto
+#
+# Políticas (todas opcionales, se sobrescriben con SIMPLYBOOK_ENDPOINT_<NOMBRE>_<POLÍTICA>):
+#   base_url: servidor alternativo para este endpoint (proxy con cache, región, simulador)
+#   max_attempts: intentos totales por petición (default: SIMPLYBOOK_RETRY_MAX_ATTEMPTS)
+#   cache_ttl: TTL en segundos de la cache de datos de referencia del grupo del mismo nombre
+#   connect_timeout, read_timeout, pool_timeout: timeouts en segundos (default: globales,
+#       ver get_timeout_config en http_client.py); read_timeout también se usa para escribir
+#
+# Una URL toma las políticas del endpoint con la ruta más larga que la contiene:
+# /admin/clients/fields usa "client_fields" y /admin/clients/42 usa "clients".
+ENDPOINTS: Dict[str, Dict[str, Any]] = {
+    "auth": {"path": "/admin/auth", "read_timeout": 10},
+    "bookings": {"path": "/admin/bookings"},
+    # Rangos grandes del calendario y los reportes detallados tardan legítimamente
+    "calendar": {"path": "/admin/calendar", "read_timeout": 60},
+    # Consultas de turnos: fallar rápido para que el agente pueda reintentar
+    "schedule": {"path": "/admin/schedule", "read_timeout": 5},
+    "timeline": {"path": "/admin/timeline", "read_timeout": 5},
+    # Turnos libres: TTL corto, se invalidan al reservar desde este servidor (ver cache.py)
+    "available_slots": {"path": "/admin/schedule/available-slots", "read_timeout": 5, "cache_ttl": 30},
+    "detailed_report": {"path": "/admin/detailed-report", "read_timeout": 120},
+    "statistics": {"path": "/admin/statistics"},
+    "clients": {"path": "/admin/clients"},
+    "client_fields": {"path": "/admin/clients/fields", "cache_ttl": 600},
+    "memberships": {"path": "/admin/memberships"},
+    "services": {"path": "/admin/services", "cache_ttl": 300},
+    "categories": {"path": "/admin/categories", "cache_ttl": 600},
+    "providers": {"path": "/admin/providers", "cache_ttl": 300},
+    "locations": {"path": "/admin/locations", "cache_ttl": 600},
+    "statuses": {"path": "/admin/statuses", "cache_ttl": 900},
+    "additional_fields": {"path": "/admin/additional-fields", "cache_ttl": 600},
+    "notes": {"path": "/admin/calendar-notes"},
+    "note_types": {"path": "/admin/calendar-notes/types", "cache_ttl": 900},
+    "products": {"path": "/admin/products"},
+    "promotions": {"path": "/admin/promotions"},
+    "invoices": {"path": "/admin/invoices"},
+    "payment_methods": {"path": "/admin/payment-methods"},
+    "tickets": {"path": "/admin/tickets"},
+    "tariff": {"path": "/admin/tariff"}
+}
+
+# Tipo de cada política (para leerlas desde variables de entorno)
+POLICY_TYPES = {
+    "base_url": str,
+    "max_attempts": int,
+    "cache_ttl": float,
+    "connect_timeout": float,
+    "read_timeout": float,
+    "pool_timeout": float
+}
+
+
+def get_base_url() -> str:
+    """
+    URL base de la API de SimplyBook.me (SIMPLYBOOK_BASE_URL)
+
+    Permite apuntar todos los clientes a otro servidor, por ejemplo una
+    región distinta o el simulador local de tests/simulator.
+    """
+    return os.getenv('SIMPLYBOOK_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
+
+
+def admin_url() -> str:
+    """URL base de los endpoints de administración (/admin), usada por todos los clientes"""
+    return f"{get_base_url()}{ADMIN_PATH}"
+
+
+def get_endpoint_policy(name: str) -> Dict[str, Any]:
+    """
+    Obtener las políticas de un endpoint del registro
+
+    Los valores por defecto de ENDPOINTS se sobrescriben con variables de
+    entorno SIMPLYBOOK_ENDPOINT_<NOMBRE>_<POLÍTICA>, por ejemplo
+    SIMPLYBOOK_ENDPOINT_BOOKINGS_MAX_ATTEMPTS=2 o
+    SIMPLYBOOK_ENDPOINT_SERVICES_BASE_URL=http://cache-proxy:8080.
+
+    Args:
+        name: Nombre del endpoint en ENDPOINTS
+
+    Returns:
+        Dict con la ruta y las políticas definidas (vacío si no está registrado)
+    """
+    policy = dict(ENDPOINTS.get(name, {}))
+    for setting, cast in POLICY_TYPES.items():
+        value = os.getenv(f'SIMPLYBOOK_ENDPOINT_{name.upper()}_{setting.upper()}')
+        if not value:
+            continue
+        try:
+            policy[setting] = cast(value)
+        except ValueError:
+            continue
+    if policy.get("base_url"):
+        policy["base_url"] = policy["base_url"].rstrip('/')
+    return policy
+
+
+def _registered_paths() -> List[Tuple[str, str]]:
+    # Rutas más largas primero para que gane la coincidencia más específica
+    return sorted(((entry["path"], name) for name, entry in ENDPOINTS.items()),
+                  key=lambda item: len(item[0]), reverse=True)
+
+
+def endpoint_name(url: str) -> Optional[str]:
+    """
+    Obtener el nombre del endpoint registrado que corresponde a una URL
+
+    Ejemplos:
+        https://user-api-v2.simplybook.me/admin/bookings/123 -> bookings
+        https://user-api-v2.simplybook.me/admin/clients/fields -> client_fields
+    """
+    path = urlsplit(url).path.rstrip('/')
+    for prefix, name in _registered_paths():
+        if path == prefix or path.startswith(prefix + "/"):
+            return name
+    return None
+
+
+def policy_for_url(url: str) -> Dict[str, Any]:
+    """Políticas del endpoint que corresponde a una URL (vacío si no está registrado)"""
+    name = endpoint_name(url)
+    return get_endpoint_policy(name) if name else {}
+
+
+def endpoint_url(name: str, suffix: str = "") -> str:
+    """
+    URL completa de un endpoint del registro
+
+    Args:
+        name: Nombre del endpoint en ENDPOINTS
+        suffix: Resto de la ruta (por ejemplo "/refresh-token")
+    """
+    policy = get_endpoint_policy(name)
+    return f"{policy.get('base_url') or get_base_url()}{policy['path']}{suffix}"
+
+
+def resolve_url(url: str, policy: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Aplicar a una URL el servidor alternativo de su endpoint, si tiene uno
+
+    Args:
+        url: URL armada por un cliente sobre la URL base global
+        policy: Políticas ya obtenidas con policy_for_url (se buscan si no se pasan)
+    """
+    if policy is None:
+        policy = policy_for_url(url)
+    base_url = policy.get("base_url")
+    if not base_url:
+        return url
+    target = urlsplit(base_url)
+    parts = urlsplit(url)
+    return urlunsplit((target.scheme, target.netloc, target.path + parts.path, parts.query, parts.fragment))
@@ -13,4 +13,42 @@ class AuthenticationError(SimplyBookException):
 
 class ResourceNotFoundError(SimplyBookException):
     def __init__(self, resource: str):
-        super().__init__(f"{resource} not found", status_code=404)
\ No newline at end of file
+        super().__init__(f"{resource} not found", status_code=404)
+
+class CircuitOpenError(SimplyBookException):
+    """La API de SimplyBook.me está fallando para esta familia de endpoints y se rechaza la petición sin enviarla"""
+    def __init__(self, family: str, retry_in: float):
+        self.family = family
+        self.retry_in = retry_in
+        super().__init__(
+            f"SimplyBook.me no está respondiendo en {family}; reintentar en {retry_in:.0f} segundos",
+            status_code=503,
+            details={"endpoint_family": family, "retry_in": round(retry_in, 1)}
+        )
+
+    def to_response(self) -> Dict[str, Any]:
+        """Respuesta estructurada para devolver desde una herramienta"""
+        return {
+            "error": self.message,
+            "error_type": "circuit_open",
+            **self.details
+        }
+
+class DeadlineExceededError(SimplyBookException):
+    """Se agotó el tiempo máximo de la invocación de herramienta antes de obtener respuesta"""
+    def __init__(self, tool: Optional[str], budget: float):
+        self.tool = tool
+        self.budget = budget
+        super().__init__(
+            f"La operación superó su tiempo límite de {round(budget, 1):g} segundos; se puede reintentar",
+            status_code=504,
+            details={"tool": tool, "deadline_seconds": round(budget, 1)}
+        )
+
+    def to_response(self) -> Dict[str, Any]:
+        """Respuesta estructurada para devolver desde una herramienta"""
+        return {
+            "error": self.message,
+            "error_type": "deadline_exceeded",
+            **self.details
+        }
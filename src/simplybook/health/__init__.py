@@ -0,0 +1,3 @@
+from .routes import HealthRoutes
+
+__all__ = ['HealthRoutes']
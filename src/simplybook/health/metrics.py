@@ -0,0 +1,122 @@
+from typing import Dict, Any, Optional, List
+
+import httpx
+from fastmcp import FastMCP
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
+
+from ..metrics import metrics, CONTENT_TYPE, CollectedMetric
+from ..circuit_breaker import circuit_breakers
+from ..rate_limiter import rate_limiter
+from ..retry import retry_policy
+from ..cache import reference_cache, slot_cache
+from ..logger import api_logger
+
+
+def pool_stats(http_client: httpx.AsyncClient) -> Optional[Dict[str, Any]]:
+    """
+    Uso del pool de conexiones compartido
+
+    httpx no expone estas cifras públicamente: se leen del pool de httpcore
+    y se devuelve None si la versión instalada no las tiene.
+
+    Returns:
+        Dict con connections, active, idle, queued y max_connections o None
+    """
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    if pool is None or not hasattr(pool, "connections"):
+        return None
+    connections = list(pool.connections)
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {
+        "connections": len(connections),
+        "active": len(connections) - idle,
+        "idle": idle,
+        "queued": len(getattr(pool, "_requests", [])),
+        "max_connections": getattr(pool, "_max_connections", None)
+    }
+
+
+def collect_component_metrics() -> List[CollectedMetric]:
+    """Métricas de cache, limitador, reintentos, circuit breakers y cola de logs"""
+    cache = reference_cache.stats()
+    slots = slot_cache.stats()
+    limiter = rate_limiter.stats()
+    retries = retry_policy.stats()
+    logging_stats = api_logger.stats()
+    return [
+        ("simplybook_cache_hits_total", "counter", "Lecturas servidas por la cache de datos de referencia",
+         [({}, cache["hits"])]),
+        ("simplybook_cache_misses_total", "counter", "Lecturas que tuvieron que ir a la API",
+         [({}, cache["misses"])]),
+        ("simplybook_cache_hit_ratio", "gauge", "Proporción de aciertos de la cache",
+         [({}, cache["hit_rate"])]),
+        ("simplybook_cache_entries", "gauge", "Entradas en la cache de datos de referencia",
+         [({}, cache["entries"])]),
+        ("simplybook_slot_cache_hits_total", "counter", "Consultas de turnos libres servidas por la cache o agrupadas",
+         [({}, slots["hits"])]),
+        ("simplybook_slot_cache_misses_total", "counter", "Consultas de turnos libres que fueron a la API",
+         [({}, slots["misses"])]),
+        ("simplybook_rate_limiter_rate", "gauge", "Peticiones por segundo permitidas ahora mismo",
+         [({}, limiter["rate"])]),
+        ("simplybook_rate_limiter_queue_depth", "gauge", "Peticiones esperando turno en el limitador",
+         [({}, limiter["queue_depth"])]),
+        ("simplybook_rate_limiter_waits_total", "counter", "Peticiones que tuvieron que esperar en el limitador",
+         [({}, limiter["waits"])]),
+        ("simplybook_rate_limiter_throttled_total", "counter", "Rechazos 403/429 que redujeron la tasa",
+         [({}, limiter["throttled"])]),
+        ("simplybook_retries_total", "counter", "Reintentos de peticiones a SimplyBook.me",
+         [({}, retries["retries"])]),
+        ("simplybook_retry_budget", "gauge", "Reintentos disponibles en el presupuesto compartido",
+         [({}, retries["budget"])]),
+        ("simplybook_circuit_breaker_open", "gauge", "1 si el circuito de la familia de endpoints no está cerrado",
+         [({"endpoint": family}, 0 if stats["state"] == "closed" else 1)
+          for family, stats in circuit_breakers.stats().items()]),
+        ("simplybook_api_log_dropped_total", "counter", "Entradas de log de API descartadas por cola llena",
+         [({}, logging_stats["dropped"])]),
+        ("simplybook_api_log_queue_pending", "gauge", "Entradas de log de API pendientes de escribir",
+         [({}, logging_stats["pending"])])
+    ]
+
+
+def collect_pool_metrics(http_client: httpx.AsyncClient) -> List[CollectedMetric]:
+    """Métricas del pool de conexiones compartido"""
+    stats = pool_stats(http_client)
+    if stats is None:
+        return []
+    collected = [
+        ("simplybook_pool_connections", "gauge", "Conexiones abiertas por estado",
+         [({"state": "active"}, stats["active"]), ({"state": "idle"}, stats["idle"])]),
+        ("simplybook_pool_queued_requests", "gauge", "Peticiones esperando una conexión libre",
+         [({}, stats["queued"])])
+    ]
+    if stats["max_connections"]:
+        collected.append(("simplybook_pool_utilization", "gauge", "Conexiones activas sobre el máximo del pool",
+                          [({}, stats["active"] / stats["max_connections"])]))
+    return collected
+
+
+def render_metrics(http_client: Optional[httpx.AsyncClient] = None) -> str:
+    """
+    Todas las métricas del servidor en formato de texto de Prometheus
+
+    Args:
+        http_client: Pool de conexiones compartido (para las métricas de uso del pool)
+    """
+    collected = collect_component_metrics()
+    if http_client is not None:
+        collected += collect_pool_metrics(http_client)
+    return metrics.render(collected)
+
+
+def register_metrics_route(mcp: FastMCP, http_client: Optional[httpx.AsyncClient] = None) -> None:
+    """
+    Exponer GET /metrics junto a la app SSE
+
+    Args:
+        mcp: Servidor FastMCP (la ruta se agrega a la app que levanta run_async)
+        http_client: Pool de conexiones compartido
+    """
+    @mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def prometheus_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(http_client), media_type=CONTENT_TYPE)
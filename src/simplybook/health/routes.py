@@ -0,0 +1,30 @@
+from typing import Dict, Any
+from ..base_routes import BaseRoutes
+from ..circuit_breaker import circuit_breakers
+from ..rate_limiter import rate_limiter
+from ..retry import retry_policy
+from ..cache import reference_cache, slot_cache
+from ..logger import api_logger
+
+class HealthRoutes(BaseRoutes):
+    def register_tools(self, mcp):
+        @mcp.tool(
+            description="Obtener el estado de la conexión con SimplyBook.me: circuit breakers por familia de endpoints, limitador de peticiones, reintentos, cache y cola de logs",
+            tags={"health", "status"}
+        )
+        async def get_api_status() -> Dict[str, Any]:
+            """Obtener el estado de la conexión con la API de SimplyBook.me"""
+            try:
+                breakers = circuit_breakers.stats()
+                return {
+                    "success": True,
+                    "healthy": all(breaker["state"] == "closed" for breaker in breakers.values()),
+                    "circuit_breakers": breakers,
+                    "rate_limiter": rate_limiter.stats(),
+                    "retries": retry_policy.stats(),
+                    "cache": reference_cache.stats(),
+                    "slot_cache": slot_cache.stats(),
+                    "api_logging": api_logger.stats()
+                }
+            except Exception as e:
+                return {"error": f"Error obteniendo estado de la API: {str(e)}"}
@@ -1,203 +1,392 @@
+import asyncio
 import httpx
+import logging
+import os
 import time
 from typing import Dict, Any, Optional
 from .logger import api_logger
+from .rate_limiter import rate_limiter
+from .retry import retry_policy
+from .circuit_breaker import circuit_breakers, endpoint_family
+from .endpoints import DEFAULT_BASE_URL, get_base_url, policy_for_url, resolve_url
+from .correlation import REQUEST_ID_HEADER, new_request_id, current_tool_call, remaining_time, deadline_budget
+from .exceptions import DeadlineExceededError
+from .metrics import upstream_request_duration, rate_limiter_wait
+from .tracing import span, set_attributes, inject_context
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Leer un entero desde variables de entorno con valor por defecto"""
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Leer un float desde variables de entorno con valor por defecto"""
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_timeout_config() -> Dict[str, float]:
+    """
+    Timeouts por defecto de cada petición (los endpoints del registro pueden cambiarlos)
+    
+    Variables:
+        SIMPLYBOOK_HTTP_CONNECT_TIMEOUT: Segundos para establecer la conexión (default: 5)
+        SIMPLYBOOK_HTTP_TIMEOUT: Segundos de lectura/escritura (default: 30)
+        SIMPLYBOOK_HTTP_POOL_TIMEOUT: Segundos esperando una conexión libre del pool (default: 10)
+    """
+    return {
+        "connect_timeout": _env_float('SIMPLYBOOK_HTTP_CONNECT_TIMEOUT', 5.0),
+        "read_timeout": _env_float('SIMPLYBOOK_HTTP_TIMEOUT', 30.0),
+        "pool_timeout": _env_float('SIMPLYBOOK_HTTP_POOL_TIMEOUT', 10.0)
+    }
+
+
+def request_timeout(policy: Dict[str, Any], remaining: Optional[float] = None) -> httpx.Timeout:
+    """
+    Timeout de una petición según las políticas de su endpoint
+    
+    Args:
+        policy: Políticas del endpoint (ver endpoints.py)
+        remaining: Segundos que le quedan a la invocación de herramienta; ningún
+            timeout lo supera para que la petición no exceda el tiempo límite
+    """
+    values = {**get_timeout_config(), **{k: v for k, v in policy.items() if k.endswith("_timeout")}}
+    if remaining is not None:
+        values = {key: min(value, max(remaining, 0.001)) for key, value in values.items()}
+    return httpx.Timeout(
+        connect=values["connect_timeout"],
+        read=values["read_timeout"],
+        write=values["read_timeout"],
+        pool=values["pool_timeout"]
+    )
+
+
+def deadline_exceeded() -> DeadlineExceededError:
+    """Error de tiempo límite agotado para la invocación de herramienta en curso"""
+    current = current_tool_call() or {}
+    return DeadlineExceededError(current.get("tool"), deadline_budget() or 0.0)
+
+
+def _fits_deadline(delay: float) -> bool:
+    """Verificar que un reintento tras `delay` segundos todavía entra en el tiempo límite"""
+    remaining = remaining_time()
+    return remaining is None or delay < remaining
+
+
+def encode_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Aplanar los parámetros anidados con la notación de corchetes de la API
+    
+    httpx convierte un dict anidado en su repr; SimplyBook espera
+    filter[service_id]=1 y filter[services][0]=2. Las listas de primer nivel
+    se dejan como están (httpx repite la clave).
+    
+    Ejemplo:
+        {"filter": {"search": "ana", "services": [1, 2]}}
+        -> {"filter[search]": "ana", "filter[services][0]": 1, "filter[services][1]": 2}
+    """
+    if not params:
+        return params
+    
+    def flatten(prefix: str, value: Any, into: Dict[str, Any]) -> None:
+        if isinstance(value, dict):
+            for key, item in value.items():
+                flatten(f"{prefix}[{key}]", item, into)
+        elif isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                flatten(f"{prefix}[{index}]", item, into)
+        elif value is not None:
+            into[prefix] = value
+    
+    encoded: Dict[str, Any] = {}
+    for key, value in params.items():
+        if isinstance(value, dict):
+            flatten(key, value, encoded)
+        else:
+            encoded[key] = value
+    return encoded
+
+
+def is_http2_available() -> bool:
+    """Verificar si el paquete h2 está instalado (requerido por httpx para HTTP/2)"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_pool_config() -> Dict[str, Any]:
+    """
+    Obtener configuración del pool de conexiones desde variables de entorno
+    
+    Variables:
+        SIMPLYBOOK_HTTP2: Habilitar HTTP/2 (default: true si h2 está instalado)
+        SIMPLYBOOK_MAX_CONNECTIONS: Máximo de conexiones simultáneas (default: 100)
+        SIMPLYBOOK_MAX_KEEPALIVE_CONNECTIONS: Máximo de conexiones keep-alive (default: 20)
+        SIMPLYBOOK_KEEPALIVE_EXPIRY: Segundos antes de cerrar una conexión ociosa (default: 30)
+        SIMPLYBOOK_HTTP_TIMEOUT: Timeout por defecto en segundos (default: 30)
+    """
+    return {
+        "http2": os.getenv('SIMPLYBOOK_HTTP2', 'true').lower() in ('true', '1', 'yes', 'on'),
+        "max_connections": _env_int('SIMPLYBOOK_MAX_CONNECTIONS', 100),
+        "max_keepalive_connections": _env_int('SIMPLYBOOK_MAX_KEEPALIVE_CONNECTIONS', 20),
+        "keepalive_expiry": _env_float('SIMPLYBOOK_KEEPALIVE_EXPIRY', 30.0),
+        "timeout": _env_float('SIMPLYBOOK_HTTP_TIMEOUT', 30.0)
+    }
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Crear el pool de conexiones compartido por todos los clientes de SimplyBook
+    
+    El cliente devuelto es de larga duración: quien lo crea (el ciclo de vida
+    del servidor en main.py) es responsable de cerrarlo con aclose().
+    
+    Returns:
+        httpx.AsyncClient con keep-alive, límites de conexión y HTTP/2 si está disponible
+    """
+    config = get_pool_config()
+    http2 = config["http2"]
+    
+    if http2 and not is_http2_available():
+        logger.warning(
+            "HTTP/2 solicitado pero el paquete 'h2' no está instalado, usando HTTP/1.1"
+        )
+        http2 = False
+    
+    limits = httpx.Limits(
+        max_connections=config["max_connections"],
+        max_keepalive_connections=config["max_keepalive_connections"],
+        keepalive_expiry=config["keepalive_expiry"]
+    )
+    
+    return httpx.AsyncClient(
+        timeout=config["timeout"],
+        limits=limits,
+        http2=http2
+    )
 
 
 class LoggingHTTPClient:
     """Cliente HTTP wrapper que loggee todas las llamadas a la API de SimplyBook.me"""
     
-    def __init__(self, base_url: str, headers: Dict[str, str]):
+    def __init__(self, base_url: str, headers: Dict[str, str],
+                 http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Args:
+            base_url: URL base de la API
+            headers: Headers a enviar en cada petición
+            http_client: Pool de conexiones compartido. Si no se proporciona se crea
+                un cliente propio que se cierra al salir del contexto.
+        """
         self.base_url = base_url
         self.headers = headers
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self._owns_client = http_client is None
+        self.client = http_client if http_client is not None else httpx.AsyncClient(timeout=30.0)
     
     async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> httpx.Response:
         """Realizar una petición GET con logging"""
-        url = f"{self.base_url}{endpoint}"
-        start_time = time.time()
-        request_id = None
-        
-        try:
-            # Loggear el request
-            request_id = api_logger.log_request(
-                method="GET",
-                url=url,
-                headers=self.headers,
-                params=params
-            )
-            
-            # Realizar la petición
-            response = await self.client.get(url, headers=self.headers, params=params)
-            
-            # Calcular duración
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Loggear la respuesta
-            try:
-                response_data = response.json() if response.content else None
-            except:
-                response_data = None
-                
-            api_logger.log_response(
-                request_id=request_id,
-                status_code=response.status_code,
-                response_data=response_data,
-                duration_ms=duration_ms
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Loggear el error
-            if request_id:
-                api_logger.log_error(
-                    request_id=request_id,
-                    error=str(e),
-                    context={"method": "GET", "url": url}
-                )
-            raise
+        return await self._request("GET", endpoint, params=params)
     
-    async def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
-        """Realizar una petición POST con logging"""
-        url = f"{self.base_url}{endpoint}"
-        start_time = time.time()
-        request_id = None
+    async def post(self, endpoint: str, json: Optional[Dict[str, Any]] = None,
+                   idempotent: Optional[bool] = None) -> httpx.Response:
+        """
+        Realizar una petición POST con logging
         
-        try:
-            # Loggear el request
-            request_id = api_logger.log_request(
-                method="POST",
-                url=url,
-                headers=self.headers,
-                data=json
-            )
-            
-            # Realizar la petición
-            response = await self.client.post(url, headers=self.headers, json=json)
-            
-            # Calcular duración
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Loggear la respuesta
-            try:
-                response_data = response.json() if response.content else None
-            except:
-                response_data = None
-                
-            api_logger.log_response(
-                request_id=request_id,
-                status_code=response.status_code,
-                response_data=response_data,
-                duration_ms=duration_ms
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Loggear el error
-            if request_id:
-                api_logger.log_error(
-                    request_id=request_id,
-                    error=str(e),
-                    context={"method": "POST", "url": url}
-                )
-            raise
+        Args:
+            endpoint: Ruta relativa a base_url
+            json: Cuerpo JSON
+            idempotent: Marcar el POST como repetible (p. ej. el login); por defecto no se reintenta
+        """
+        return await self._request("POST", endpoint, json=json, idempotent=idempotent)
     
     async def put(self, endpoint: str, json: Optional[Dict[str, Any]] = None) -> httpx.Response:
         """Realizar una petición PUT con logging"""
-        url = f"{self.base_url}{endpoint}"
-        start_time = time.time()
-        request_id = None
-        
-        try:
-            # Loggear el request
-            request_id = api_logger.log_request(
-                method="PUT",
-                url=url,
-                headers=self.headers,
-                data=json
-            )
-            
-            # Realizar la petición
-            response = await self.client.put(url, headers=self.headers, json=json)
-            
-            # Calcular duración
-            duration_ms = (time.time() - start_time) * 1000
-            
-            # Loggear la respuesta
-            try:
-                response_data = response.json() if response.content else None
-            except:
-                response_data = None
-                
-            api_logger.log_response(
-                request_id=request_id,
-                status_code=response.status_code,
-                response_data=response_data,
-                duration_ms=duration_ms
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Loggear el error
-            if request_id:
-                api_logger.log_error(
-                    request_id=request_id,
-                    error=str(e),
-                    context={"method": "PUT", "url": url}
-                )
-            raise
+        return await self._request("PUT", endpoint, json=json)
     
     async def delete(self, endpoint: str) -> httpx.Response:
         """Realizar una petición DELETE con logging"""
-        url = f"{self.base_url}{endpoint}"
-        start_time = time.time()
-        request_id = None
+        return await self._request("DELETE", endpoint)
+    
+    async def _request(self, method: str, endpoint: str,
+                       params: Optional[Dict[str, Any]] = None,
+                       json: Optional[Dict[str, Any]] = None,
+                       idempotent: Optional[bool] = None) -> httpx.Response:
+        """
+        Realizar una petición aplicando el circuit breaker de su familia de
+        endpoints, la política de reintentos global y los timeouts del endpoint
+        
+        Dentro de una invocación de herramienta con tiempo límite los timeouts
+        se recortan al tiempo que queda y no se reintenta si ya no alcanza.
         
-        try:
-            # Loggear el request
-            request_id = api_logger.log_request(
-                method="DELETE",
-                url=url,
-                headers=self.headers
-            )
+        Args:
+            method: Método HTTP
+            endpoint: Ruta relativa a base_url
+            params: Parámetros de query
+            json: Cuerpo JSON
+            idempotent: Si se puede repetir (default: según el método)
             
-            # Realizar la petición
-            response = await self.client.delete(url, headers=self.headers)
+        Returns:
+            La respuesta del último intento
             
-            # Calcular duración
-            duration_ms = (time.time() - start_time) * 1000
+        Raises:
+            DeadlineExceededError: Si se agota el tiempo límite de la herramienta
+        """
+        url = f"{self.base_url}{endpoint}"
+        # Políticas del endpoint en el registro central (servidor alternativo, reintentos, timeouts)
+        policy = policy_for_url(url)
+        url = resolve_url(url, policy)
+        params = encode_params(params)
+        max_attempts = policy.get("max_attempts")
+        if idempotent is None:
+            idempotent = retry_policy.is_idempotent(method)
+        breaker = circuit_breakers.for_url(url)
+        retry_policy.record_request()
+        started = time.monotonic()
+        attempt = 0
+        
+        while True:
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                raise deadline_exceeded()
+            # Con el circuito abierto se falla de inmediato sin esperar el timeout
+            if breaker is not None:
+                breaker.before_request()
+            try:
+                response = await self._send(method, url, params, json, request_timeout(policy, remaining))
+            except Exception as e:
+                if isinstance(e, httpx.TimeoutException) and remaining is not None and remaining_time() <= 0:
+                    # El timeout lo recortó el tiempo límite de la herramienta: no dice
+                    # nada de la salud de la API y no queda tiempo para reintentar
+                    if breaker is not None:
+                        breaker.release_probe()
+                    raise deadline_exceeded() from e
+                if breaker is not None:
+                    if isinstance(e, httpx.TransportError):
+                        breaker.record_failure()
+                    else:
+                        # No dice nada de la salud de la API (p. ej. circuito abierto
+                        # de /admin/auth durante el re-login de TokenAuth)
+                        breaker.release_probe()
+                delay = retry_policy.retry_delay(attempt, started, idempotent, error=e,
+                                                 max_attempts=max_attempts)
+                if delay is None or not _fits_deadline(delay):
+                    raise
+                logger.warning(f"{method} {url} failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            except BaseException:
+                # Cancelación de la tarea: liberar el cupo de prueba si lo tenía
+                if breaker is not None:
+                    breaker.release_probe()
+                raise
+            else:
+                if breaker is not None:
+                    if response.status_code >= 500:
+                        breaker.record_failure()
+                    else:
+                        breaker.record_success()
+                delay = retry_policy.retry_delay(attempt, started, idempotent, response=response,
+                                                 max_attempts=max_attempts)
+                if delay is None or not _fits_deadline(delay):
+                    return response
+                logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.2f}s")
             
-            # Loggear la respuesta
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def _send(self, method: str, url: str,
+                    params: Optional[Dict[str, Any]] = None,
+                    json: Optional[Dict[str, Any]] = None,
+                    timeout: Any = httpx.USE_CLIENT_DEFAULT) -> httpx.Response:
+        """
+        Enviar un intento respetando el limitador global, con logging
+        
+        Cada intento lleva su propio ID en el header X-Request-ID; el log lo
+        asocia además a la invocación de herramienta en curso (call_id). Con
+        trazas habilitadas cada intento es un span y se envía traceparent.
+        """
+        request_id = new_request_id()
+        headers = {**self.headers, REQUEST_ID_HEADER: request_id}
+        start_time = None
+        
+        with span(f"HTTP {method}", **{
+            "http.request.method": method,
+            "url.full": url,
+            "simplybook.endpoint": endpoint_family(url),
+            "simplybook.request_id": request_id
+        }) as current:
+            inject_context(headers)
             try:
-                response_data = response.json() if response.content else None
-            except:
-                response_data = None
+                # Loggear el request
+                api_logger.log_request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    params=params,
+                    data=json,
+                    request_id=request_id
+                )
                 
-            api_logger.log_response(
-                request_id=request_id,
-                status_code=response.status_code,
-                response_data=response_data,
-                duration_ms=duration_ms
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Loggear el error
-            if request_id:
+                # Esperar turno en el limitador compartido por todos los clientes
+                waited = await rate_limiter.acquire()
+                rate_limiter_wait.observe(waited)
+                set_attributes(current, **{"simplybook.rate_limiter_wait": waited})
+                start_time = time.time()
+                
+                # Realizar la petición
+                response = await self.client.request(method, url, headers=headers, params=params, json=json,
+                                                     timeout=timeout)
+                
+                # Calcular duración
+                duration_ms = (time.time() - start_time) * 1000
+                
+                upstream_request_duration.observe(
+                    duration_ms / 1000, endpoint=endpoint_family(url), method=method, status=response.status_code
+                )
+                set_attributes(current, **{"http.response.status_code": response.status_code})
+                
+                # Ajustar la tasa si la API indica que vamos demasiado rápido
+                rate_limiter.observe(response)
+                
+                # Loggear la respuesta: el cuerpo va crudo y solo lo decodifica el hilo
+                # escritor si el modo de log lo requiere; quien llama parsea una sola vez
+                api_logger.log_response(
+                    request_id=request_id,
+                    status_code=response.status_code,
+                    duration_ms=duration_ms,
+                    url=url,
+                    body=response.content,
+                    response_headers=response.headers
+                )
+                
+                return response
+                
+            except Exception as e:
+                if start_time is not None:
+                    upstream_request_duration.observe(
+                        time.time() - start_time, endpoint=endpoint_family(url), method=method, status="error"
+                    )
+                
+                # Loggear el error
                 api_logger.log_error(
                     request_id=request_id,
                     error=str(e),
-                    context={"method": "DELETE", "url": url}
+                    context={"method": method, "url": url}
                 )
-            raise
+                raise
     
     async def close(self):
-        """Cerrar el cliente HTTP"""
-        await self.client.aclose()
+        """Cerrar el cliente HTTP (el pool compartido lo cierra su propietario)"""
+        if self._owns_client:
+            await self.client.aclose()
     
     async def __aenter__(self):
         return self
@@ -1,14 +1,21 @@
 from typing import Dict, Any, Optional, List
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..cache import cached
 
+@traced_client
 class IntakeFormsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
+    @cached("additional_fields")
     async def get_additional_fields(self, service_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Obtener lista de campos adicionales
@@ -23,7 +30,7 @@ class IntakeFormsClient:
         if service_id:
             params["filter"] = {"service_id": service_id}
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/additional-fields", params=params)
             response.raise_for_status()
             return response.json() 
\ No newline at end of file
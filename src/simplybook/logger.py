@@ -1,9 +1,16 @@
+import atexit
+import gzip
 import logging
 import json
+import queue
+import shutil
 import time
 from datetime import datetime
-from typing import Dict, Any, Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Any, Optional, List, Callable, Mapping
 import os
+from .circuit_breaker import endpoint_family
+from .correlation import new_request_id, current_tool_call
 
 
 def is_logging_enabled() -> bool:
@@ -11,45 +18,321 @@ def is_logging_enabled() -> bool:
     return os.getenv('ENABLE_API_LOGGING', 'true').lower() in ('true', '1', 'yes', 'on')
 
 
+def get_log_queue_size() -> int:
+    """Capacidad de la cola de logs de API (SIMPLYBOOK_LOG_QUEUE_SIZE, default: 10000)"""
+    try:
+        return int(os.getenv('SIMPLYBOOK_LOG_QUEUE_SIZE', 10000))
+    except ValueError:
+        return 10000
+
+
+# Modos de log del cuerpo de las respuestas
+LOG_MODES = ("headers", "truncated", "sampled", "full")
+
+# Familias cuyas respuestas traen credenciales (token, refresh_token): nunca se guarda su cuerpo sin sanitizar
+CREDENTIAL_FAMILIES = {"/admin/auth"}
+
+
+def get_log_mode_config() -> Dict[str, Any]:
+    """
+    Obtener configuración de los modos de log desde variables de entorno
+    
+    Variables:
+        SIMPLYBOOK_LOG_MODE: Modo por defecto: headers, truncated, sampled o full (default: truncated)
+        SIMPLYBOOK_LOG_MODE_OVERRIDES: Modo por familia de endpoints, p. ej. "/calendar=headers,/bookings=full"
+        SIMPLYBOOK_LOG_MAX_BODY_BYTES: Bytes del cuerpo que se guardan en modo truncated (default: 4096)
+        SIMPLYBOOK_LOG_SAMPLE_RATE: En modo sampled, se guarda el cuerpo completo de 1 de cada N (default: 10)
+    """
+    def _int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, default))
+        except ValueError:
+            return default
+    
+    mode = os.getenv('SIMPLYBOOK_LOG_MODE', 'truncated').lower()
+    overrides = {}
+    for item in os.getenv('SIMPLYBOOK_LOG_MODE_OVERRIDES', '').split(','):
+        family, _, family_mode = item.partition('=')
+        if family.strip() and family_mode.strip().lower() in LOG_MODES:
+            overrides[family.strip()] = family_mode.strip().lower()
+    
+    return {
+        "mode": mode if mode in LOG_MODES else "truncated",
+        "overrides": overrides,
+        "max_body_bytes": max(0, _int('SIMPLYBOOK_LOG_MAX_BODY_BYTES', 4096)),
+        "sample_rate": max(1, _int('SIMPLYBOOK_LOG_SAMPLE_RATE', 10))
+    }
+
+
+class _RawBody:
+    """Cuerpo de respuesta sin decodificar; se parsea y sanitiza en el hilo escritor"""
+    
+    __slots__ = ("content", "sanitize")
+    
+    def __init__(self, content: bytes, sanitize: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.content = content
+        self.sanitize = sanitize
+    
+    def decode(self) -> Any:
+        try:
+            data = json.loads(self.content)
+        except ValueError:
+            return self.content.decode('utf-8', 'replace')
+        return self.sanitize(data) if isinstance(data, dict) else data
+
+
+def _serialize_default(value: Any) -> Any:
+    if isinstance(value, _RawBody):
+        return value.decode()
+    return str(value)
+
+
+class _JsonMessage:
+    """Entrada de log que se serializa recién al escribirla, en el hilo escritor"""
+    
+    __slots__ = ("entry",)
+    
+    def __init__(self, entry: Dict[str, Any]):
+        self.entry = entry
+    
+    def __str__(self) -> str:
+        # Una sola línea compacta; los cuerpos crudos se decodifican aquí, fuera del event loop
+        return json.dumps(self.entry, separators=(',', ':'), ensure_ascii=False, default=_serialize_default)
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatea cada entrada de API como un objeto JSON por línea (JSON Lines)"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        message = record.args[-1] if isinstance(record.args, tuple) and record.args else None
+        if isinstance(message, _JsonMessage):
+            entry = {"event": getattr(record, "api_event", None), "level": record.levelname, **message.entry}
+        else:
+            entry = {
+                "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+                "level": record.levelname,
+                "message": record.getMessage()
+            }
+        return json.dumps(entry, separators=(',', ':'), ensure_ascii=False, default=_serialize_default)
+
+
+def get_api_log_file_config() -> Dict[str, Any]:
+    """
+    Obtener configuración del archivo de log de API desde variables de entorno
+    
+    Variables:
+        SIMPLYBOOK_API_LOG_FILE: Ruta del archivo JSON Lines (default: logs/simplybook_api.jsonl)
+        SIMPLYBOOK_API_LOG_MAX_BYTES: Tamaño que dispara la rotación (default: 50 MB, 0 = sin límite)
+        SIMPLYBOOK_API_LOG_ROTATE_INTERVAL: Segundos entre rotaciones (default: 86400, 0 = sin rotación por tiempo)
+        SIMPLYBOOK_API_LOG_BACKUPS: Segmentos comprimidos que se conservan (default: 7)
+    """
+    def _int(name: str, default: int) -> int:
+        try:
+            return int(os.getenv(name, default))
+        except ValueError:
+            return default
+    
+    return {
+        "path": os.getenv('SIMPLYBOOK_API_LOG_FILE', os.path.join("logs", "simplybook_api.jsonl")),
+        "max_bytes": max(0, _int('SIMPLYBOOK_API_LOG_MAX_BYTES', 50 * 1024 * 1024)),
+        "rotate_interval": max(0, _int('SIMPLYBOOK_API_LOG_ROTATE_INTERVAL', 86400)),
+        "backups": max(1, _int('SIMPLYBOOK_API_LOG_BACKUPS', 7))
+    }
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """
+    Archivo de log que rota por tamaño o por tiempo y comprime los segmentos
+    
+    Los segmentos rotados se guardan como <archivo>.1.gz, <archivo>.2.gz, ...
+    y solo se conservan los últimos `backups`. Se ejecuta en el hilo
+    escritor del QueueListener, así que la compresión no bloquea el event loop.
+    """
+    
+    def __init__(self, filename: str, max_bytes: int = 0, rotate_interval: float = 0,
+                 backups: int = 7, encoding: str = 'utf-8'):
+        """
+        Args:
+            filename: Ruta del archivo activo
+            max_bytes: Tamaño que dispara la rotación (0 = sin límite)
+            rotate_interval: Segundos entre rotaciones (0 = sin rotación por tiempo)
+            backups: Segmentos rotados que se conservan
+            encoding: Codificación del archivo
+        """
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backups, encoding=encoding)
+        self.rotate_interval = rotate_interval
+        self.namer = lambda name: f"{name}.gz"
+        self.rotator = self._compress
+        self._rollover_at = self._next_rollover()
+    
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if self.rotate_interval and time.time() >= self._rollover_at:
+            return 1
+        if self.maxBytes > 0:
+            if self.stream is None:
+                self.stream = self._open()
+            # Comparar el tamaño actual evita formatear dos veces cada entrada
+            return 1 if self.stream.tell() >= self.maxBytes else 0
+        return 0
+    
+    def doRollover(self) -> None:
+        super().doRollover()
+        self._rollover_at = self._next_rollover()
+    
+    def _next_rollover(self) -> float:
+        return time.time() + self.rotate_interval if self.rotate_interval else float('inf')
+    
+    @staticmethod
+    def _compress(source: str, dest: str) -> None:
+        if not os.path.exists(source):
+            return
+        with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.remove(source)
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """QueueHandler que no formatea en el hilo llamador y descarta si la cola está llena"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El formateo (y la serialización JSON) lo hace el QueueListener
+        return record
+    
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class _ApiLogListener(QueueListener):
+    """QueueListener que espera lugar en la cola acotada para la señal de parada"""
+    
+    def enqueue_sentinel(self) -> None:
+        try:
+            self.queue.put(self._sentinel, timeout=5)
+        except queue.Full:
+            pass
+
+
 class SimplyBookLogger:
-    """Logger centralizado para todas las llamadas a la API de SimplyBook.me"""
+    """
+    Logger centralizado para todas las llamadas a la API de SimplyBook.me
     
-    def __init__(self):
-        self.logger = self._setup_logger()
+    Las llamadas de log solo encolan la entrada: un hilo en segundo plano
+    (QueueListener) la serializa en una línea JSON y la escribe en archivo y
+    consola, de modo que el event loop nunca espera por el disco ni por
+    json.dumps. La cola es acotada; si se llena las entradas se descartan y
+    se cuentan en stats().
+    """
+    
+    def __init__(self, name: str = 'simplybook_api', handlers: Optional[List[logging.Handler]] = None,
+                 queue_size: Optional[int] = None, mode_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            name: Nombre del logger
+            handlers: Handlers de destino (default: archivo JSON Lines rotado y consola)
+            queue_size: Capacidad de la cola (default: SIMPLYBOOK_LOG_QUEUE_SIZE)
+            mode_config: Modos de log del cuerpo (default: get_log_mode_config())
+        """
+        self.mode_config = mode_config or get_log_mode_config()
+        self._sample_counter = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size if queue_size is not None else get_log_queue_size())
+        self._queue_handler = _BoundedQueueHandler(self._queue)
+        self._listener: Optional[_ApiLogListener] = None
+        self.logger = self._setup_logger(name, handlers)
         
-    def _setup_logger(self) -> logging.Logger:
+    def _setup_logger(self, name: str, handlers: Optional[List[logging.Handler]]) -> logging.Logger:
         """Configurar el logger"""
-        logger = logging.getLogger('simplybook_api')
+        logger = logging.getLogger(name)
         logger.setLevel(logging.INFO)
+        # Los registros no deben llegar a los handlers síncronos del root logger
+        logger.propagate = False
         
         # Evitar duplicar handlers
         if not logger.handlers:
-            # Handler para archivo
-            log_dir = "logs"
-            if not os.path.exists(log_dir):
-                os.makedirs(log_dir)
-                
-            file_handler = logging.FileHandler(f"{log_dir}/simplybook_api.log")
-            file_handler.setLevel(logging.INFO)
-            
-            # Handler para consola
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(logging.INFO)
+            if handlers is None:
+                handlers = self._default_handlers()
             
-            # Formato
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            file_handler.setFormatter(formatter)
-            console_handler.setFormatter(formatter)
+            self._listener = _ApiLogListener(self._queue, *handlers, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self.close)
             
-            logger.addHandler(file_handler)
-            logger.addHandler(console_handler)
+            logger.addHandler(self._queue_handler)
         
         return logger
     
+    def _default_handlers(self) -> List[logging.Handler]:
+        """Handlers de archivo JSON Lines y consola que usa el hilo escritor"""
+        # Handler para archivo: una entrada JSON por línea, con rotación y compresión
+        config = get_api_log_file_config()
+        file_handler = CompressingRotatingFileHandler(
+            config["path"],
+            max_bytes=config["max_bytes"],
+            rotate_interval=config["rotate_interval"],
+            backups=config["backups"]
+        )
+        file_handler.setLevel(logging.INFO)
+        file_handler.setFormatter(JsonLinesFormatter())
+        
+        # Handler para consola
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(logging.INFO)
+        console_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+        ))
+        
+        return [file_handler, console_handler]
+    
+    def flush(self) -> None:
+        """Esperar a que el hilo escritor procese todas las entradas encoladas"""
+        if self._listener is not None:
+            self._queue.join()
+    
+    def close(self) -> None:
+        """Vaciar la cola y detener el hilo escritor"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+    
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de la cola de logs: entradas encoladas, descartadas y pendientes"""
+        return {
+            "enqueued": self._queue_handler.enqueued,
+            "dropped": self._queue_handler.dropped,
+            "pending": self._queue.qsize(),
+            "capacity": self._queue.maxsize
+        }
+    
+    def get_mode(self, url: Optional[str]) -> str:
+        """
+        Modo de log para una URL según su familia de endpoints
+        
+        Args:
+            url: URL de la petición
+            
+        Returns:
+            headers, truncated, sampled o full
+        """
+        overrides = self.mode_config["overrides"]
+        if url and overrides:
+            family = endpoint_family(url)
+            if family in overrides:
+                return overrides[family]
+        return self.mode_config["mode"]
+    
     def log_request(self, method: str, url: str, headers: Dict[str, str], 
-                   data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None) -> str:
+                   data: Optional[Dict[str, Any]] = None, params: Optional[Dict[str, Any]] = None,
+                   request_id: Optional[str] = None) -> str:
         """
         Loggear un request a la API
         
@@ -59,15 +342,16 @@ class SimplyBookLogger:
             headers: Headers del request
             data: Datos del body (para POST/PUT)
             params: Parámetros de query (para GET)
+            request_id: ID ya asignado al request (default: uno nuevo)
             
         Returns:
             ID único del request para correlacionar con la respuesta
         """
+        request_id = request_id or new_request_id()
+        
         # Verificar si el logging está habilitado
         if not is_logging_enabled():
-            return f"req_{int(time.time() * 1000)}"
-        
-        request_id = f"req_{int(time.time() * 1000)}"
+            return request_id
         
         # Ocultar información sensible en los logs
         safe_headers = self._sanitize_headers(headers)
@@ -75,6 +359,7 @@ class SimplyBookLogger:
         
         log_entry = {
             "request_id": request_id,
+            **self._correlation(),
             "timestamp": datetime.now().isoformat(),
             "method": method,
             "url": url,
@@ -83,21 +368,35 @@ class SimplyBookLogger:
             "params": params
         }
         
-        self.logger.info(f"API REQUEST [{request_id}]: {json.dumps(log_entry, indent=2)}")
+        self.logger.info("API REQUEST [%s]: %s", request_id, _JsonMessage(log_entry),
+                        extra={"api_event": "request"})
         return request_id
     
     def log_response(self, request_id: str, status_code: int, 
                     response_data: Optional[Dict[str, Any]] = None,
-                    error: Optional[str] = None, duration_ms: Optional[float] = None) -> None:
+                    error: Optional[str] = None, duration_ms: Optional[float] = None,
+                    url: Optional[str] = None, body: Optional[bytes] = None,
+                    response_headers: Optional[Mapping[str, str]] = None) -> None:
         """
         Loggear una respuesta de la API
         
+        El cuerpo se recibe crudo (body) y solo se guarda según el modo de la
+        familia de endpoints: headers (sin cuerpo), truncated (primeros N
+        bytes), sampled (cuerpo completo 1 de cada N, el resto solo headers) o
+        full. En modo full el JSON se decodifica en el hilo escritor, nunca en
+        el event loop. Las respuestas de error guardan al menos el cuerpo truncado.
+        Las familias de CREDENTIAL_FAMILIES nunca usan truncated: su cuerpo se
+        guarda completo y sanitizado.
+        
         Args:
             request_id: ID del request correspondiente
             status_code: Código de estado HTTP
-            response_data: Datos de la respuesta
+            response_data: Datos de la respuesta ya parseados (se guardan completos)
             error: Mensaje de error si existe
             duration_ms: Duración del request en milisegundos
+            url: URL de la petición (para elegir el modo de log)
+            body: Cuerpo crudo de la respuesta
+            response_headers: Headers de la respuesta
         """
         # Verificar si el logging está habilitado
         if not is_logging_enabled():
@@ -105,19 +404,43 @@ class SimplyBookLogger:
         
         log_entry = {
             "request_id": request_id,
+            **self._correlation(),
             "timestamp": datetime.now().isoformat(),
             "status_code": status_code,
             "duration_ms": duration_ms,
             "success": status_code < 400
         }
         
+        if response_headers is not None:
+            log_entry["response_headers"] = self._sanitize_headers(dict(response_headers))
+        
         if response_data:
             log_entry["response_data"] = self._sanitize_data(response_data)
+        elif body:
+            mode = self.get_mode(url)
+            if mode == "sampled":
+                self._sample_counter += 1
+                mode = "full" if self._sample_counter % self.mode_config["sample_rate"] == 0 else "headers"
+            if mode == "headers" and status_code >= 400:
+                mode = "truncated"
+            if mode == "truncated" and url and endpoint_family(url) in CREDENTIAL_FAMILIES:
+                # El cuerpo truncado se guarda tal cual; el de auth es chico y se guarda sanitizado
+                mode = "full"
+            
+            log_entry["log_mode"] = mode
+            log_entry["response_size"] = len(body)
+            if mode == "full":
+                log_entry["response_data"] = _RawBody(body, self._sanitize_data)
+            elif mode == "truncated":
+                max_bytes = self.mode_config["max_body_bytes"]
+                log_entry["response_body"] = body[:max_bytes].decode('utf-8', 'replace')
+                log_entry["truncated"] = len(body) > max_bytes
         
         if error:
             log_entry["error"] = error
             
-        self.logger.info(f"API RESPONSE [{request_id}]: {json.dumps(log_entry, indent=2)}")
+        self.logger.info("API RESPONSE [%s]: %s", request_id, _JsonMessage(log_entry),
+                        extra={"api_event": "response"})
     
     def log_error(self, request_id: str, error: str, context: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -134,24 +457,54 @@ class SimplyBookLogger:
         
         log_entry = {
             "request_id": request_id,
+            **self._correlation(),
             "timestamp": datetime.now().isoformat(),
             "error": error,
             "context": context
         }
         
-        self.logger.error(f"API ERROR [{request_id}]: {json.dumps(log_entry, indent=2)}")
+        self.logger.error("API ERROR [%s]: %s", request_id, _JsonMessage(log_entry),
+                        extra={"api_event": "error"})
     
-    def _sanitize_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
-        """Ocultar información sensible en los headers"""
-        safe_headers = headers.copy()
+    def log_tool_call(self, call_id: str, tool: str, duration_ms: float, error: Optional[str] = None) -> None:
+        """
+        Loggear el final de una invocación de herramienta MCP
         
-        # Ocultar tokens y credenciales
-        sensitive_keys = ['x-token', 'authorization', 'x-company-login']
-        for key in sensitive_keys:
-            if key.lower() in safe_headers:
-                safe_headers[key] = '***HIDDEN***'
+        Args:
+            call_id: ID de la invocación (el mismo call_id de sus requests)
+            tool: Nombre de la herramienta
+            duration_ms: Duración total de la invocación en milisegundos
+            error: Mensaje de error si la herramienta falló
+        """
+        if not is_logging_enabled():
+            return
         
-        return safe_headers
+        log_entry = {
+            "call_id": call_id,
+            "tool": tool,
+            "timestamp": datetime.now().isoformat(),
+            "duration_ms": duration_ms,
+            "success": error is None
+        }
+        if error:
+            log_entry["error"] = error
+        
+        self.logger.info("TOOL CALL [%s]: %s", call_id, _JsonMessage(log_entry),
+                        extra={"api_event": "tool"})
+    
+    @staticmethod
+    def _correlation() -> Dict[str, str]:
+        """call_id y nombre de la herramienta MCP en curso (vacío fuera de una herramienta)"""
+        return current_tool_call() or {}
+    
+    def _sanitize_headers(self, headers: Dict[str, str]) -> Dict[str, str]:
+        """Ocultar información sensible en los headers (sin distinguir mayúsculas)"""
+        # Ocultar tokens y credenciales
+        sensitive_keys = {'x-token', 'authorization', 'x-company-login', 'cookie', 'set-cookie'}
+        return {
+            key: '***HIDDEN***' if key.lower() in sensitive_keys else value
+            for key, value in headers.items()
+        }
     
     def _sanitize_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Ocultar información sensible en los datos"""
@@ -161,7 +514,7 @@ class SimplyBookLogger:
         safe_data = data.copy()
         
         # Ocultar campos sensibles
-        sensitive_fields = ['password', 'token', 'api_key', 'secret']
+        sensitive_fields = ['password', 'token', 'refresh_token', 'api_key', 'secret']
         for field in sensitive_fields:
             if field in safe_data:
                 safe_data[field] = '***HIDDEN***'
@@ -1,13 +1,18 @@
 from typing import Dict, Any, List, Optional
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class MembershipsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def make_membership_instance(self,
                                      membership_id: str,
@@ -46,7 +51,7 @@ class MembershipsClient:
         if clients:
             data["clients"] = clients
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/memberships/make-membership-instance", json=data)
             response.raise_for_status()
             return response.json()
@@ -58,6 +63,6 @@ class MembershipsClient:
         Args:
             membership_id: ID de la membresía del cliente
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/memberships/cancel-client-membership/{membership_id}")
             response.raise_for_status()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import MembershipsClient
 from pydantic import Field
 from typing import Annotated
@@ -24,7 +25,7 @@ class MembershipsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = MembershipsClient(self.get_auth_headers())
+                self.client = MembershipsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.make_membership_instance(
                     membership_id=membership_id,
                     period_start=period_start,
@@ -38,6 +39,8 @@ class MembershipsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando instancia de membresía: {str(e)}"}
 
@@ -53,11 +56,13 @@ class MembershipsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = MembershipsClient(self.get_auth_headers())
+                self.client = MembershipsClient(self.get_auth_headers(), self.http_client)
                 await self.client.cancel_membership(membership_id)
                 return {
                     "success": True,
                     "message": "Membresía cancelada correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error cancelando membresía: {str(e)}"}
\ No newline at end of file
@@ -0,0 +1,205 @@
+import math
+import os
+from typing import Dict, Any, List, Tuple, Iterable
+
+
+# Buckets (segundos) de los histogramas de latencia
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Content-Type del formato de texto de Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Muestra de una métrica calculada al momento de la consulta: (etiquetas, valor)
+Sample = Tuple[Dict[str, str], float]
+
+# Métrica calculada al momento de la consulta: (nombre, tipo, ayuda, muestras)
+CollectedMetric = Tuple[str, str, str, List[Sample]]
+
+
+def is_metrics_enabled() -> bool:
+    """Verificar si el endpoint /metrics está habilitado (SIMPLYBOOK_METRICS_ENABLED, default: true)"""
+    return os.getenv('SIMPLYBOOK_METRICS_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on')
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Métrica con etiquetas; cada combinación de valores es una serie"""
+
+    type_name = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        """Olvidar todas las series"""
+        self._series.clear()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        for key in sorted(self._series):
+            lines.extend(self._render_series(dict(zip(self.labelnames, key)), self._series[key]))
+        return lines
+
+    def _render_series(self, labels: Dict[str, str], value: Any) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Contador que solo crece"""
+
+    type_name = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        self._series[key] = self._series.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Valor actual de una serie (0 si no existe)"""
+        return self._series.get(self._key(labels), 0.0)
+
+    def _render_series(self, labels: Dict[str, str], value: float) -> List[str]:
+        return [f"{self.name}{_format_labels(labels)} {_format_value(value)}"]
+
+
+class Histogram(_Metric):
+    """Histograma con buckets acumulativos, suma y cantidad de observaciones"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            # Conteos por bucket (no acumulados), suma y total
+            series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][i] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def count(self, **labels: Any) -> int:
+        """Cantidad de observaciones de una serie (0 si no existe)"""
+        series = self._series.get(self._key(labels))
+        return series[2] if series else 0
+
+    def _render_series(self, labels: Dict[str, str], value: list) -> List[str]:
+        bucket_counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, bucket_counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels({**labels, 'le': '+Inf'})} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas en formato de texto de Prometheus
+
+    Los contadores e histogramas se actualizan en el momento (latencias,
+    renovaciones de token). Los valores que ya llevan otros componentes
+    (cache, limitador, circuit breakers, pool) se leen de sus stats() al
+    momento de la consulta y se pasan a render(), sin duplicar contadores.
+    """
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        """Crear y registrar un contador"""
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Crear y registrar un histograma"""
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def clear(self) -> None:
+        """Olvidar todas las series de contadores e histogramas"""
+        for metric in self._metrics:
+            metric.clear()
+
+    def render(self, collected: Iterable[CollectedMetric] = ()) -> str:
+        """
+        Todas las métricas en formato de texto de Prometheus
+
+        Args:
+            collected: Métricas calculadas al momento de la consulta
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for name, type_name, help_text, samples in collected:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {type_name}")
+            for labels, value in samples:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Instancia global compartida por todos los componentes
+metrics = MetricsRegistry()
+
+upstream_request_duration = metrics.histogram(
+    "simplybook_upstream_request_duration_seconds",
+    "Duración de las peticiones a SimplyBook.me por familia de endpoints, método y estado",
+    ("endpoint", "method", "status")
+)
+
+tool_duration = metrics.histogram(
+    "simplybook_tool_duration_seconds",
+    "Duración de cada invocación de herramienta MCP",
+    ("tool", "outcome")
+)
+
+rate_limiter_wait = metrics.histogram(
+    "simplybook_rate_limiter_wait_seconds",
+    "Espera en el limitador de peticiones antes de enviar cada petición",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+auth_refreshes = metrics.counter(
+    "simplybook_auth_refresh_total",
+    "Obtenciones de token por motivo (login, token_rejected, refresh, refresh_fallback) y resultado",
+    ("reason", "result")
+)
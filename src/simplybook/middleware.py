@@ -0,0 +1,122 @@
+import asyncio
+import os
+import time
+from typing import Any, Optional
+
+import mcp.types as mt
+from fastmcp.exceptions import ToolError
+from fastmcp.server.middleware import Middleware, MiddlewareContext, CallNext
+
+from .correlation import tool_call
+from .http_client import deadline_exceeded
+from .logger import api_logger
+from .metrics import tool_duration
+from .tracing import span
+
+
+# Tiempo límite (segundos) de las herramientas que necesitan uno distinto del default de 60
+DEFAULT_TOOL_DEADLINES = {
+    # Búsqueda de turnos: mejor fallar rápido y que el agente reintente
+    "get_available_slots": 15,
+    # Búsquedas que consultan varios proveedores o días en paralelo
+    "search_available_slots": 30,
+    "find_availability": 30,
+    "find_next_available_slots": 30,
+    # Rangos grandes del calendario y las herramientas que recorren todas las páginas
+    "compute_availability": 120,
+    "get_calendar_data": 90,
+    "get_all_bookings": 120,
+    "get_all_bookings_simple": 120,
+    "get_all_clients": 120,
+    "get_all_client_memberships": 120,
+    "get_all_notes": 120,
+    "get_all_invoices": 120
+}
+
+# Margen para que la herramienta devuelva su propio error antes del corte del middleware
+DEADLINE_GRACE = 0.5
+
+
+def get_tool_deadline(tool: str) -> Optional[float]:
+    """
+    Obtener el tiempo límite de una herramienta
+
+    Variables:
+        SIMPLYBOOK_TOOL_DEADLINE: Tiempo límite de todas las herramientas en segundos (0 = sin límite);
+            sin definir, cada herramienta usa DEFAULT_TOOL_DEADLINES o 60
+        SIMPLYBOOK_TOOL_DEADLINE_<HERRAMIENTA>: Tiempo límite de una herramienta (tiene prioridad),
+            por ejemplo SIMPLYBOOK_TOOL_DEADLINE_GET_CALENDAR_DATA=120
+
+    Returns:
+        Segundos o None si la herramienta no tiene tiempo límite
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    default = DEFAULT_TOOL_DEADLINES.get(tool, 60.0)
+    if os.getenv('SIMPLYBOOK_TOOL_DEADLINE'):
+        default = _float('SIMPLYBOOK_TOOL_DEADLINE', default)
+    deadline = _float(f'SIMPLYBOOK_TOOL_DEADLINE_{tool.upper()}', default)
+    return deadline if deadline > 0 else None
+
+
+def requested_timeout(context: MiddlewareContext[mt.CallToolRequestParams]) -> Optional[float]:
+    """
+    Tiempo límite pedido por el cliente MCP en _meta.timeout_ms (segundos)
+
+    Permite que el cliente acote la invocación a su propio timeout; nunca
+    extiende el tiempo límite configurado para la herramienta.
+    """
+    meta = context.message.meta
+    if meta is None and context.fastmcp_context is not None:
+        # FastMCP deja el _meta de la petición en el contexto de la request
+        meta = getattr(context.fastmcp_context.request_context, "meta", None)
+    if meta is None:
+        return None
+    value = meta.get("timeout_ms") if isinstance(meta, dict) else getattr(meta, "timeout_ms", None)
+    try:
+        return float(value) / 1000 if value is not None and float(value) > 0 else None
+    except (TypeError, ValueError):
+        return None
+
+
+class CorrelationMiddleware(Middleware):
+    """
+    Middleware de FastMCP que asigna un ID y un tiempo límite a cada invocación de herramienta
+
+    Las peticiones HTTP hechas durante la invocación quedan en el log de API
+    con su call_id y el nombre de la herramienta, y al terminar se registra la
+    duración total de la invocación en el log y en /metrics. LoggingHTTPClient
+    recorta sus timeouts al tiempo que le queda a la invocación; si algo fuera
+    de las peticiones (limitador, paginación) lo excede, la invocación se corta.
+    """
+
+    async def on_call_tool(self, context: MiddlewareContext[mt.CallToolRequestParams],
+                           call_next: CallNext[mt.CallToolRequestParams, Any]) -> Any:
+        tool = context.message.name
+        budget = get_tool_deadline(tool)
+        client_budget = requested_timeout(context)
+        if client_budget is not None:
+            budget = min(budget, client_budget) if budget is not None else client_budget
+
+        with tool_call(tool, budget=budget) as call_id, span(f"tool {tool}", **{"mcp.tool": tool, "simplybook.call_id": call_id}):
+            start_time = time.monotonic()
+            error = None
+            try:
+                if budget is None:
+                    return await call_next(context)
+                try:
+                    return await asyncio.wait_for(call_next(context), budget + DEADLINE_GRACE)
+                except asyncio.TimeoutError:
+                    # ToolError: el cliente recibe un resultado con isError y el mensaje, no un error interno
+                    raise ToolError(deadline_exceeded().message) from None
+            except Exception as e:
+                error = str(e)
+                raise
+            finally:
+                duration = time.monotonic() - start_time
+                tool_duration.observe(duration, tool=tool, outcome="success" if error is None else "error")
+                api_logger.log_tool_call(call_id, tool, duration * 1000, error=error)
@@ -1,13 +1,37 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..pagination import iter_items, get_page_size
+from ..cache import cached, invalidate_slots
+from ..availability import blocked_slots
 
+@traced_client
 class NotesClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
+
+    def _invalidate_slots(self, *notes: Any, everything: bool = False) -> None:
+        """
+        Invalidar los turnos cacheados que una nota bloqueó o liberó
+
+        Si la nota bloquea a todos los proveedores, si no se puede saber qué
+        fechas afecta (o con everything=True) se invalidan todos los turnos
+        de la empresa.
+        """
+        company = self.headers.get("X-Company-Login", "")
+        affected = None if everything else blocked_slots(*notes)
+        if not affected:
+            invalidate_slots(company)
+            return
+        for provider_id, day in affected:
+            invalidate_slots(company, provider_id, day)
 
     async def get_notes(self,
                        page: Optional[int] = None,
@@ -66,11 +90,33 @@ class NotesClient:
         if date_to:
             params["filter[date_to]"] = date_to
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/calendar-notes", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_notes(self,
+                   max_items: Optional[int] = None,
+                   on_page: Optional[int] = None,
+                   **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las notas página por página
+        
+        Args:
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_notes (providers, services, date_from, ...)
+            
+        Returns:
+            Iterador asíncrono de CalendarNoteEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_notes(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
     async def get_note(self, note_id: str) -> Dict[str, Any]:
         """
         Obtener detalles de una nota
@@ -81,7 +127,7 @@ class NotesClient:
         Returns:
             Dict con los detalles de la nota
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/calendar-notes/{note_id}")
             response.raise_for_status()
             return response.json()
@@ -96,10 +142,12 @@ class NotesClient:
         Returns:
             Dict con los detalles de la nota creada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/calendar-notes", json=note_data)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        self._invalidate_slots(note_data, result)
+        return result
 
     async def edit_note(self, note_id: str, note_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -112,10 +160,13 @@ class NotesClient:
         Returns:
             Dict con los detalles de la nota actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/calendar-notes/{note_id}", json=note_data)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+        # El horario anterior no viene en la respuesta: se liberó en un proveedor y fecha desconocidos
+        self._invalidate_slots(everything=True)
+        return result
 
     async def delete_note(self, note_id: str) -> None:
         """
@@ -124,10 +175,12 @@ class NotesClient:
         Args:
             note_id: ID de la nota
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/calendar-notes/{note_id}")
             response.raise_for_status()
+        self._invalidate_slots(everything=True)
 
+    @cached("note_types")
     async def get_note_types(self) -> List[Dict[str, Any]]:
         """
         Obtener lista de tipos de notas
@@ -135,7 +188,7 @@ class NotesClient:
         Returns:
             Lista de objetos CalendarNoteTypeEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/calendar-notes/types")
             response.raise_for_status()
             return response.json()
@@ -147,7 +200,7 @@ class NotesClient:
         Returns:
             Dict con el tipo de nota predeterminado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/calendar-notes/types/default")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import NotesClient
+from ..pagination import collect_items, lookahead_limit, limited_result
 from pydantic import Field
 from typing import Annotated
 
@@ -25,7 +27,7 @@ class NotesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_notes(
                     page=page,
                     on_page=on_page,
@@ -40,6 +42,42 @@ class NotesRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error obteniendo notas: {str(e)}"}
+
+        @mcp.tool(
+            description="Obtener todas las notas, recorriendo todas las páginas",
+            tags={"notes", "list", "all"}
+        )
+        async def get_all_notes(
+            providers: Optional[Annotated[List[str], Field(description="Lista de IDs de proveedores")]] = None,
+            services: Optional[Annotated[List[str], Field(description="Lista de IDs de servicios")]] = None,
+            types: Optional[Annotated[List[str], Field(description="Lista de IDs de tipos de notas")]] = None,
+            search: Optional[Annotated[str, Field(description="Texto de búsqueda")]] = None,
+            date_from: Optional[Annotated[str, Field(description="Fecha desde (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            date_to: Optional[Annotated[str, Field(description="Fecha hasta (YYYY-MM-DD)", pattern="^\\d{4}-\\d{2}-\\d{2}$")]] = None,
+            max_items: Optional[Annotated[int, Field(description="Máximo de elementos a devolver (por defecto todos)", ge=1)]] = None
+        ) -> Dict[str, Any]:
+            """Obtener todas las notas (paginación automática)"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
+                items = await collect_items(self.client.iter_notes(
+                    max_items=lookahead_limit(max_items),
+                    providers=providers,
+                    services=services,
+                    types=types,
+                    search=search,
+                    date_from=date_from,
+                    date_to=date_to
+                ))
+                return limited_result(items, max_items)
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo notas: {str(e)}"}
 
@@ -76,12 +114,14 @@ class NotesRoutes(BaseRoutes):
                 if service_id is not None:
                     note_data["service_id"] = service_id
                 
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.create_note(note_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando nota: {str(e)}"}
 
@@ -123,12 +163,14 @@ class NotesRoutes(BaseRoutes):
                 if time_blocked is not None:
                     note_data["time_blocked"] = time_blocked
                 
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.edit_note(note_id, note_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error editando nota: {str(e)}"}
 
@@ -144,12 +186,14 @@ class NotesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 await self.client.delete_note(note_id)
                 return {
                     "success": True,
                     "message": "Nota eliminada correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando nota: {str(e)}"}
 
@@ -163,12 +207,14 @@ class NotesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_note_types()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo tipos de notas: {str(e)}"}
 
@@ -182,11 +228,13 @@ class NotesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = NotesClient(self.get_auth_headers())
+                self.client = NotesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_default_note_type()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo tipo de nota predeterminado: {str(e)}"}
\ No newline at end of file
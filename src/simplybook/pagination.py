@@ -0,0 +1,196 @@
+import asyncio
+import os
+from typing import Dict, Any, Optional, List, Callable, Awaitable, AsyncIterator, Tuple
+
+
+def get_page_size() -> int:
+    """Elementos por página al recorrer listados completos (SIMPLYBOOK_PAGE_SIZE, default: 100)"""
+    try:
+        return int(os.getenv('SIMPLYBOOK_PAGE_SIZE', 100))
+    except ValueError:
+        return 100
+
+
+def get_page_concurrency() -> int:
+    """Páginas descargadas en paralelo al recorrer listados completos (SIMPLYBOOK_PAGE_CONCURRENCY, default: 4)"""
+    try:
+        return max(1, int(os.getenv('SIMPLYBOOK_PAGE_CONCURRENCY', 4)))
+    except ValueError:
+        return 4
+
+
+def split_page(result: Any) -> Tuple[List[Any], Optional[int]]:
+    """
+    Separar los elementos y la cantidad total de páginas de una respuesta paginada
+
+    SimplyBook.me devuelve {"data": [...], "metadata": {"pages_count": N, ...}};
+    algunas versiones devuelven directamente la lista.
+
+    Returns:
+        Tupla (elementos, pages_count o None si no viene en la respuesta)
+    """
+    if isinstance(result, dict):
+        items = result.get("data") or []
+        metadata = result.get("metadata") or {}
+        pages_count = metadata.get("pages_count")
+        return list(items), int(pages_count) if pages_count is not None else None
+    if isinstance(result, list):
+        return result, None
+    return [], None
+
+
+def _has_more(page: int, pages_count: Optional[int], items: List[Any], on_page: Optional[int]) -> bool:
+    if not items:
+        return False
+    if pages_count is not None:
+        return page < pages_count
+    # Sin metadata: seguir mientras las páginas vengan completas
+    return on_page is not None and len(items) >= on_page
+
+
+async def iter_items(fetch_page: Callable[[int], Awaitable[Any]],
+                     on_page: Optional[int] = None,
+                     max_items: Optional[int] = None) -> AsyncIterator[Any]:
+    """
+    Recorrer todos los elementos de un listado paginado
+
+    Mientras se consumen los elementos de la página N ya se está descargando
+    la página N+1. Al alcanzar max_items se cancela la descarga pendiente.
+
+    Args:
+        fetch_page: Corrutina que recibe el número de página y devuelve la respuesta
+        on_page: Elementos por página solicitados (para detectar la última página)
+        max_items: Máximo de elementos a devolver (None = todos)
+
+    Yields:
+        Cada elemento de cada página, en orden
+    """
+    if max_items is not None and max_items <= 0:
+        return
+
+    page = 1
+    count = 0
+    next_page: Optional[asyncio.Future] = asyncio.ensure_future(fetch_page(page))
+    try:
+        while next_page is not None:
+            result = await next_page
+            next_page = None
+            items, pages_count = split_page(result)
+
+            remaining = None if max_items is None else max_items - count
+            if _has_more(page, pages_count, items, on_page) and (remaining is None or len(items) < remaining):
+                # Prefetch de la siguiente página mientras se consume la actual
+                next_page = asyncio.ensure_future(fetch_page(page + 1))
+
+            for item in items:
+                yield item
+                count += 1
+                if max_items is not None and count >= max_items:
+                    return
+            page += 1
+    finally:
+        if next_page is not None:
+            if not next_page.done():
+                next_page.cancel()
+            elif not next_page.cancelled():
+                # Recuperar la excepción del prefetch descartado para no dejarla huérfana
+                next_page.exception()
+
+
+def lookahead_limit(max_items: Optional[int]) -> Optional[int]:
+    """Límite a pedir para saber si quedan elementos: uno más que max_items (None = todos)"""
+    return None if max_items is None else max_items + 1
+
+
+def limited_result(items: List[Any], max_items: Optional[int]) -> Dict[str, Any]:
+    """
+    Respuesta de las herramientas que recorren todas las páginas
+
+    `items` se pidió con lookahead_limit(max_items): si trae más de
+    max_items, el listado se cortó y quedaron elementos sin devolver.
+    """
+    truncated = max_items is not None and len(items) > max_items
+    items = items[:max_items] if max_items is not None else items
+    return {
+        "success": True,
+        "items": items,
+        "count": len(items),
+        "truncated": truncated
+    }
+
+
+async def collect_items(items: AsyncIterator[Any]) -> List[Any]:
+    """Consumir un iterador asíncrono y devolver la lista de elementos"""
+    collected = []
+    try:
+        async for item in items:
+            collected.append(item)
+    finally:
+        await items.aclose()
+    return collected
+
+
+async def fetch_all_pages(fetch_page: Callable[[int], Awaitable[Any]],
+                          on_page: Optional[int] = None,
+                          max_items: Optional[int] = None,
+                          concurrency: Optional[int] = None) -> List[Any]:
+    """
+    Descargar todas las páginas de un listado en paralelo
+
+    Pide la página 1, lee metadata.pages_count y descarga el resto de forma
+    concurrente (como máximo `concurrency` a la vez), devolviendo los
+    elementos en el orden original. Si la respuesta no trae pages_count se
+    recorre en serie con iter_items(). Ante el primer error se cancelan las
+    descargas pendientes y se propaga la excepción.
+
+    Args:
+        fetch_page: Corrutina que recibe el número de página y devuelve la respuesta
+        on_page: Elementos por página solicitados
+        max_items: Máximo de elementos a devolver (None = todos)
+        concurrency: Descargas simultáneas (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+
+    Returns:
+        Lista con los elementos de todas las páginas, en orden
+    """
+    if max_items is not None and max_items <= 0:
+        return []
+
+    first_items, pages_count = split_page(await fetch_page(1))
+    if pages_count is None:
+        if max_items is not None and len(first_items) >= max_items:
+            return first_items[:max_items]
+        if not _has_more(1, None, first_items, on_page):
+            return first_items
+        rest = await collect_items(iter_items(
+            lambda page: fetch_page(page + 1),
+            on_page=on_page,
+            max_items=None if max_items is None else max_items - len(first_items)
+        ))
+        items = first_items + rest
+        return items[:max_items] if max_items is not None else items
+
+    last_page = pages_count
+    if max_items is not None and first_items:
+        # No pedir páginas que quedarían fuera del límite
+        last_page = min(last_page, -(-max_items // len(first_items)))
+
+    semaphore = asyncio.Semaphore(concurrency or get_page_concurrency())
+
+    async def fetch(page: int) -> List[Any]:
+        async with semaphore:
+            items, _ = split_page(await fetch_page(page))
+            return items
+
+    tasks = [asyncio.ensure_future(fetch(page)) for page in range(2, last_page + 1)]
+    try:
+        pages = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    items = list(first_items)
+    for page_items in pages:
+        items.extend(page_items)
+    return items[:max_items] if max_items is not None else items
@@ -1,13 +1,19 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..pagination import iter_items, fetch_all_pages, get_page_size
 
+@traced_client
 class PaymentsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_invoices(self,
                           page: Optional[int] = None,
@@ -59,11 +65,58 @@ class PaymentsClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/invoices", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_invoices(self,
+                      max_items: Optional[int] = None,
+                      on_page: Optional[int] = None,
+                      **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las órdenes/facturas página por página
+        
+        Args:
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_invoices (client_id, datetime_from, status, ...)
+            
+        Returns:
+            Iterador asíncrono de InvoiceEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_invoices(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
+    async def fetch_all_invoices(self,
+                                 max_items: Optional[int] = None,
+                                 on_page: Optional[int] = None,
+                                 concurrency: Optional[int] = None,
+                                 **filters) -> List[Dict[str, Any]]:
+        """
+        Descargar todas las órdenes/facturas con páginas en paralelo
+        
+        Args:
+            **filters: Filtros de get_invoices (client_id, datetime_from, status, ...)
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            concurrency: Páginas descargadas a la vez (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+            
+        Returns:
+            Lista de InvoiceEntity en el orden de la API
+        """
+        on_page = on_page or get_page_size()
+        return await fetch_all_pages(
+            lambda page: self.get_invoices(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items,
+            concurrency=concurrency
+        )
+
     async def get_invoice(self, invoice_id: str) -> Dict[str, Any]:
         """
         Obtener detalles de una orden/factura
@@ -74,7 +127,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/invoices/{invoice_id}")
             response.raise_for_status()
             return response.json()
@@ -89,7 +142,7 @@ class PaymentsClient:
         Returns:
             URL de la página de la orden/factura
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/invoices/{invoice_id}/link")
             response.raise_for_status()
             return response.json()
@@ -105,7 +158,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/invoices/{invoice_id}/accept-payment",
                 json={"payment_processor": payment_processor}
@@ -124,7 +177,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/invoices/{invoice_id}/rebill",
                 json={"payment_method_id": payment_method_id}
@@ -142,7 +195,7 @@ class PaymentsClient:
         Returns:
             URL del enlace de pago
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/invoices/{invoice_id}/payment-link")
             response.raise_for_status()
             return response.json()
@@ -155,7 +208,7 @@ class PaymentsClient:
             invoice_id: ID de la orden/factura
             message_type: Tipo de mensaje ('email' o 'sms')
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/invoices/{invoice_id}/send-payment-link",
                 json={"type": message_type}
@@ -173,7 +226,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(
                 f"/invoices/{invoice_id}/apply-promo-code",
                 json={"code": code}
@@ -192,7 +245,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/invoices/{invoice_id}/promo-code/{instance_id}")
             response.raise_for_status()
             return response.json()
@@ -215,7 +268,7 @@ class PaymentsClient:
         if amount is not None:
             data["amount"] = amount
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/invoices/{invoice_id}/tip", json=data)
             response.raise_for_status()
             return response.json()
@@ -230,7 +283,7 @@ class PaymentsClient:
         Returns:
             Dict con los detalles de la orden/factura actualizada
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/invoices/{invoice_id}/tip")
             response.raise_for_status()
             return response.json()
@@ -253,7 +306,7 @@ class PaymentsClient:
         if reader_id:
             data["readerId"] = reader_id
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post(f"/invoices/{invoice_id}/make-terminal-payment", json=data)
             response.raise_for_status()
             return response.json()
@@ -265,7 +318,7 @@ class PaymentsClient:
         Returns:
             Lista de lectores de terminal disponibles
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/invoices/terminal/reader/list")
             response.raise_for_status()
             return response.json()
@@ -277,7 +330,7 @@ class PaymentsClient:
         Returns:
             Dict con el token de conexión
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/invoices/terminal/stripe-connection-token")
             response.raise_for_status()
             return response.json()
@@ -289,7 +342,7 @@ class PaymentsClient:
         Returns:
             Dict con la configuración de ubicación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/invoices/terminal/stripe-config-location")
             response.raise_for_status()
             return response.json()
@@ -304,7 +357,7 @@ class PaymentsClient:
         Returns:
             Lista de métodos de pago guardados
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/payment-methods/{client_id}")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
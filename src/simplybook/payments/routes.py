@@ -1,5 +1,7 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
+from ..pagination import lookahead_limit, limited_result
 from .client import PaymentsClient
 from pydantic import Field
 from typing import Annotated
@@ -24,7 +26,7 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_invoices(
                     page=page,
                     on_page=on_page,
@@ -38,6 +40,40 @@ class PaymentsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
+            except Exception as e:
+                return {"error": f"Error obteniendo órdenes/facturas: {str(e)}"}
+
+        @mcp.tool(
+            description="Obtener todas las órdenes/facturas, recorriendo todas las páginas",
+            tags={"payments", "invoices", "list", "all"}
+        )
+        async def get_all_invoices(
+            client_id: Optional[Annotated[str, Field(description="ID del cliente")]] = None,
+            datetime_from: Optional[Annotated[str, Field(description="Fecha y hora desde (YYYY-MM-DD HH:mm:ss)")]] = None,
+            datetime_to: Optional[Annotated[str, Field(description="Fecha y hora hasta (YYYY-MM-DD HH:mm:ss)")]] = None,
+            status: Optional[Annotated[str, Field(description="Estado de la orden/factura")]] = None,
+            booking_code: Optional[Annotated[str, Field(description="Código de reserva")]] = None,
+            max_items: Optional[Annotated[int, Field(description="Máximo de elementos a devolver (por defecto todos)", ge=1)]] = None
+        ) -> Dict[str, Any]:
+            """Obtener todas las órdenes/facturas (paginación automática)"""
+            try:
+                if not await self.ensure_authenticated():
+                    return {"error": "No se pudo autenticar"}
+                    
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
+                items = await self.client.fetch_all_invoices(
+                    max_items=lookahead_limit(max_items),
+                    client_id=client_id,
+                    datetime_from=datetime_from,
+                    datetime_to=datetime_to,
+                    status=status,
+                    booking_code=booking_code
+                )
+                return limited_result(items, max_items)
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo órdenes/facturas: {str(e)}"}
 
@@ -53,12 +89,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_invoice(invoice_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo orden/factura: {str(e)}"}
 
@@ -74,12 +112,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_invoice_link(invoice_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo enlace: {str(e)}"}
 
@@ -96,12 +136,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.accept_payment(invoice_id, payment_processor)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error aceptando pago: {str(e)}"}
 
@@ -118,12 +160,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.accept_saved_payment(invoice_id, payment_method_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error aceptando pago: {str(e)}"}
 
@@ -139,12 +183,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_payment_link(invoice_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error generando enlace de pago: {str(e)}"}
 
@@ -161,12 +207,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 await self.client.send_payment_link(invoice_id, message_type)
                 return {
                     "success": True,
                     "message": "Enlace de pago enviado correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error enviando enlace de pago: {str(e)}"}
 
@@ -183,12 +231,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.apply_promo_code(invoice_id, code)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error aplicando código promocional: {str(e)}"}
 
@@ -205,12 +255,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.remove_promo_code(invoice_id, instance_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando código promocional: {str(e)}"}
 
@@ -228,12 +280,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.apply_tip(invoice_id, percent=percent, amount=amount)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error aplicando propina: {str(e)}"}
 
@@ -249,12 +303,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.remove_tip(invoice_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando propina: {str(e)}"}
 
@@ -272,7 +328,7 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.make_terminal_payment(
                     invoice_id,
                     payment_system=payment_system,
@@ -282,6 +338,8 @@ class PaymentsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error realizando pago con terminal: {str(e)}"}
 
@@ -295,12 +353,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_terminal_readers()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo lectores de terminal: {str(e)}"}
 
@@ -314,12 +374,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_stripe_connection_token()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo token de conexión: {str(e)}"}
 
@@ -333,12 +395,14 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_stripe_config_location()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo configuración: {str(e)}"}
 
@@ -354,11 +418,13 @@ class PaymentsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = PaymentsClient(self.get_auth_headers())
+                self.client = PaymentsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_client_payment_methods(client_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo métodos de pago: {str(e)}"}
\ No newline at end of file
@@ -1,13 +1,18 @@
 from typing import Dict, Any, Optional, List
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class ProductsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_products(self,
                           service_id: Optional[str] = None,
@@ -44,7 +49,7 @@ class ProductsClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/products", params=params)
             response.raise_for_status()
             return response.json()
@@ -59,7 +64,7 @@ class ProductsClient:
         Returns:
             Dict con los detalles del producto
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/products/{product_id}")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, List
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import ProductsClient
 from pydantic import Field
 from typing import Annotated
@@ -22,7 +23,7 @@ class ProductsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProductsClient(self.get_auth_headers())
+                self.client = ProductsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_products(
                     page=page,
                     on_page=on_page,
@@ -34,6 +35,8 @@ class ProductsRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo productos: {str(e)}"}
 
@@ -49,11 +52,13 @@ class ProductsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProductsClient(self.get_auth_headers())
+                self.client = ProductsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_product(product_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo producto: {str(e)}"}
\ No newline at end of file
@@ -1,18 +1,26 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, AsyncIterator
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..pagination import iter_items, get_page_size
 
+@traced_client
 class PromotionsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_promotions(self,
                            service_id: Optional[str] = None,
                            visible_only: Optional[bool] = None,
-                           promotion_type: Optional[str] = None) -> Dict[str, Any]:
+                           promotion_type: Optional[str] = None,
+                           page: Optional[int] = None,
+                           on_page: Optional[int] = None) -> Dict[str, Any]:
         """
         Obtener lista de promociones
         
@@ -20,6 +28,8 @@ class PromotionsClient:
             service_id: ID del servicio para filtrar
             visible_only: Solo promociones visibles
             promotion_type: Tipo de promoción ('gift_card' o 'discount')
+            page: Número de página
+            on_page: Elementos por página
             
         Returns:
             Dict con la lista paginada de promociones
@@ -27,6 +37,11 @@ class PromotionsClient:
         params = {}
         filters = {}
         
+        if page is not None:
+            params["page"] = page
+        if on_page is not None:
+            params["on_page"] = on_page
+        
         if service_id:
             filters["service_id"] = service_id
             
@@ -39,11 +54,55 @@ class PromotionsClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/promotions", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_promotions(self,
+                        max_items: Optional[int] = None,
+                        on_page: Optional[int] = None,
+                        **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las promociones página por página
+        
+        Args:
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_promotions (service_id, visible_only, promotion_type)
+            
+        Returns:
+            Iterador asíncrono de PromotionEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_promotions(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
+    def iter_gift_cards(self,
+                        max_items: Optional[int] = None,
+                        on_page: Optional[int] = None,
+                        **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todas las tarjetas de regalo página por página
+        
+        Args:
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_gift_cards (status, service_id, code, ...)
+            
+        Returns:
+            Iterador asíncrono de PromotionInstanceEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_gift_cards(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
     async def get_gift_cards(self,
                            purchased_by_client_id: Optional[str] = None,
                            used_by_client_id: Optional[str] = None,
@@ -62,7 +121,9 @@ class PromotionsClient:
                            discount_to: Optional[float] = None,
                            used_amount_from: Optional[float] = None,
                            used_amount_to: Optional[float] = None,
-                           code: Optional[str] = None) -> Dict[str, Any]:
+                           code: Optional[str] = None,
+                           page: Optional[int] = None,
+                           on_page: Optional[int] = None) -> Dict[str, Any]:
         """
         Obtener lista de tarjetas de regalo
         
@@ -85,6 +146,8 @@ class PromotionsClient:
             used_amount_from: Monto usado desde
             used_amount_to: Monto usado hasta
             code: Código
+            page: Número de página
+            on_page: Elementos por página
             
         Returns:
             Dict con la lista paginada de tarjetas de regalo
@@ -92,6 +155,11 @@ class PromotionsClient:
         params = {}
         filters = {}
         
+        if page is not None:
+            params["page"] = page
+        if on_page is not None:
+            params["on_page"] = on_page
+        
         if purchased_by_client_id:
             filters["purchased_by_client_id"] = purchased_by_client_id
             
@@ -149,7 +217,7 @@ class PromotionsClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/promotions/gift-cards", params=params)
             response.raise_for_status()
             return response.json()
@@ -167,7 +235,9 @@ class PromotionsClient:
                         start_date_to: Optional[str] = None,
                         discount_from: Optional[float] = None,
                         discount_to: Optional[float] = None,
-                        code: Optional[str] = None) -> Dict[str, Any]:
+                        code: Optional[str] = None,
+                        page: Optional[int] = None,
+                        on_page: Optional[int] = None) -> Dict[str, Any]:
         """
         Obtener lista de cupones
         
@@ -185,6 +255,8 @@ class PromotionsClient:
             discount_from: Descuento desde
             discount_to: Descuento hasta
             code: Código
+            page: Número de página
+            on_page: Elementos por página
             
         Returns:
             Dict con la lista paginada de cupones
@@ -192,6 +264,11 @@ class PromotionsClient:
         params = {}
         filters = {}
         
+        if page is not None:
+            params["page"] = page
+        if on_page is not None:
+            params["on_page"] = on_page
+        
         if used_by_client_id:
             filters["used_by_client_id"] = used_by_client_id
             
@@ -234,11 +311,33 @@ class PromotionsClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/promotions/coupons", params=params)
             response.raise_for_status()
             return response.json()
 
+    def iter_coupons(self,
+                     max_items: Optional[int] = None,
+                     on_page: Optional[int] = None,
+                     **filters) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Recorrer todos los cupones página por página
+        
+        Args:
+            max_items: Máximo de elementos a devolver (None = todos)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            **filters: Filtros de get_coupons (status, service_id, code, ...)
+            
+        Returns:
+            Iterador asíncrono de PromotionInstanceEntity
+        """
+        on_page = on_page or get_page_size()
+        return iter_items(
+            lambda page: self.get_coupons(page=page, on_page=on_page, **filters),
+            on_page=on_page,
+            max_items=max_items
+        )
+
     async def issue_gift_card(self,
                             promotion_id: int,
                             start_date: str,
@@ -291,7 +390,7 @@ class PromotionsClient:
             if count:
                 data["count"] = count
                 
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/promotions/issue-gift-card", json=data)
             response.raise_for_status()
             return response.json() 
\ No newline at end of file
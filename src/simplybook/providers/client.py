@@ -1,23 +1,35 @@
 from typing import Dict, Any, Optional, List
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..cache import cached, invalidates
+from ..pagination import fetch_all_pages, get_page_size
 
+@traced_client
 class ProvidersClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
+    @cached("providers")
     async def get_providers(self,
                           search: Optional[str] = None,
-                          service_id: Optional[str] = None) -> Dict[str, Any]:
+                          service_id: Optional[str] = None,
+                          page: Optional[int] = None,
+                          on_page: Optional[int] = None) -> Dict[str, Any]:
         """
         Obtener lista de proveedores
         
         Args:
             search: Texto de búsqueda
             service_id: Filtrar por servicio (solo proveedores que pueden dar este servicio)
+            page: Número de página
+            on_page: Elementos por página
             
         Returns:
             Dict con la lista paginada de proveedores
@@ -25,6 +37,12 @@ class ProvidersClient:
         params = {}
         filters = {}
         
+        if page is not None:
+            params["page"] = page
+            
+        if on_page is not None:
+            params["on_page"] = on_page
+        
         if search:
             filters["search"] = search
             
@@ -34,11 +52,35 @@ class ProvidersClient:
         if filters:
             params["filter"] = filters
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/providers", params=params)
             response.raise_for_status()
             return response.json()
 
+    async def fetch_all_providers(self,
+                                  search: Optional[str] = None,
+                                  service_id: Optional[str] = None,
+                                  on_page: Optional[int] = None,
+                                  concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Descargar todos los proveedores con páginas en paralelo
+        
+        Args:
+            search: Texto de búsqueda
+            service_id: Filtrar por servicio (solo proveedores que pueden dar este servicio)
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            concurrency: Páginas descargadas a la vez (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+            
+        Returns:
+            Lista de ProviderEntity en el orden de la API
+        """
+        on_page = on_page or get_page_size()
+        return await fetch_all_pages(
+            lambda page: self.get_providers(search=search, service_id=service_id, page=page, on_page=on_page),
+            on_page=on_page,
+            concurrency=concurrency
+        )
+
     async def get_provider(self, provider_id: str) -> Dict[str, Any]:
         """
         Obtener detalles de un proveedor
@@ -49,11 +91,12 @@ class ProvidersClient:
         Returns:
             Dict con los detalles del proveedor
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/providers/{provider_id}")
             response.raise_for_status()
             return response.json()
 
+    @invalidates("providers", "services")
     async def create_provider(self, provider_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Crear un nuevo proveedor
@@ -64,11 +107,12 @@ class ProvidersClient:
         Returns:
             Dict con los detalles del proveedor creado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/providers", json=provider_data)
             response.raise_for_status()
             return response.json()
 
+    @invalidates("providers", "services")
     async def update_provider(self, provider_id: str, provider_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Actualizar un proveedor existente
@@ -80,11 +124,12 @@ class ProvidersClient:
         Returns:
             Dict con los detalles del proveedor actualizado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/providers/{provider_id}", json=provider_data)
             response.raise_for_status()
             return response.json()
 
+    @invalidates("providers", "services")
     async def delete_provider(self, provider_id: str) -> None:
         """
         Eliminar un proveedor
@@ -92,10 +137,11 @@ class ProvidersClient:
         Args:
             provider_id: ID del proveedor
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/providers/{provider_id}")
             response.raise_for_status()
 
+    @cached("locations")
     async def get_locations(self) -> List[Dict[str, Any]]:
         """
         Obtener lista de ubicaciones
@@ -103,7 +149,7 @@ class ProvidersClient:
         Returns:
             Lista de objetos LocationEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/locations")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
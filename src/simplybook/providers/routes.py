@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import ProvidersClient
 from pydantic import Field
 from typing import Annotated
@@ -19,7 +20,7 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_providers(
                     search=search,
                     service_id=service_id
@@ -28,6 +29,8 @@ class ProvidersRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo proveedores: {str(e)}"}
 
@@ -43,12 +46,14 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_provider(provider_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo proveedor: {str(e)}"}
 
@@ -72,12 +77,14 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.create_provider(provider_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando proveedor: {str(e)}"}
 
@@ -102,12 +109,14 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.update_provider(provider_id, provider_data)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error actualizando proveedor: {str(e)}"}
 
@@ -123,12 +132,14 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 await self.client.delete_provider(provider_id)
                 return {
                     "success": True,
                     "message": "Proveedor eliminado correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando proveedor: {str(e)}"}
 
@@ -142,11 +153,13 @@ class ProvidersRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ProvidersClient(self.get_auth_headers())
+                self.client = ProvidersClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_locations()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo ubicaciones: {str(e)}"}
\ No newline at end of file
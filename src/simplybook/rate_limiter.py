@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import os
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+import httpx
+
+from .auth.token_auth import is_token_rejected
+
+
+def get_rate_limit_config() -> Dict[str, Any]:
+    """
+    Obtener configuración del limitador de peticiones desde variables de entorno
+
+    Variables:
+        SIMPLYBOOK_RATE_LIMIT_ENABLED: Habilitar el limitador (default: true)
+        SIMPLYBOOK_RATE_LIMIT: Peticiones por segundo permitidas (default: 5)
+        SIMPLYBOOK_RATE_LIMIT_BURST: Peticiones que se pueden enviar de golpe (default: 10)
+        SIMPLYBOOK_RATE_LIMIT_MIN: Tasa mínima al reducirla por 403/429 (default: 0.5)
+        SIMPLYBOOK_RATE_LIMIT_RECOVERY: Peticiones/s que se recuperan por respuesta exitosa (default: 0.1)
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    return {
+        "enabled": os.getenv('SIMPLYBOOK_RATE_LIMIT_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on'),
+        "rate": _float('SIMPLYBOOK_RATE_LIMIT', 5.0),
+        "burst": _float('SIMPLYBOOK_RATE_LIMIT_BURST', 10.0),
+        "min_rate": _float('SIMPLYBOOK_RATE_LIMIT_MIN', 0.5),
+        "recovery": _float('SIMPLYBOOK_RATE_LIMIT_RECOVERY', 0.1)
+    }
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Interpretar el header Retry-After (segundos o fecha HTTP)
+
+    Returns:
+        Segundos a esperar o None si el header no existe o no es válido
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket global para todas las peticiones a SimplyBook.me
+
+    Cada petición consume un token; los tokens se reponen a `rate` por segundo
+    hasta `burst`. Las peticiones que no encuentran token esperan en orden de
+    llegada. Ante un 429 o un 403 que no sea de token la tasa se reduce a la
+    mitad (como mucho una vez por segundo) y, si la respuesta trae
+    Retry-After, se pausan todas las peticiones hasta ese momento. Cada
+    respuesta exitosa recupera un poco de tasa hasta volver a la configurada.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None,
+                 min_rate: Optional[float] = None, recovery: Optional[float] = None,
+                 enabled: Optional[bool] = None):
+        """
+        Args:
+            rate: Peticiones por segundo (default: SIMPLYBOOK_RATE_LIMIT)
+            burst: Capacidad del bucket (default: SIMPLYBOOK_RATE_LIMIT_BURST)
+            min_rate: Tasa mínima tras reducirla (default: SIMPLYBOOK_RATE_LIMIT_MIN)
+            recovery: Tasa recuperada por respuesta exitosa (default: SIMPLYBOOK_RATE_LIMIT_RECOVERY)
+            enabled: Habilitar el limitador (default: SIMPLYBOOK_RATE_LIMIT_ENABLED)
+        """
+        config = get_rate_limit_config()
+        self.max_rate = rate if rate is not None else config["rate"]
+        self.burst = max(1.0, burst if burst is not None else config["burst"])
+        self.min_rate = min(self.max_rate, min_rate if min_rate is not None else config["min_rate"])
+        self.recovery = recovery if recovery is not None else config["recovery"]
+        self.enabled = enabled if enabled is not None else config["enabled"]
+        self.logger = logging.getLogger(__name__)
+
+        self.rate = self.max_rate
+        self._tokens = self.burst
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.queue_depth = 0
+        self.requests = 0
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+
+    async def acquire(self) -> float:
+        """
+        Esperar hasta poder enviar una petición
+
+        Returns:
+            Segundos esperados
+        """
+        if not self.enabled:
+            return 0.0
+
+        start = time.monotonic()
+        self.queue_depth += 1
+        try:
+            async with self._get_lock():
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    if now < self._paused_until:
+                        delay = self._paused_until - now
+                    elif self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    else:
+                        delay = (1 - self._tokens) / self.rate
+                    await asyncio.sleep(delay)
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        self.requests += 1
+        if waited > 0.001:
+            self.waits += 1
+            self.wait_seconds += waited
+        return waited
+
+    def observe(self, response: httpx.Response) -> None:
+        """
+        Ajustar la tasa según la respuesta recibida
+
+        Args:
+            response: Respuesta de la API de SimplyBook.me
+        """
+        if not self.enabled:
+            return
+
+        status = response.status_code
+        if status == 429 or (status == 403 and not is_token_rejected(response)):
+            self.throttle(parse_retry_after(response.headers.get("Retry-After")))
+        elif status < 400 and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        Reducir la tasa tras un rechazo por límite de peticiones
+
+        Args:
+            retry_after: Segundos durante los que no se debe enviar nada
+        """
+        now = time.monotonic()
+        self.throttled += 1
+
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        # Una ráfaga de rechazos simultáneos cuenta como una sola señal
+        if now - self._last_decrease >= 1.0:
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 1.0)
+            self._last_decrease = now
+            self.logger.warning(
+                f"SimplyBook rate limit hit, reducing to {self.rate:.2f} req/s"
+                + (f", pausing {retry_after:.1f}s" if retry_after else "")
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas del limitador: tasa actual, cola y esperas acumuladas"""
+        self._refill(time.monotonic())
+        return {
+            "enabled": self.enabled,
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "tokens": self._tokens,
+            "queue_depth": self.queue_depth,
+            "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            "requests": self.requests,
+            "waits": self.waits,
+            "wait_seconds": self.wait_seconds,
+            "throttled": self.throttled
+        }
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def _get_lock(self) -> asyncio.Lock:
+        # El limitador es global: recrear el lock si cambia el event loop (p. ej. en tests)
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+
+# Instancia global compartida por AuthClient y todos los clientes de datos
+rate_limiter = AdaptiveRateLimiter()
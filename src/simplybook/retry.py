@@ -0,0 +1,157 @@
+import logging
+import os
+import random
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+from .rate_limiter import parse_retry_after
+
+
+# Métodos que se pueden repetir sin riesgo de duplicar efectos
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Respuestas transitorias que justifican un reintento
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+def get_retry_config() -> Dict[str, Any]:
+    """
+    Obtener configuración de reintentos desde variables de entorno
+
+    Variables:
+        SIMPLYBOOK_RETRY_MAX_ATTEMPTS: Intentos totales por petición (default: 3)
+        SIMPLYBOOK_RETRY_BASE_DELAY: Espera base del backoff en segundos (default: 0.5)
+        SIMPLYBOOK_RETRY_MAX_DELAY: Espera máxima entre intentos (default: 8)
+        SIMPLYBOOK_RETRY_MAX_ELAPSED: Tiempo máximo total reintentando una petición (default: 30)
+        SIMPLYBOOK_RETRY_BUDGET_RATIO: Reintentos permitidos por petición original (default: 0.2)
+        SIMPLYBOOK_RETRY_BUDGET_MAX: Reserva máxima de reintentos acumulables (default: 10)
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    return {
+        "max_attempts": max(1, int(_float('SIMPLYBOOK_RETRY_MAX_ATTEMPTS', 3))),
+        "base_delay": _float('SIMPLYBOOK_RETRY_BASE_DELAY', 0.5),
+        "max_delay": _float('SIMPLYBOOK_RETRY_MAX_DELAY', 8.0),
+        "max_elapsed": _float('SIMPLYBOOK_RETRY_MAX_ELAPSED', 30.0),
+        "budget_ratio": _float('SIMPLYBOOK_RETRY_BUDGET_RATIO', 0.2),
+        "budget_max": _float('SIMPLYBOOK_RETRY_BUDGET_MAX', 10.0)
+    }
+
+
+class RetryPolicy:
+    """
+    Política de reintentos para las peticiones a SimplyBook.me
+
+    Solo se repiten los métodos idempotentes ante errores de red o respuestas
+    429/5xx; cualquier método se repite si la conexión falló antes de enviar
+    la petición. La espera sigue un backoff exponencial con jitter completo
+    (o el Retry-After de la respuesta si es mayor) y nunca supera el tiempo
+    máximo total. Un presupuesto compartido limita los reintentos a una
+    fracción de las peticiones originales para no amplificar una caída.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None, max_elapsed: Optional[float] = None,
+                 budget_ratio: Optional[float] = None, budget_max: Optional[float] = None):
+        """
+        Args:
+            max_attempts: Intentos totales por petición (default: SIMPLYBOOK_RETRY_MAX_ATTEMPTS)
+            base_delay: Espera base del backoff (default: SIMPLYBOOK_RETRY_BASE_DELAY)
+            max_delay: Espera máxima entre intentos (default: SIMPLYBOOK_RETRY_MAX_DELAY)
+            max_elapsed: Tiempo máximo reintentando (default: SIMPLYBOOK_RETRY_MAX_ELAPSED)
+            budget_ratio: Reintentos por petición original (default: SIMPLYBOOK_RETRY_BUDGET_RATIO)
+            budget_max: Reserva máxima de reintentos (default: SIMPLYBOOK_RETRY_BUDGET_MAX)
+        """
+        config = get_retry_config()
+        self.max_attempts = max_attempts if max_attempts is not None else config["max_attempts"]
+        self.base_delay = base_delay if base_delay is not None else config["base_delay"]
+        self.max_delay = max_delay if max_delay is not None else config["max_delay"]
+        self.max_elapsed = max_elapsed if max_elapsed is not None else config["max_elapsed"]
+        self.budget_ratio = budget_ratio if budget_ratio is not None else config["budget_ratio"]
+        self.budget_max = budget_max if budget_max is not None else config["budget_max"]
+        self.logger = logging.getLogger(__name__)
+
+        self._budget = self.budget_max
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    def is_idempotent(self, method: str) -> bool:
+        """Verificar si un método HTTP se puede repetir sin efectos duplicados"""
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def record_request(self) -> None:
+        """Registrar una petición original (recarga el presupuesto de reintentos)"""
+        self._budget = min(self.budget_max, self._budget + self.budget_ratio)
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Espera antes del reintento número `attempt` (empezando en 0)
+
+        Backoff exponencial con jitter completo: aleatorio entre 0 y
+        min(max_delay, base_delay * 2^attempt).
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def retry_delay(self, attempt: int, started: float, idempotent: bool,
+                    response: Optional[httpx.Response] = None,
+                    error: Optional[Exception] = None,
+                    max_attempts: Optional[int] = None) -> Optional[float]:
+        """
+        Decidir si se reintenta una petición y cuánto esperar
+
+        Args:
+            attempt: Intentos ya realizados menos uno (0 tras el primer fallo)
+            started: time.monotonic() del primer intento
+            idempotent: Si la petición se puede repetir sin riesgo
+            response: Respuesta recibida (si la hubo)
+            error: Excepción de red (si la hubo)
+            max_attempts: Intentos totales de este endpoint (default: self.max_attempts)
+
+        Returns:
+            Segundos a esperar antes de reintentar o None si no se reintenta
+        """
+        if attempt + 1 >= (max_attempts or self.max_attempts):
+            return None
+
+        retry_after = None
+        if error is not None:
+            # Si no se llegó a conectar la petición no se envió: siempre es seguro repetir
+            safe = idempotent or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+            if not safe or not isinstance(error, httpx.TransportError):
+                return None
+        elif response is not None:
+            if not idempotent or response.status_code not in RETRYABLE_STATUS_CODES:
+                return None
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        else:
+            return None
+
+        delay = max(self.backoff(attempt), retry_after or 0.0)
+        if time.monotonic() - started + delay > self.max_elapsed:
+            return None
+
+        if self._budget < 1:
+            self.budget_exhausted += 1
+            self.logger.warning("SimplyBook retry budget exhausted, not retrying")
+            return None
+        self._budget -= 1
+        self.retries += 1
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Métricas de reintentos"""
+        return {
+            "retries": self.retries,
+            "budget": self._budget,
+            "budget_exhausted": self.budget_exhausted
+        }
+
+
+# Instancia global compartida por todos los clientes
+retry_policy = RetryPolicy()
@@ -1,20 +1,33 @@
 from typing import Dict, Any, Optional, List
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..cache import cached, invalidates
+from ..pagination import fetch_all_pages, get_page_size
 
+@traced_client
 class ServicesClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
-    async def get_services(self, search: Optional[str] = None) -> Dict[str, Any]:
+    @cached("services")
+    async def get_services(self,
+                           search: Optional[str] = None,
+                           page: Optional[int] = None,
+                           on_page: Optional[int] = None) -> Dict[str, Any]:
         """
         Obtener lista de servicios
         
         Args:
             search: Texto de búsqueda
+            page: Número de página
+            on_page: Elementos por página
             
         Returns:
             Dict con la lista paginada de servicios (ServiceEntity[])
@@ -27,11 +40,39 @@ class ServicesClient:
         if search:
             params["filter"] = {"search": search}
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        if page is not None:
+            params["page"] = page
+            
+        if on_page is not None:
+            params["on_page"] = on_page
+            
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/services", params=params)
             response.raise_for_status()
             return response.json()
 
+    async def fetch_all_services(self,
+                                 search: Optional[str] = None,
+                                 on_page: Optional[int] = None,
+                                 concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Descargar todos los servicios con páginas en paralelo
+        
+        Args:
+            search: Texto de búsqueda
+            on_page: Elementos por página (default: SIMPLYBOOK_PAGE_SIZE)
+            concurrency: Páginas descargadas a la vez (default: SIMPLYBOOK_PAGE_CONCURRENCY)
+            
+        Returns:
+            Lista de ServiceEntity en el orden de la API
+        """
+        on_page = on_page or get_page_size()
+        return await fetch_all_pages(
+            lambda page: self.get_services(search=search, page=page, on_page=on_page),
+            on_page=on_page,
+            concurrency=concurrency
+        )
+
     async def get_service(self, service_id: str) -> Dict[str, Any]:
         """
         Obtener detalles de un servicio
@@ -46,7 +87,7 @@ class ServicesClient:
             AccessDenied: Si el usuario no tiene acceso al servicio
             NotFound: Si el servicio no existe
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/services/{service_id}")
             response.raise_for_status()
             return response.json()
@@ -73,11 +114,12 @@ class ServicesClient:
         if product_type:
             params["filter"]["type"] = product_type
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/services/products", params=params)
             response.raise_for_status()
             return response.json()
 
+    @invalidates("services", "providers")
     async def create_service(self, service_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Crear un nuevo servicio
@@ -99,11 +141,12 @@ class ServicesClient:
             BadRequest: Si los datos proporcionados son inválidos
             AccessDenied: Si el usuario no tiene acceso para crear servicios
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.post("/services", json=service_data)
             response.raise_for_status()
             return response.json()
 
+    @invalidates("services", "providers")
     async def update_service(self, service_id: str, service_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Actualizar un servicio existente
@@ -127,11 +170,12 @@ class ServicesClient:
             NotFound: Si el servicio no existe
             AccessDenied: Si el usuario no tiene acceso para actualizar el servicio
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/services/{service_id}", json=service_data)
             response.raise_for_status()
             return response.json()
 
+    @invalidates("services", "providers")
     async def delete_service(self, service_id: str) -> None:
         """
         Eliminar un servicio
@@ -143,10 +187,11 @@ class ServicesClient:
             AccessDenied: Si el usuario no tiene acceso para eliminar el servicio
             NotFound: Si el servicio no existe
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.delete(f"/services/{service_id}")
             response.raise_for_status()
 
+    @cached("categories")
     async def get_categories(self) -> List[Dict[str, Any]]:
         """
         Obtener lista de categorías
@@ -154,7 +199,7 @@ class ServicesClient:
         Returns:
             Lista de objetos CategoryEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/categories")
             response.raise_for_status()
             return response.json()
@@ -164,7 +209,7 @@ class ServicesClient:
         Obtener lista de proveedores según la documentación
         Usa getUnitList() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/providers")
             response.raise_for_status()
             return response.json()
@@ -174,11 +219,8 @@ class ServicesClient:
         Obtener el primer día laboral para un performer específico
         Usa getFirstWorkingDay() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.get(
-                f"{self.base_url}/units/{performer_id}/first-working-day",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.get(f"/units/{performer_id}/first-working-day")
             response.raise_for_status()
             return response.json()
 
@@ -187,10 +229,9 @@ class ServicesClient:
         Obtener calendario de trabajo para un performer
         Usa getWorkCalendar() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(
-                f"{self.base_url}/units/{performer_id}/work-calendar",
-                headers=self.headers,
+                f"/units/{performer_id}/work-calendar",
                 params={
                     "year": year,
                     "month": month
@@ -204,10 +245,9 @@ class ServicesClient:
         Obtener slots de tiempo disponibles
         Usa getTimeSlots() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(
-                f"{self.base_url}/time-slots",
-                headers=self.headers,
+                "/time-slots",
                 params={
                     "date": date,
                     "event_id": service_id,
@@ -222,12 +262,8 @@ class ServicesClient:
         Crear una reserva
         Usa addBooking() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.post(
-                f"{self.base_url}/bookings",
-                json=booking_data,
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.post("/bookings", json=booking_data)
             response.raise_for_status()
             return response.json()
 
@@ -242,7 +278,7 @@ class ServicesClient:
         if date_to:
             params["date_to"] = date_to
             
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/bookings", params=params)
             response.raise_for_status()
             return response.json()
@@ -252,10 +288,7 @@ class ServicesClient:
         Cancelar una reserva
         Usa cancelBooking() como se muestra en la documentación
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.delete(
-                f"{self.base_url}/bookings/{booking_id}",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.delete(f"/bookings/{booking_id}")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import ServicesClient
 from pydantic import Field
 from typing import Annotated
@@ -18,12 +19,14 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_services(search=search)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo servicios: {str(e)}"}
 
@@ -39,12 +42,14 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_service(service_id)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo servicio: {str(e)}"}
 
@@ -70,7 +75,7 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_service_products(
                     service_id=service_id,
                     product_type=product_type
@@ -79,6 +84,8 @@ class ServicesRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo productos del servicio: {str(e)}"}
 
@@ -100,7 +107,7 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 service_data = {
                     "name": name,
                     "description": description,
@@ -115,6 +122,8 @@ class ServicesRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error creando servicio: {str(e)}"}
 
@@ -137,7 +146,7 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 service_data = {}
                 
                 if name is not None:
@@ -160,6 +169,8 @@ class ServicesRoutes(BaseRoutes):
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error actualizando servicio: {str(e)}"}
 
@@ -175,12 +186,14 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 await self.client.delete_service(service_id)
                 return {
                     "success": True,
                     "message": "Servicio eliminado correctamente"
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error eliminando servicio: {str(e)}"}
 
@@ -194,11 +207,13 @@ class ServicesRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = ServicesClient(self.get_auth_headers())
+                self.client = ServicesClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_categories()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo categorías: {str(e)}"}
\ No newline at end of file
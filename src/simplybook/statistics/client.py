@@ -1,13 +1,18 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class StatisticsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_statistics(self) -> Dict[str, Any]:
         """
@@ -20,26 +25,19 @@ class StatisticsClient:
             - Número de reservas hoy
             - Número de reservas esta semana (Lunes-Domingo)
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/statistics")
             response.raise_for_status()
             return response.json()
 
     async def get_detailed_report(self, report_id: str) -> Dict[str, Any]:
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.get(
-                f"{self.base_url}statistics/reports/{report_id}",
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.get(f"/detailed-report/{report_id}")
             response.raise_for_status()
             return response.json()
 
     async def generate_report(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
-            response = await client.post(
-                f"{self.base_url}statistics/reports",
-                json=report_data,
-                headers=self.headers
-            )
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
+            response = await client.post("/detailed-report", json=report_data)
             response.raise_for_status()
             return response.json()
\ No newline at end of file
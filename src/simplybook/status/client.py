@@ -1,14 +1,21 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, Optional, List
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
+from ..cache import cached
 
+@traced_client
 class StatusClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
+    @cached("statuses")
     async def get_statuses(self) -> List[Dict[str, Any]]:
         """
         Obtener lista de estados
@@ -16,7 +23,7 @@ class StatusClient:
         Returns:
             Lista de objetos StatusEntity
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/statuses")
             response.raise_for_status()
             return response.json() 
\ No newline at end of file
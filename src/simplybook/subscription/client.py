@@ -1,13 +1,18 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class SubscriptionClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_current_subscription(self) -> Dict[str, Any]:
         """
@@ -16,7 +21,7 @@ class SubscriptionClient:
         Returns:
             Dict con los detalles de la suscripción actual (CompanyTariffEntity)
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get("/tariff/current")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
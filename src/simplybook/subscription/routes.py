@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import SubscriptionClient
 from pydantic import Field
 from typing import Annotated
@@ -16,11 +17,13 @@ class SubscriptionRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = SubscriptionClient(self.get_auth_headers())
+                self.client = SubscriptionClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_current_subscription()
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo suscripción: {str(e)}"}
\ No newline at end of file
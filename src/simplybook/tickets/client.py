@@ -1,13 +1,18 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+import httpx
 from ..http_client import LoggingHTTPClient
+from ..endpoints import admin_url
+from ..tracing import traced_client
 
+@traced_client
 class TicketsClient:
-    def __init__(self, auth_headers: Dict[str, str]):
-        self.base_url = "https://user-api-v2.simplybook.me/admin"
+    def __init__(self, auth_headers: Dict[str, str], http_client: Optional[httpx.AsyncClient] = None):
+        self.base_url = admin_url()
         self.headers = {
             **auth_headers,
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
 
     async def get_ticket(self, code: str) -> Dict[str, Any]:
         """
@@ -19,7 +24,7 @@ class TicketsClient:
         Returns:
             Dict con los detalles del ticket (AdminTicketEntity)
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.get(f"/tickets/{code}")
             response.raise_for_status()
             return response.json()
@@ -34,7 +39,7 @@ class TicketsClient:
         Returns:
             Dict con los detalles del ticket actualizado
         """
-        async with LoggingHTTPClient(self.base_url, self.headers) as client:
+        async with LoggingHTTPClient(self.base_url, self.headers, self.http_client) as client:
             response = await client.put(f"/tickets/{code}/check-in")
             response.raise_for_status()
             return response.json()
\ No newline at end of file
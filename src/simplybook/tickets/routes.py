@@ -1,5 +1,6 @@
 from typing import Dict, Any
 from ..base_routes import BaseRoutes
+from ..exceptions import CircuitOpenError, DeadlineExceededError
 from .client import TicketsClient
 from pydantic import Field
 from typing import Annotated
@@ -18,12 +19,14 @@ class TicketsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = TicketsClient(self.get_auth_headers())
+                self.client = TicketsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.get_ticket(code)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error obteniendo ticket: {str(e)}"}
 
@@ -39,11 +42,13 @@ class TicketsRoutes(BaseRoutes):
                 if not await self.ensure_authenticated():
                     return {"error": "No se pudo autenticar"}
                     
-                self.client = TicketsClient(self.get_auth_headers())
+                self.client = TicketsClient(self.get_auth_headers(), self.http_client)
                 result = await self.client.check_in_ticket(code)
                 return {
                     "success": True,
                     "result": result
                 }
+            except (CircuitOpenError, DeadlineExceededError) as e:
+                return e.to_response()
             except Exception as e:
                 return {"error": f"Error validando ticket: {str(e)}"}
\ No newline at end of file
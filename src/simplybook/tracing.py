@@ -0,0 +1,168 @@
+import functools
+import inspect
+import logging
+import os
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator, MutableMapping
+
+logger = logging.getLogger(__name__)
+
+# Tracer activo; None mientras las trazas estén deshabilitadas (sin costo por llamada)
+_tracer = None
+_provider = None
+
+
+def get_tracing_config() -> Dict[str, Any]:
+    """
+    Obtener configuración de trazas OpenTelemetry desde variables de entorno
+
+    Variables:
+        SIMPLYBOOK_TRACING_ENABLED: Habilitar las trazas (default: false)
+        SIMPLYBOOK_TRACING_EXPORTER: otlp o file (default: otlp)
+        SIMPLYBOOK_TRACING_OTLP_ENDPOINT: Collector OTLP/HTTP (default: http://localhost:4318/v1/traces)
+        SIMPLYBOOK_TRACING_FILE: Archivo JSON Lines del exportador file (default: logs/traces.jsonl)
+        SIMPLYBOOK_TRACING_SERVICE_NAME: service.name de las trazas (default: simplybook-mcp)
+    """
+    return {
+        "enabled": os.getenv('SIMPLYBOOK_TRACING_ENABLED', 'false').lower() in ('true', '1', 'yes', 'on'),
+        "exporter": os.getenv('SIMPLYBOOK_TRACING_EXPORTER', 'otlp').lower(),
+        "otlp_endpoint": os.getenv('SIMPLYBOOK_TRACING_OTLP_ENDPOINT', 'http://localhost:4318/v1/traces'),
+        "file": os.getenv('SIMPLYBOOK_TRACING_FILE', os.path.join("logs", "traces.jsonl")),
+        "service_name": os.getenv('SIMPLYBOOK_TRACING_SERVICE_NAME', 'simplybook-mcp')
+    }
+
+
+def is_tracing_enabled() -> bool:
+    """Verificar si hay un tracer configurado"""
+    return _tracer is not None
+
+
+def configure_tracing(config: Optional[Dict[str, Any]] = None, exporter: Any = None) -> bool:
+    """
+    Configurar el TracerProvider de OpenTelemetry y su exportador
+
+    Requiere opentelemetry-sdk (y opentelemetry-exporter-otlp-proto-http para
+    el exportador otlp). Si no están instalados se registra una advertencia
+    y el servidor sigue funcionando sin trazas.
+
+    Args:
+        config: Configuración (default: get_tracing_config())
+        exporter: SpanExporter a usar en lugar del configurado (p. ej. en tests)
+
+    Returns:
+        True si las trazas quedaron habilitadas
+    """
+    global _tracer, _provider
+    config = config or get_tracing_config()
+    if not config["enabled"] and exporter is None:
+        return False
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+    except ImportError:
+        logger.warning("Tracing requested but 'opentelemetry-sdk' is not installed, tracing disabled")
+        return False
+
+    if exporter is None:
+        if config["exporter"] == "file":
+            directory = os.path.dirname(config["file"])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Un span por línea para analizarlos offline
+            exporter = ConsoleSpanExporter(
+                out=open(config["file"], "a", encoding="utf-8"),
+                formatter=lambda span: span.to_json(indent=None) + "\n"
+            )
+        else:
+            try:
+                from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            except ImportError:
+                logger.warning(
+                    "OTLP exporter requested but 'opentelemetry-exporter-otlp-proto-http' "
+                    "is not installed, tracing disabled"
+                )
+                return False
+            exporter = OTLPSpanExporter(endpoint=config["otlp_endpoint"])
+
+    _provider = TracerProvider(resource=Resource.create({"service.name": config["service_name"]}))
+    _provider.add_span_processor(BatchSpanProcessor(exporter))
+    _tracer = trace.get_tracer("simplybook", tracer_provider=_provider)
+    logger.info(f"OpenTelemetry tracing enabled, exporting with {type(exporter).__name__}")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Exportar los spans pendientes y deshabilitar las trazas"""
+    global _tracer, _provider
+    if _provider is not None:
+        _provider.shutdown()
+    _tracer = None
+    _provider = None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Abrir un span hijo del span en curso
+
+    Sin trazas habilitadas no hace nada. Las excepciones quedan registradas
+    en el span y lo marcan con error.
+
+    Args:
+        name: Nombre del span
+        **attributes: Atributos iniciales (se omiten los None)
+
+    Yields:
+        El span (None si las trazas están deshabilitadas)
+    """
+    if _tracer is None:
+        yield None
+        return
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+def set_attributes(current: Any, **attributes: Any) -> None:
+    """Agregar atributos a un span devuelto por span() (no hace nada si es None)"""
+    if current is None:
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+def inject_context(headers: MutableMapping[str, str]) -> None:
+    """Agregar el header traceparent del span en curso para continuar la traza aguas arriba"""
+    if _tracer is None:
+        return
+    from opentelemetry.propagate import inject
+    inject(headers)
+
+
+def traced_client(cls):
+    """
+    Decorador de clase para los clientes de la API: un span por cada método público
+
+    Envuelve los métodos async (no los iteradores) con un span
+    "<Clase>.<método>"; el tiempo que no está en los spans HTTP hijos es
+    el de la cache, el parseo del JSON y el armado de la respuesta.
+    """
+    for attribute, method in list(vars(cls).items()):
+        if attribute.startswith("_") or not inspect.iscoroutinefunction(method):
+            continue
+        setattr(cls, attribute, _traced_method(f"{cls.__name__}.{attribute}", method))
+    return cls
+
+
+def _traced_method(name: str, method):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _tracer is None:
+            return await method(*args, **kwargs)
+        with span(name, **{"code.function": name}):
+            return await method(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,14 @@
+"""
+Benchmarks de latencia y throughput de las herramientas MCP
+
+Invoca las herramientas del servidor (igual que src/main.py las registra)
+con concurrencia configurable contra un fake de SimplyBook con respuestas
+enlatadas, y guarda percentiles, req/s, llamadas a la API por invocación,
+CPU por invocación y pico de memoria en JSON para comparar entre commits:
+
+    python -m tests.benchmarks --calls 500 --concurrency 20 --output bench/HEAD.json
+    python -m tests.benchmarks --compare bench/HEAD~1.json
+"""
+from .harness import run_benchmarks, compare_results, build_scenarios, CannedTransport, DEFAULT_TOOLS
+
+__all__ = ['run_benchmarks', 'compare_results', 'build_scenarios', 'CannedTransport', 'DEFAULT_TOOLS']
@@ -0,0 +1,47 @@
+import argparse
+import asyncio
+import sys
+
+from .harness import run_benchmarks, compare_results, save_results, load_results, format_results, DEFAULT_TOOLS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de las herramientas MCP de SimplyBook")
+    parser.add_argument("--tools", nargs="+", default=list(DEFAULT_TOOLS), help="Herramientas a medir")
+    parser.add_argument("--calls", type=int, default=200, help="Invocaciones medidas por herramienta")
+    parser.add_argument("--concurrency", type=int, default=10, help="Invocaciones simultáneas")
+    parser.add_argument("--warmup", type=int, default=5, help="Invocaciones previas no medidas")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latencia simulada de la API")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla de los datos del fake")
+    parser.add_argument("--base-url", help="Simulador externo (python -m tests.simulator) en lugar del fake en memoria")
+    parser.add_argument("--trace-memory", action="store_true", help="Medir el pico de memoria con tracemalloc")
+    parser.add_argument("--output", help="Guardar el resultado en este archivo JSON")
+    parser.add_argument("--compare", help="Resultado JSON de referencia contra el que comparar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Empeoramiento relativo tolerado al comparar (default: 0.2)")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_benchmarks(
+        tools=args.tools, calls=args.calls, concurrency=args.concurrency, warmup=args.warmup,
+        latency_ms=args.latency_ms, seed=args.seed, base_url=args.base_url, trace_memory=args.trace_memory
+    ))
+    print(format_results(results))
+    if args.output:
+        save_results(results, args.output)
+        print(f"\nResultado guardado en {args.output}")
+
+    if args.compare:
+        rows, regressions = compare_results(load_results(args.compare), results, args.threshold)
+        print(f"\nComparación con {args.compare}:")
+        for row in rows:
+            print(f"  {row['tool']:<22} {row['metric']:<30} {row['baseline']:>10} -> {row['current']:>10} "
+                  f"({row['change']:+.1%})")
+        if regressions:
+            print("\nRegresiones:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Any, List, Optional, Tuple
+
+import httpx
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from tests.simulator import create_app, SimulatorData
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+
+DEFAULT_TOOLS = ("get_booking_list", "get_available_slots", "get_calendar_data", "get_clients_list")
+
+# Configuración del servidor durante el benchmark; las variables ya definidas tienen prioridad
+BENCHMARK_ENVIRONMENT = {
+    "SIMPLYBOOK_COMPANY": "benchmark",
+    "SIMPLYBOOK_LOGIN": "admin",
+    "SIMPLYBOOK_PASSWORD": "benchmark",
+    # El fake no limita la tasa: con el limitador activo se mediría solo su espera (5 req/s)
+    "SIMPLYBOOK_RATE_LIMIT_ENABLED": "false",
+    # Medir el camino hasta la API: con la cache de turnos todas las invocaciones serían aciertos
+    "SIMPLYBOOK_CACHE_TTL_AVAILABLE_SLOTS": "0"
+}
+
+
+class CannedTransport(httpx.AsyncBaseTransport):
+    """
+    Fake de los endpoints de SimplyBook con respuestas enlatadas
+
+    La primera petición GET de cada URL se resuelve con el simulador en
+    memoria y su respuesta se reproduce en las siguientes, así el costo
+    del fake no se suma al del servidor que se mide.
+    """
+
+    def __init__(self, app, latency_ms: float = 0.0):
+        self._upstream = httpx.ASGITransport(app=app)
+        self._responses: Dict[Tuple[str, str], Tuple[int, List[Tuple[bytes, bytes]], bytes]] = {}
+        self.latency_ms = latency_ms
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.latency_ms > 0:
+            await asyncio.sleep(self.latency_ms / 1000)
+        key = (request.method, str(request.url))
+        canned = self._responses.get(key)
+        if canned is None:
+            response = await self._upstream.handle_async_request(request)
+            content = await response.aread()
+            canned = (response.status_code, response.headers.raw, content)
+            if request.method == "GET" and response.status_code == 200:
+                self._responses[key] = canned
+        status, headers, content = canned
+        return httpx.Response(status, headers=headers, content=content, request=request)
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por rango más cercano (values ordenados)"""
+    if not values:
+        return 0.0
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summarize_latencies(latencies: List[float]) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "mean": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50": round(percentile(ordered, 0.50), 3),
+        "p95": round(percentile(ordered, 0.95), 3),
+        "p99": round(percentile(ordered, 0.99), 3),
+        "max": round(ordered[-1], 3) if ordered else 0.0
+    }
+
+
+def max_rss_kb() -> Optional[int]:
+    """Pico de memoria residente del proceso (KB)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS la informa en bytes, Linux en KB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def build_scenarios(data: SimulatorData) -> Dict[str, Dict[str, Any]]:
+    """Argumentos de cada herramienta, válidos para los datos del simulador"""
+    service = next(s for s in data.services if s["providers"])
+    day = data.today + timedelta(days=1)
+    if day.weekday() == 6:
+        day += timedelta(days=1)
+    return {
+        "get_booking_list": {"on_page": 20, "status": "confirmed"},
+        "get_available_slots": {"service_id": str(service["id"]), "provider_id": str(service["providers"][0]),
+                                "date": day.isoformat()},
+        "get_calendar_data": {"mode": "week", "date_from": data.today.isoformat(),
+                              "date_to": (data.today + timedelta(days=6)).isoformat()},
+        "get_clients_list": {"on_page": 20}
+    }
+
+
+def _tool_failed(result) -> bool:
+    if result.is_error:
+        return True
+    content = result.structured_content or {}
+    if "result" in content and isinstance(content["result"], dict):
+        content = content["result"]
+    return "error" in content or content.get("success") is False
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_scenario(mcp_client, tool: str, arguments: Dict[str, Any], calls: int,
+                       concurrency: int, upstream: Dict[str, int],
+                       trace_memory: bool = False) -> Dict[str, Any]:
+    """
+    Ejecutar `calls` invocaciones de una herramienta con `concurrency` workers
+
+    Returns:
+        Percentiles de latencia, throughput, llamadas a la API por
+        invocación, CPU por invocación y pico de memoria
+    """
+    latencies: List[float] = []
+    errors = 0
+    remaining = calls
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                failed = _tool_failed(await mcp_client.call_tool(tool, arguments, raise_on_error=False))
+            except Exception:
+                failed = True
+            latencies.append((time.perf_counter() - start) * 1000)
+            errors += failed
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+    upstream_before = upstream["calls"]
+    cpu_before = time.process_time()
+    wall_before = time.perf_counter()
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, calls)))))
+
+    wall = time.perf_counter() - wall_before
+    cpu = time.process_time() - cpu_before
+    return {
+        "calls": calls,
+        "errors": errors,
+        "concurrency": concurrency,
+        "latency_ms": summarize_latencies(latencies),
+        "throughput_rps": round(calls / wall, 2) if wall > 0 else 0.0,
+        "upstream_calls_per_tool_call": round((upstream["calls"] - upstream_before) / calls, 3),
+        "cpu_ms_per_call": round(cpu * 1000 / calls, 3),
+        "memory": {
+            "max_rss_kb": max_rss_kb(),
+            "traced_peak_kb": round(tracemalloc.get_traced_memory()[1] / 1024, 1) if trace_memory else None
+        }
+    }
+
+
+def _prepare_environment(log_dir: str) -> None:
+    for name, value in BENCHMARK_ENVIRONMENT.items():
+        os.environ.setdefault(name, value)
+    os.environ.setdefault("SIMPLYBOOK_API_LOG_FILE", os.path.join(log_dir, "simplybook_api.jsonl"))
+    if SRC_DIR not in sys.path:
+        # El servidor se arma igual que en src/main.py, que importa el paquete como `simplybook`
+        sys.path.insert(0, SRC_DIR)
+
+
+async def run_benchmarks(tools: Optional[List[str]] = None, calls: int = 200, concurrency: int = 10,
+                         warmup: int = 5, latency_ms: float = 0.0, seed: int = 42,
+                         base_url: Optional[str] = None, trace_memory: bool = False) -> Dict[str, Any]:
+    """
+    Ejecutar el benchmark de herramientas MCP contra el fake de SimplyBook
+
+    Args:
+        tools: Herramientas a medir (default: DEFAULT_TOOLS)
+        calls: Invocaciones medidas por herramienta
+        concurrency: Invocaciones simultáneas
+        warmup: Invocaciones previas no medidas (login, cachés, respuestas enlatadas)
+        latency_ms: Latencia simulada de la API en el fake en memoria
+        seed: Semilla de los datos del simulador
+        base_url: Usar un simulador externo (python -m tests.simulator) con el pool
+            HTTP real en lugar del fake en memoria
+        trace_memory: Medir el pico de memoria Python con tracemalloc (más lento)
+
+    Returns:
+        Resultado serializable a JSON con metadatos y un bloque por herramienta
+    """
+    tools = list(tools or DEFAULT_TOOLS)
+    log_dir = tempfile.mkdtemp(prefix="simplybook-bench-")
+    _prepare_environment(log_dir)
+    if base_url:
+        os.environ["SIMPLYBOOK_BASE_URL"] = base_url
+
+    from fastmcp import Client
+    import main as server
+    from simplybook.auth.token_manager import TokenManager
+    from simplybook.http_client import create_http_client
+
+    data = SimulatorData(seed=seed)
+    scenarios = build_scenarios(data)
+    unknown = [tool for tool in tools if tool not in scenarios]
+    if unknown:
+        raise ValueError(f"Herramientas sin escenario: {', '.join(unknown)}")
+
+    upstream = {"calls": 0}
+
+    async def count_request(request: httpx.Request) -> None:
+        upstream["calls"] += 1
+
+    if base_url:
+        http_client = create_http_client()
+    else:
+        http_client = httpx.AsyncClient(transport=CannedTransport(create_app(seed=seed), latency_ms))
+    http_client.event_hooks = {"request": [count_request], "response": []}
+
+    company, login, password = server.get_credentials()
+    token_manager = TokenManager(persist=False)
+    server.configure_token_auth(http_client, token_manager, company, login, password)
+    mcp = server.create_mcp_server()
+    server.register_routers(mcp, company, login, password, http_client, token_manager)
+
+    results: Dict[str, Any] = {}
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        async with Client(mcp) as mcp_client:
+            for tool in tools:
+                for _ in range(warmup):
+                    await mcp_client.call_tool(tool, scenarios[tool], raise_on_error=False)
+                results[tool] = await run_scenario(mcp_client, tool, scenarios[tool], calls,
+                                                   concurrency, upstream, trace_memory)
+                results[tool]["arguments"] = scenarios[tool]
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        await http_client.aclose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "fake": base_url or "canned",
+            "latency_ms": latency_ms,
+            "calls": calls,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "seed": seed
+        },
+        "tools": results
+    }
+
+
+# Métricas comparadas: (ruta en el resultado, mayor es mejor)
+COMPARED_METRICS = (
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("throughput_rps",), True),
+    (("upstream_calls_per_tool_call",), False),
+    (("cpu_ms_per_call",), False)
+)
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    threshold: float = 0.2) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Comparar dos resultados de run_benchmarks
+
+    Args:
+        baseline: Resultado de referencia (por ejemplo, el commit anterior)
+        current: Resultado nuevo
+        threshold: Empeoramiento relativo tolerado (0.2 = 20%)
+
+    Returns:
+        (filas con valor anterior, nuevo y variación, regresiones que superan el umbral)
+    """
+    rows, regressions = [], []
+    for tool, result in current["tools"].items():
+        previous = baseline.get("tools", {}).get(tool)
+        if previous is None:
+            continue
+        for path, higher_is_better in COMPARED_METRICS:
+            old, new = previous, result
+            for key in path:
+                old, new = old[key], new[key]
+            change = (new - old) / old if old else 0.0
+            name = ".".join(path)
+            rows.append({"tool": tool, "metric": name, "baseline": old, "current": new,
+                         "change": round(change, 4)})
+            worse = -change if higher_is_better else change
+            # Una llamada extra a la API es una regresión aunque sea poca en proporción
+            if (name == "upstream_calls_per_tool_call" and new > old) or worse > threshold:
+                regressions.append(f"{tool} {name}: {old} -> {new} ({change:+.1%})")
+    return rows, regressions
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"{'herramienta':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8} "
+             f"{'api/call':>8} {'cpu ms':>8} {'errores':>7}"]
+    for tool, result in results["tools"].items():
+        latency = result["latency_ms"]
+        lines.append(f"{tool:<22} {latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} "
+                     f"{result['throughput_rps']:>8.1f} {result['upstream_calls_per_tool_call']:>8.2f} "
+                     f"{result['cpu_ms_per_call']:>8.2f} {result['errors']:>7}")
+    rss = [r["memory"]["max_rss_kb"] for r in results["tools"].values() if r["memory"]["max_rss_kb"]]
+    if rss:
+        lines.append(f"memoria máxima (RSS): {max(rss) / 1024:.1f} MB")
+    return "\n".join(lines)
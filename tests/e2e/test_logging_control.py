@@ -4,6 +4,7 @@ Script para probar el control de logging mediante la variable ENABLE_API_LOGGING
 """
 
 import asyncio
+import json
 import os
 import subprocess
 from fastmcp import Client
@@ -80,19 +81,24 @@ async def test_api_calls(test_name: str):
 
 def check_log_file():
     """Verificar el archivo de log"""
-    log_file = "logs/simplybook_api.log"
+    log_file = os.getenv("SIMPLYBOOK_API_LOG_FILE", "logs/simplybook_api.jsonl")
     
     if os.path.exists(log_file):
         # Obtener el tamaño del archivo
         file_size = os.path.getsize(log_file)
         
-        # Contar líneas de log de API
+        # Contar entradas de log de API (una entrada JSON por línea)
         try:
+            events = {"request": 0, "response": 0, "error": 0}
             with open(log_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-                api_request_lines = content.count('API REQUEST')
-                api_response_lines = content.count('API RESPONSE')
-                api_error_lines = content.count('API ERROR')
+                for line in f:
+                    if line.strip():
+                        event = json.loads(line).get("event")
+                        if event in events:
+                            events[event] += 1
+            api_request_lines = events["request"]
+            api_response_lines = events["response"]
+            api_error_lines = events["error"]
                 
             print(f"\n📁 Archivo de log: {log_file}")
             print(f"📏 Tamaño: {file_size} bytes")
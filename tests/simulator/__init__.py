@@ -0,0 +1,15 @@
+"""
+Simulador local de la API de SimplyBook.me (user-api-v2)
+
+Permite correr pruebas de integración y de carga sin credenciales ni
+acceso a la API real:
+
+    python -m tests.simulator --port 8100 --latency-ms 40 --error-rate 0.02
+    SIMPLYBOOK_BASE_URL=http://127.0.0.1:8100 python src/main.py
+
+En tests se puede usar en memoria con httpx.ASGITransport(app=create_app()).
+"""
+from .app import create_app, get_simulator_config, SimulatorState
+from .data import SimulatorData
+
+__all__ = ['create_app', 'get_simulator_config', 'SimulatorState', 'SimulatorData']
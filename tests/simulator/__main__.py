@@ -0,0 +1,28 @@
+import argparse
+
+import uvicorn
+
+from .app import create_app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulador local de la API de SimplyBook.me")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--seed", type=int, help="Semilla de los datos sintéticos")
+    parser.add_argument("--clients", type=int, help="Cantidad de clientes")
+    parser.add_argument("--bookings", type=int, help="Reservas a generar")
+    parser.add_argument("--latency-ms", type=float, help="Latencia fija por respuesta")
+    parser.add_argument("--latency-jitter-ms", type=float, help="Latencia aleatoria adicional máxima")
+    parser.add_argument("--error-rate", type=float, help="Proporción de errores inyectados (0-1)")
+    parser.add_argument("--error-status", type=int, help="Código de los errores inyectados")
+    parser.add_argument("--rate-limit", type=float, help="Peticiones por segundo antes de responder 429")
+    args = parser.parse_args()
+
+    # Las opciones no indicadas quedan con el valor de las variables SIMULATOR_*
+    overrides = {key: value for key, value in vars(args).items() if key not in ("host", "port") and value is not None}
+    uvicorn.run(create_app(**overrides), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,515 @@
+import asyncio
+import math
+import os
+import random
+import secrets
+import time
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from .data import SimulatorData, format_datetime, parse_datetime, day_slots, is_working_day
+
+
+def get_simulator_config() -> Dict[str, Any]:
+    """
+    Obtener configuración del simulador desde variables de entorno
+
+    Variables:
+        SIMULATOR_SEED: Semilla de los datos sintéticos (default: 42)
+        SIMULATOR_CLIENTS: Cantidad de clientes (default: 200)
+        SIMULATOR_BOOKINGS: Reservas a generar (default: 500)
+        SIMULATOR_DAYS: Las reservas se reparten en hoy ± N días (default: 30)
+        SIMULATOR_LATENCY_MS: Latencia fija agregada a cada respuesta (default: 0)
+        SIMULATOR_LATENCY_JITTER_MS: Latencia aleatoria adicional máxima (default: 0)
+        SIMULATOR_ERROR_RATE: Proporción de respuestas con error inyectado, 0-1 (default: 0)
+        SIMULATOR_ERROR_STATUS: Código de los errores inyectados (default: 503)
+        SIMULATOR_ERROR_PATHS: Prefijos de ruta afectados por los errores, separados por coma (default: todos)
+        SIMULATOR_RATE_LIMIT: Peticiones por segundo antes de responder 429 (default: 0 = sin límite)
+        SIMULATOR_RATE_LIMIT_BURST: Peticiones permitidas de golpe (default: 10)
+        SIMULATOR_TOKEN_TTL: Segundos de validez de los tokens (default: 3600)
+    """
+    def _float(name: str, default: float) -> float:
+        try:
+            return float(os.getenv(name, default))
+        except ValueError:
+            return default
+
+    error_paths = os.getenv('SIMULATOR_ERROR_PATHS', '')
+    return {
+        "seed": int(_float('SIMULATOR_SEED', 42)),
+        "clients": int(_float('SIMULATOR_CLIENTS', 200)),
+        "bookings": int(_float('SIMULATOR_BOOKINGS', 500)),
+        "days": int(_float('SIMULATOR_DAYS', 30)),
+        "latency_ms": _float('SIMULATOR_LATENCY_MS', 0.0),
+        "latency_jitter_ms": _float('SIMULATOR_LATENCY_JITTER_MS', 0.0),
+        "error_rate": _float('SIMULATOR_ERROR_RATE', 0.0),
+        "error_status": int(_float('SIMULATOR_ERROR_STATUS', 503)),
+        "error_paths": [path.strip() for path in error_paths.split(',') if path.strip()],
+        "rate_limit": _float('SIMULATOR_RATE_LIMIT', 0.0),
+        "rate_limit_burst": _float('SIMULATOR_RATE_LIMIT_BURST', 10.0),
+        "token_ttl": _float('SIMULATOR_TOKEN_TTL', 3600.0)
+    }
+
+
+# Parámetros de configuración que se pueden cambiar en caliente con POST /__simulator/config
+RUNTIME_OPTIONS = ("latency_ms", "latency_jitter_ms", "error_rate", "error_status", "error_paths",
+                   "rate_limit", "rate_limit_burst", "token_ttl")
+
+
+def _error(status: int, message: str, headers: Optional[Dict[str, str]] = None) -> JSONResponse:
+    return JSONResponse({"code": status, "message": message, "data": [], "message_data": []},
+                        status_code=status, headers=headers)
+
+
+def _filter_value(request: Request, name: str) -> Optional[str]:
+    return request.query_params.get(f"filter[{name}]")
+
+
+def _filter_list(request: Request, name: str) -> List[str]:
+    prefix = f"filter[{name}]["
+    return [value for key, value in request.query_params.multi_items() if key.startswith(prefix)]
+
+
+def _paginate(request: Request, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Respuesta paginada con el formato de SimplyBook.me: {"data", "metadata"}"""
+    try:
+        page = max(1, int(request.query_params.get("page", 1)))
+        on_page = max(1, int(request.query_params.get("on_page", 10)))
+    except ValueError:
+        page, on_page = 1, 10
+    start = (page - 1) * on_page
+    return {
+        "data": items[start:start + on_page],
+        "metadata": {
+            "items_count": len(items),
+            "pages_count": max(1, math.ceil(len(items) / on_page)),
+            "page": page,
+            "on_page": on_page
+        }
+    }
+
+
+def _parse_date(value: Optional[str]) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:10], "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+class SimulatorState:
+    """Datos, configuración en caliente, limitador y contadores del simulador"""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self.data = SimulatorData(config["seed"], config["clients"], config["bookings"], config["days"])
+        self.rng = random.Random(config["seed"])
+        self.requests: Dict[str, int] = {}
+        self.total_requests = 0
+        self.injected_errors = 0
+        self.rate_limited = 0
+        self._tokens = config["rate_limit_burst"]
+        self._updated_at = time.monotonic()
+
+    def allow_request(self) -> Optional[float]:
+        """Token bucket global: None si la petición pasa o segundos hasta el próximo token"""
+        rate = self.config["rate_limit"]
+        if rate <= 0:
+            return None
+        now = time.monotonic()
+        self._tokens = min(self.config["rate_limit_burst"], self._tokens + (now - self._updated_at) * rate)
+        self._updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return None
+        return (1 - self._tokens) / rate
+
+    def should_fail(self, path: str) -> bool:
+        if self.config["error_rate"] <= 0:
+            return False
+        paths = self.config["error_paths"]
+        if paths and not any(path.startswith(prefix) for prefix in paths):
+            return False
+        return self.rng.random() < self.config["error_rate"]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total_requests": self.total_requests,
+            "requests": dict(sorted(self.requests.items())),
+            "injected_errors": self.injected_errors,
+            "rate_limited": self.rate_limited,
+            "bookings": len(self.data.bookings),
+            "clients": len(self.data.clients)
+        }
+
+
+def create_app(**overrides: Any) -> Starlette:
+    """
+    Crear la app del simulador de la API de SimplyBook.me
+
+    Args:
+        **overrides: Valores que reemplazan a los de get_simulator_config()
+            (seed, clients, bookings, days, latency_ms, error_rate, rate_limit, ...)
+
+    Returns:
+        App ASGI; el estado queda en app.state.simulator
+    """
+    state = SimulatorState({**get_simulator_config(), **overrides})
+    data = state.data
+
+    def endpoint(path: str, handler: Callable[[Request], Awaitable[Any]],
+                 methods: List[str], auth: bool = True) -> Route:
+        """Ruta con contadores, latencia, límite de peticiones, errores inyectados y autenticación"""
+        async def wrapper(request: Request) -> Response:
+            key = f"{request.method} {path}"
+            state.requests[key] = state.requests.get(key, 0) + 1
+            state.total_requests += 1
+
+            latency = state.config["latency_ms"] + state.rng.uniform(0, state.config["latency_jitter_ms"])
+            if latency > 0:
+                await asyncio.sleep(latency / 1000)
+
+            retry_after = state.allow_request()
+            if retry_after is not None:
+                state.rate_limited += 1
+                return _error(429, "Too many requests", {"Retry-After": str(max(1, math.ceil(retry_after)))})
+
+            if state.should_fail(request.url.path):
+                state.injected_errors += 1
+                return _error(state.config["error_status"], "Simulated failure")
+
+            if auth:
+                token = data.tokens.get(request.headers.get("X-Token", ""))
+                if token is None or token["company"] != request.headers.get("X-Company-Login"):
+                    return _error(401, "Token is invalid")
+                if token["expires_at"] < time.time():
+                    return _error(401, "Token expired")
+
+            result = await handler(request)
+            return result if isinstance(result, Response) else JSONResponse(result)
+        return Route(path, wrapper, methods=methods)
+
+    async def _json(request: Request) -> Dict[str, Any]:
+        try:
+            body = await request.json()
+        except ValueError:
+            return {}
+        return body if isinstance(body, dict) else {}
+
+    def _issue_token(company: str, login: str) -> Dict[str, Any]:
+        token = secrets.token_hex(16)
+        refresh_token = secrets.token_hex(16)
+        data.tokens[token] = {"company": company, "login": login, "refresh_token": refresh_token,
+                              "expires_at": time.time() + state.config["token_ttl"]}
+        return {"token": token, "company": company, "login": login, "refresh_token": refresh_token,
+                "domain": "simplybook.me", "require2fa": False, "allowed2fa_providers": [], "auth_session_id": ""}
+
+    # --- Autenticación ---
+
+    async def auth(request: Request):
+        body = await _json(request)
+        if not body.get("company") or not body.get("login") or not body.get("password"):
+            return _error(401, "Invalid credentials")
+        return _issue_token(body["company"], body["login"])
+
+    async def refresh_token(request: Request):
+        body = await _json(request)
+        for token, entry in list(data.tokens.items()):
+            if entry["refresh_token"] == body.get("refresh_token") and entry["company"] == body.get("company"):
+                del data.tokens[token]
+                return _issue_token(entry["company"], entry["login"])
+        return _error(401, "Invalid refresh token")
+
+    async def logout(request: Request):
+        body = await _json(request)
+        data.tokens.pop(body.get("auth_token", ""), None)
+        return {"success": True}
+
+    # --- Reservas ---
+
+    def _filter_bookings(request: Request) -> List[Dict[str, Any]]:
+        bookings = data.bookings
+        date_from = _parse_date(_filter_value(request, "date_from"))
+        date_to = _parse_date(_filter_value(request, "date_to"))
+        status = _filter_value(request, "status")
+        client_id = _filter_value(request, "client_id")
+        services = _filter_list(request, "services")
+        providers = _filter_list(request, "providers")
+        search = (_filter_value(request, "search") or "").lower()
+        upcoming_only = _filter_value(request, "upcoming_only") == "1"
+        now = format_datetime(datetime.now())
+
+        result = []
+        for booking in bookings:
+            day = booking["start_datetime"][:10]
+            if date_from and day < date_from.isoformat():
+                continue
+            if date_to and day > date_to.isoformat():
+                continue
+            if status and booking["status"] != status:
+                continue
+            if client_id and str(booking["client_id"]) != client_id:
+                continue
+            if services and str(booking["service_id"]) not in services:
+                continue
+            if providers and str(booking["provider_id"]) not in providers:
+                continue
+            if upcoming_only and booking["start_datetime"] < now:
+                continue
+            if search and search not in f"{booking['code']} {booking['client']['name']} {booking['client']['email']}".lower():
+                continue
+            result.append(booking)
+        return sorted(result, key=lambda b: (b["start_datetime"], b["id"]))
+
+    async def list_bookings(request: Request):
+        return _paginate(request, _filter_bookings(request))
+
+    async def calendar(request: Request):
+        return _filter_bookings(request)
+
+    async def create_booking(request: Request):
+        body = await _json(request)
+        try:
+            start = datetime.strptime(body.get("start_datetime", ""), "%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return _error(400, "start_datetime is required (YYYY-MM-DD HH:MM:SS)")
+        service = data.service(body.get("service_id"))
+        provider = data.provider(body.get("provider_id"))
+        client_id = body.get("client_id") or (body.get("client") or {}).get("id")
+        if service is None or provider is None or client_id is None:
+            return _error(400, "service_id, provider_id and client_id are required")
+        if start not in data.free_slots(service["id"], provider["id"], start.date()):
+            return _error(400, "Selected time is not available")
+        booking = data.add_booking(service["id"], provider["id"], client_id, start)
+        return {"bookings": [booking], "batch_id": None, "invoice": None}
+
+    async def booking_detail(request: Request):
+        booking = data.booking(request.path_params["booking_id"])
+        if booking is None:
+            return _error(404, "Booking not found")
+        if request.method == "DELETE":
+            booking["status"] = "canceled"
+            booking["is_confirmed"] = False
+            return booking
+        if request.method == "PUT":
+            body = await _json(request)
+            service_id = body.get("service_id", booking["service_id"])
+            provider_id = body.get("provider_id", booking["provider_id"])
+            start = parse_datetime(body.get("start_datetime", booking["start_datetime"]))
+            if start not in data.free_slots(service_id, provider_id, start.date(), ignore_booking_id=booking["id"]):
+                return _error(400, "Selected time is not available")
+            data.move_booking(booking, service_id, provider_id, start)
+        return booking
+
+    async def booking_action(request: Request):
+        booking = data.booking(request.path_params["booking_id"])
+        if booking is None:
+            return _error(404, "Booking not found")
+        action = request.path_params["action"]
+        if action == "approve":
+            booking["status"] = "confirmed"
+            booking["is_confirmed"] = True
+        elif action == "comment":
+            booking["comment"] = (await _json(request)).get("comment")
+        elif action == "links":
+            return {"booking": booking["id"], "links": []}
+        return booking
+
+    # --- Horarios y turnos ---
+
+    def _slot_params(request: Request):
+        params = request.query_params
+        return params.get("service_id"), params.get("provider_id")
+
+    async def schedule(request: Request):
+        date_from = _parse_date(request.query_params.get("date_from"))
+        date_to = _parse_date(request.query_params.get("date_to"))
+        if date_from is None or date_to is None:
+            return _error(400, "date_from and date_to are required")
+        days = []
+        day = date_from
+        while day <= date_to:
+            working = is_working_day(day)
+            days.append({"date": day.isoformat(), "time_from": "09:00:00" if working else None,
+                         "time_to": "17:00:00" if working else None, "is_day_off": not working})
+            day += timedelta(days=1)
+        return days
+
+    async def slots(request: Request):
+        service_id, provider_id = _slot_params(request)
+        day = _parse_date(request.query_params.get("date"))
+        service = data.service(service_id)
+        if day is None or service is None:
+            return _error(400, "service_id and date are required")
+        return [{"id": format_datetime(start), "date": day.isoformat(), "time": start.strftime("%H:%M:%S")}
+                for start in day_slots(day, service["duration"])]
+
+    async def available_slots(request: Request):
+        service_id, provider_id = _slot_params(request)
+        day = _parse_date(request.query_params.get("date"))
+        if day is None:
+            return _error(400, "date is required")
+        return [{"id": format_datetime(start), "date": day.isoformat(), "time": start.strftime("%H:%M:%S")}
+                for start in data.free_slots(service_id, provider_id, day)]
+
+    async def first_available_slot(request: Request):
+        service_id, provider_id = _slot_params(request)
+        day = _parse_date(request.query_params.get("date"))
+        if day is None:
+            return _error(400, "date is required")
+        for offset in range(60):
+            current = day + timedelta(days=offset)
+            free = data.free_slots(service_id, provider_id, current)
+            if free:
+                return {"id": format_datetime(free[0]), "date": current.isoformat(),
+                        "time": free[0].strftime("%H:%M:%S")}
+        return _error(404, "No available slots")
+
+    async def timeline_slots(request: Request):
+        service_id, provider_id = _slot_params(request)
+        date_from = _parse_date(request.query_params.get("date_from"))
+        date_to = _parse_date(request.query_params.get("date_to"))
+        service = data.service(service_id)
+        if date_from is None or date_to is None or service is None:
+            return _error(400, "service_id, date_from and date_to are required")
+        ignore = request.query_params.get("booking_id")
+        timeline = []
+        day = date_from
+        while day <= date_to:
+            free = set(data.free_slots(service_id, provider_id, day, ignore_booking_id=ignore))
+            timeline.append({
+                "date": day.isoformat(),
+                "slots": [{"time": start.strftime("%H:%M:%S"), "available_count": 1 if start in free else 0,
+                           "total_count": 1}
+                          for start in day_slots(day, service["duration"])]
+            })
+            day += timedelta(days=1)
+        return timeline
+
+    # --- Clientes, facturas y datos de referencia ---
+
+    async def list_clients(request: Request):
+        search = (_filter_value(request, "search") or "").lower()
+        clients = [c for c in data.clients
+                   if not search or search in f"{c['name']} {c['email']} {c['phone']}".lower()]
+        return _paginate(request, clients)
+
+    async def create_client(request: Request):
+        body = await _json(request)
+        client = {"id": len(data.clients) + 1, "name": body.get("name", ""),
+                  "email": body.get("email", ""), "phone": body.get("phone", "")}
+        data.clients.append(client)
+        return client
+
+    async def client_detail(request: Request):
+        client = data.client(request.path_params["client_id"])
+        if client is None:
+            return _error(404, "Client not found")
+        if request.method == "PUT":
+            client.update({key: value for key, value in (await _json(request)).items() if key != "id"})
+        elif request.method == "DELETE":
+            data.clients.remove(client)
+        return client
+
+    async def list_invoices(request: Request):
+        client_id = _filter_value(request, "client_id")
+        status = _filter_value(request, "status")
+        invoices = [i for i in data.invoices
+                    if (not client_id or str(i["client_id"]) == client_id) and (not status or i["status"] == status)]
+        return _paginate(request, invoices)
+
+    async def invoice_detail(request: Request):
+        invoice = next((i for i in data.invoices if str(i["id"]) == request.path_params["invoice_id"]), None)
+        return invoice if invoice is not None else _error(404, "Invoice not found")
+
+    async def list_providers(request: Request):
+        service_id = _filter_value(request, "service_id")
+        search = (_filter_value(request, "search") or "").lower()
+        providers = [p for p in data.providers
+                     if (not service_id or int(service_id) in p["services"])
+                     and (not search or search in p["name"].lower())]
+        return _paginate(request, providers)
+
+    async def list_services(request: Request):
+        search = (_filter_value(request, "search") or "").lower()
+        return _paginate(request, [s for s in data.services if not search or search in s["name"].lower()])
+
+    def detail(collection: Callable[[], List[Dict[str, Any]]], param: str, name: str):
+        async def handler(request: Request):
+            item = next((i for i in collection() if str(i["id"]) == request.path_params[param]), None)
+            return item if item is not None else _error(404, f"{name} not found")
+        return handler
+
+    def listing(collection: Callable[[], List[Dict[str, Any]]], paginated: bool = False):
+        async def handler(request: Request):
+            return _paginate(request, collection()) if paginated else collection()
+        return handler
+
+    # --- Control del simulador ---
+
+    async def simulator_stats(request: Request):
+        return JSONResponse(state.stats())
+
+    async def simulator_config(request: Request):
+        if request.method == "POST":
+            body = await _json(request)
+            unknown = set(body) - set(RUNTIME_OPTIONS)
+            if unknown:
+                return _error(400, f"Unknown options: {', '.join(sorted(unknown))}")
+            state.config.update(body)
+        return JSONResponse({key: state.config[key] for key in RUNTIME_OPTIONS})
+
+    async def simulator_reset(request: Request):
+        state.requests.clear()
+        state.total_requests = state.injected_errors = state.rate_limited = 0
+        return JSONResponse(state.stats())
+
+    routes = [
+        endpoint("/admin/auth", auth, ["POST"], auth=False),
+        endpoint("/admin/auth/refresh-token", refresh_token, ["POST"], auth=False),
+        endpoint("/admin/auth/logout", logout, ["POST"], auth=False),
+        endpoint("/admin/bookings", list_bookings, ["GET"]),
+        endpoint("/admin/bookings", create_booking, ["POST"]),
+        endpoint("/admin/bookings/{booking_id}", booking_detail, ["GET", "PUT", "DELETE"]),
+        endpoint("/admin/bookings/{booking_id}/{action}", booking_action, ["GET", "PUT"]),
+        endpoint("/admin/calendar", calendar, ["GET"]),
+        endpoint("/admin/schedule", schedule, ["GET"]),
+        endpoint("/admin/schedule/slots", slots, ["GET"]),
+        endpoint("/admin/schedule/available-slots", available_slots, ["GET"]),
+        endpoint("/admin/schedule/first-available-slot", first_available_slot, ["GET"]),
+        endpoint("/admin/timeline/slots", timeline_slots, ["GET"]),
+        endpoint("/admin/clients", list_clients, ["GET"]),
+        endpoint("/admin/clients", create_client, ["POST"]),
+        endpoint("/admin/clients/fields", listing(lambda: data.client_fields), ["GET"]),
+        endpoint("/admin/clients/memberships", listing(lambda: data.memberships, paginated=True), ["GET"]),
+        endpoint("/admin/clients/{client_id}", client_detail, ["GET", "PUT", "DELETE"]),
+        endpoint("/admin/invoices", list_invoices, ["GET"]),
+        endpoint("/admin/invoices/{invoice_id}", invoice_detail, ["GET"]),
+        endpoint("/admin/services", list_services, ["GET"]),
+        endpoint("/admin/services/{service_id}", detail(lambda: data.services, "service_id", "Service"), ["GET"]),
+        endpoint("/admin/providers", list_providers, ["GET"]),
+        endpoint("/admin/providers/{provider_id}", detail(lambda: data.providers, "provider_id", "Provider"), ["GET"]),
+        endpoint("/admin/categories", listing(lambda: data.categories), ["GET"]),
+        endpoint("/admin/locations", listing(lambda: data.locations), ["GET"]),
+        endpoint("/admin/statuses", listing(lambda: data.statuses), ["GET"]),
+        endpoint("/admin/additional-fields", listing(lambda: data.additional_fields), ["GET"]),
+        endpoint("/admin/products", listing(lambda: data.products, paginated=True), ["GET"]),
+        endpoint("/admin/products/{product_id}", detail(lambda: data.products, "product_id", "Product"), ["GET"]),
+        endpoint("/admin/calendar-notes", listing(lambda: data.notes, paginated=True), ["GET"]),
+        endpoint("/admin/calendar-notes/types", listing(lambda: data.note_types), ["GET"]),
+        endpoint("/admin/calendar-notes/{note_id}", detail(lambda: data.notes, "note_id", "Note"), ["GET"]),
+        endpoint("/admin/promotions", listing(lambda: data.promotions, paginated=True), ["GET"]),
+        Route("/__simulator/stats", simulator_stats, methods=["GET"]),
+        Route("/__simulator/config", simulator_config, methods=["GET", "POST"]),
+        Route("/__simulator/reset", simulator_reset, methods=["POST"])
+    ]
+
+    app = Starlette(routes=routes)
+    app.state.simulator = state
+    return app
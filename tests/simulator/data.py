@@ -0,0 +1,235 @@
+import random
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Any, List, Optional
+
+
+# Horario de atención de todos los proveedores (lunes a sábado)
+WORK_START = time(9, 0)
+WORK_END = time(17, 0)
+
+BOOKING_STATUSES = ("confirmed", "confirmed", "confirmed", "pending", "canceled")
+
+_FIRST_NAMES = ("Ana", "Bruno", "Carla", "Diego", "Elena", "Facundo", "Gabriela", "Hernán",
+                "Inés", "Joaquín", "Laura", "Martín", "Natalia", "Pablo", "Sofía", "Tomás")
+_LAST_NAMES = ("García", "Fernández", "López", "Martínez", "Pérez", "Gómez", "Díaz", "Romero",
+               "Sosa", "Torres", "Álvarez", "Ruiz")
+_SERVICES = (("Corte de pelo", 30, 15.0), ("Coloración", 90, 60.0), ("Masaje", 60, 40.0),
+             ("Manicura", 45, 20.0), ("Consulta", 30, 25.0), ("Tratamiento facial", 60, 45.0))
+
+
+def is_working_day(day: date) -> bool:
+    """Los proveedores simulados trabajan de lunes a sábado"""
+    return day.weekday() != 6
+
+
+def day_slots(day: date, duration: int) -> List[datetime]:
+    """Inicios de turno de un día para un servicio de `duration` minutos"""
+    if not is_working_day(day):
+        return []
+    slots = []
+    start = datetime.combine(day, WORK_START)
+    end = datetime.combine(day, WORK_END)
+    while start + timedelta(minutes=duration) <= end:
+        slots.append(start)
+        start += timedelta(minutes=duration)
+    return slots
+
+
+def format_datetime(value: datetime) -> str:
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def parse_datetime(value: str) -> datetime:
+    return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+
+
+class SimulatorData:
+    """
+    Datos sintéticos de una empresa de SimplyBook.me
+
+    Se generan de forma determinista a partir de la semilla: la misma
+    configuración produce siempre los mismos servicios, proveedores,
+    clientes, reservas y facturas.
+    """
+
+    def __init__(self, seed: int = 42, clients: int = 200, bookings: int = 500,
+                 days: int = 30, today: Optional[date] = None):
+        """
+        Args:
+            seed: Semilla del generador
+            clients: Cantidad de clientes
+            bookings: Cantidad de reservas a intentar generar
+            days: Las reservas se reparten entre hoy - days y hoy + days
+            today: Fecha de referencia (default: hoy)
+        """
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+
+        self.categories = [{"id": 1, "name": "Peluquería", "is_visible": True},
+                           {"id": 2, "name": "Bienestar", "is_visible": True}]
+        self.locations = [{"id": 1, "name": "Centro", "address1": "Av. Siempre Viva 742", "city": "Buenos Aires"},
+                          {"id": 2, "name": "Norte", "address1": "Calle Falsa 123", "city": "Buenos Aires"}]
+        self.services = [
+            {"id": i, "name": name, "duration": duration, "price": price, "currency": "USD",
+             "is_visible": True, "categories": [1 if i <= 2 else 2], "providers": []}
+            for i, (name, duration, price) in enumerate(_SERVICES, 1)
+        ]
+        self.providers = []
+        for i in range(1, 6):
+            service_ids = sorted(self.rng.sample([s["id"] for s in self.services], 3))
+            self.providers.append({
+                "id": i, "name": f"{self.rng.choice(_FIRST_NAMES)} {self.rng.choice(_LAST_NAMES)}",
+                "qty": 1, "is_visible": True, "location_id": 1 + i % 2, "services": service_ids
+            })
+            for service_id in service_ids:
+                self.service(service_id)["providers"].append(i)
+
+        self.clients = []
+        for i in range(1, clients + 1):
+            first, last = self.rng.choice(_FIRST_NAMES), self.rng.choice(_LAST_NAMES)
+            self.clients.append({
+                "id": i, "name": f"{first} {last}",
+                "email": f"{first.lower()}.{last.lower()}{i}@example.com",
+                "phone": f"+5411{self.rng.randint(40000000, 49999999)}"
+            })
+
+        # Las notas que bloquean horario se crean antes que las reservas para que no se superpongan
+        self.note_types = [{"id": 1, "name": "General", "is_default": True}]
+        self.notes = [{"id": 1, "provider_id": 1, "service_id": None, "note_type_id": 1,
+                       "start_date_time": format_datetime(datetime.combine(self.today, time(13, 0))),
+                       "end_date_time": format_datetime(datetime.combine(self.today, time(14, 0))),
+                       "note": "Almuerzo", "mode": "provider", "time_blocked": True}]
+
+        self.bookings: List[Dict[str, Any]] = []
+        # Índice (provider_id, fecha) -> reservas, para no recorrer todas al buscar turnos libres
+        self._agenda: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._next_booking_id = 1
+        for _ in range(bookings):
+            self._seed_booking(days)
+
+        self.invoices = []
+        for i, booking in enumerate(b for b in self.bookings if b["status"] != "canceled"):
+            if i % 3:
+                continue
+            service = self.service(booking["service_id"])
+            self.invoices.append({
+                "id": len(self.invoices) + 1, "number": f"INV-{len(self.invoices) + 1:05d}",
+                "client_id": booking["client_id"], "booking_ids": [booking["id"]],
+                "amount": service["price"], "currency": "USD",
+                "status": self.rng.choice(("paid", "paid", "new", "pending")),
+                "datetime": booking["start_datetime"]
+            })
+
+        self.statuses = [{"id": 1, "name": "Confirmada", "color": "#2e7d32", "is_default": True},
+                         {"id": 2, "name": "Pendiente", "color": "#f9a825", "is_default": False}]
+        self.client_fields = [{"id": "name", "title": "Nombre", "type": "text"},
+                              {"id": "email", "title": "Email", "type": "text"},
+                              {"id": "phone", "title": "Teléfono", "type": "text"}]
+        self.additional_fields = [{"id": 1, "name": "notes", "title": "Notas", "type": "textarea"}]
+        self.products = [{"id": 1, "name": "Shampoo", "price": 10.0, "type": "product"},
+                         {"id": 2, "name": "Lavado", "price": 5.0, "type": "attribute"}]
+        self.memberships = []
+        self.promotions = [{"id": 1, "name": "Bienvenida", "promotion_type": "discount", "discount": 10}]
+        self.tokens: Dict[str, Dict[str, Any]] = {}
+
+    def service(self, service_id: Any) -> Optional[Dict[str, Any]]:
+        return next((s for s in self.services if str(s["id"]) == str(service_id)), None)
+
+    def provider(self, provider_id: Any) -> Optional[Dict[str, Any]]:
+        return next((p for p in self.providers if str(p["id"]) == str(provider_id)), None)
+
+    def client(self, client_id: Any) -> Optional[Dict[str, Any]]:
+        return next((c for c in self.clients if str(c["id"]) == str(client_id)), None)
+
+    def booking(self, booking_id: Any) -> Optional[Dict[str, Any]]:
+        return next((b for b in self.bookings if str(b["id"]) == str(booking_id)), None)
+
+    def is_free(self, provider_id: Any, start: datetime, end: datetime,
+                ignore_booking_id: Any = None) -> bool:
+        """Verificar que el proveedor no tenga reservas activas ni notas que bloqueen el horario"""
+        for booking in self._agenda.get((str(provider_id), start.date().isoformat()), []):
+            if booking["status"] == "canceled":
+                continue
+            if ignore_booking_id is not None and str(booking["id"]) == str(ignore_booking_id):
+                continue
+            if parse_datetime(booking["start_datetime"]) < end and start < parse_datetime(booking["end_datetime"]):
+                return False
+        for note in self.notes:
+            if not note.get("time_blocked"):
+                continue
+            if note.get("provider_id") is not None and str(note["provider_id"]) != str(provider_id):
+                continue
+            if parse_datetime(note["start_date_time"]) < end and start < parse_datetime(note["end_date_time"]):
+                return False
+        return True
+
+    def free_slots(self, service_id: Any, provider_id: Any, day: date,
+                   ignore_booking_id: Any = None) -> List[datetime]:
+        """Inicios de turno libres de un proveedor para un servicio en un día"""
+        service = self.service(service_id)
+        provider = self.provider(provider_id)
+        if service is None or provider is None or service["id"] not in provider["services"]:
+            return []
+        duration = timedelta(minutes=service["duration"])
+        return [start for start in day_slots(day, service["duration"])
+                if self.is_free(provider["id"], start, start + duration, ignore_booking_id)]
+
+    def add_booking(self, service_id: Any, provider_id: Any, client_id: Any, start: datetime,
+                    status: str = "confirmed") -> Dict[str, Any]:
+        """Crear una reserva (sin validar disponibilidad)"""
+        service = self.service(service_id)
+        provider = self.provider(provider_id)
+        client = self.client(client_id) or {"id": client_id, "name": "", "email": "", "phone": ""}
+        end = start + timedelta(minutes=service["duration"])
+        booking = {
+            "id": self._next_booking_id,
+            "code": f"SIM{self._next_booking_id:06d}",
+            "status": status,
+            "is_confirmed": status == "confirmed",
+            "start_datetime": format_datetime(start),
+            "end_datetime": format_datetime(end),
+            "duration": service["duration"],
+            "service_id": service["id"],
+            "provider_id": provider["id"],
+            "client_id": client["id"],
+            "location_id": provider["location_id"],
+            "service": {"id": service["id"], "name": service["name"]},
+            "provider": {"id": provider["id"], "name": provider["name"]},
+            "client": {"id": client["id"], "name": client["name"], "email": client["email"], "phone": client["phone"]}
+        }
+        self._next_booking_id += 1
+        self.bookings.append(booking)
+        self._agenda.setdefault(self._agenda_key(booking), []).append(booking)
+        return booking
+
+    def move_booking(self, booking: Dict[str, Any], service_id: Any, provider_id: Any,
+                     start: datetime) -> Dict[str, Any]:
+        """Cambiar servicio, proveedor u horario de una reserva (sin validar disponibilidad)"""
+        service = self.service(service_id)
+        provider = self.provider(provider_id)
+        self._agenda[self._agenda_key(booking)].remove(booking)
+        booking.update({
+            "service_id": service["id"], "provider_id": provider["id"],
+            "location_id": provider["location_id"],
+            "start_datetime": format_datetime(start),
+            "end_datetime": format_datetime(start + timedelta(minutes=service["duration"])),
+            "duration": service["duration"],
+            "service": {"id": service["id"], "name": service["name"]},
+            "provider": {"id": provider["id"], "name": provider["name"]}
+        })
+        self._agenda.setdefault(self._agenda_key(booking), []).append(booking)
+        return booking
+
+    @staticmethod
+    def _agenda_key(booking: Dict[str, Any]) -> tuple:
+        return str(booking["provider_id"]), booking["start_datetime"][:10]
+
+    def _seed_booking(self, days: int) -> None:
+        provider = self.rng.choice(self.providers)
+        service = self.service(self.rng.choice(provider["services"]))
+        day = self.today + timedelta(days=self.rng.randint(-days, days))
+        slots = self.free_slots(service["id"], provider["id"], day)
+        if not slots:
+            return
+        self.add_booking(service["id"], provider["id"], self.rng.choice(self.clients)["id"],
+                         self.rng.choice(slots), self.rng.choice(BOOKING_STATUSES))
@@ -0,0 +1,19 @@
+import pytest
+from src.simplybook.circuit_breaker import circuit_breakers
+from src.simplybook.cache import slot_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_circuit_breakers():
+    """Los circuit breakers son globales: cada test empieza con todos cerrados"""
+    circuit_breakers.reset()
+    yield
+    circuit_breakers.reset()
+
+
+@pytest.fixture(autouse=True)
+def clear_slot_cache():
+    """La cache de turnos es global: ningún test ve turnos cacheados por otro"""
+    slot_cache.clear()
+    yield
+    slot_cache.clear()
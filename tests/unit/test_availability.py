@@ -0,0 +1,167 @@
+import asyncio
+import pytest
+import httpx
+from datetime import date, timedelta
+from fastmcp import FastMCP, Client
+from unittest.mock import AsyncMock, patch
+from src.simplybook.availability import search_providers, split_date_range, earliest_slots, date_horizon
+from src.simplybook.bookings.client import BookingsClient
+from src.simplybook.bookings.routes import BookingsRoutes
+from src.simplybook.rate_limiter import rate_limiter
+from tests.simulator import create_app
+from tests.unit.test_simulator import _login
+
+# Turnos libres por proveedor en el fake de la API
+SLOTS = {
+    "1": ["10:00:00", "12:00:00"],
+    "2": ["09:00:00", "10:00:00"],
+    "3": []
+}
+
+
+def _availability_api(requests):
+    async def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/admin/providers":
+            return httpx.Response(200, json={
+                "data": [{"id": int(pid), "name": f"Proveedor {pid}"} for pid in SLOTS],
+                "metadata": {"pages_count": 1}
+            })
+        provider_id = request.url.params["provider_id"]
+        if provider_id not in SLOTS:
+            return httpx.Response(404, json={"message": "Provider not found"})
+        return httpx.Response(200, json=[{"id": f"2024-06-03 {time}", "date": "2024-06-03", "time": time}
+                                         for time in SLOTS[provider_id]])
+    return httpx.MockTransport(respond)
+
+
+class TestSearchProviders:
+    @pytest.mark.asyncio
+    async def test_merges_sorted_with_concurrency_cap(self):
+        """Los turnos se unen ordenados por horario y nunca hay más consultas que el límite"""
+        running = 0
+        peak = 0
+
+        async def fetch(provider_id: str):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return [{"date": "2024-06-03", "time": f"{10 - int(provider_id):02d}:00:00"}]
+
+        slots, errors = await search_providers(fetch, ["1", "2", "3", "4", "5", "2"], concurrency=2)
+
+        assert peak == 2
+        assert errors == {}
+        assert [slot["provider_id"] for slot in slots] == ["5", "4", "3", "2", "1"]
+
+
+class TestEarliestSlots:
+    @pytest.mark.asyncio
+    async def test_cancels_probes_after_earliest_confirmed(self):
+        """Con los primeros turnos confirmados se cancelan las consultas de días posteriores"""
+        probed = []
+        dates = date_horizon("2024-06-03", 10)
+
+        async def fetch(provider_id: str, day: str):
+            probed.append((provider_id, day))
+            # El proveedor 2 tarda más: el día 1 no se confirma hasta que responde
+            await asyncio.sleep(0.05 if provider_id == "2" else 0.001)
+            if day == dates[0]:
+                return [{"date": day, "time": "15:00:00"}] if provider_id == "1" else []
+            return [{"date": day, "time": f"{8 + int(provider_id):02d}:00:00"}]
+
+        result = await earliest_slots(fetch, ["1", "2"], dates, limit=3, concurrency=4)
+
+        assert [(s["date"], s["time"], s["provider_id"]) for s in result["slots"]] == [
+            (dates[0], "15:00:00", "1"), (dates[1], "09:00:00", "1"), (dates[1], "10:00:00", "2")
+        ]
+        assert result["probes"]["planned"] == 20
+        assert result["probes"]["cancelled"] > 0
+        assert len(probed) < 20
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_stop_the_search(self):
+        """Un error HTTP de una consulta se informa y la búsqueda sigue con el resto"""
+        async def fetch(provider_id: str, day: str):
+            if provider_id == "9":
+                request = httpx.Request("GET", "https://api")
+                raise httpx.HTTPStatusError("boom", request=request, response=httpx.Response(404, request=request))
+            return [{"date": day, "time": "09:00:00"}]
+
+        result = await earliest_slots(fetch, ["9", "1"], date_horizon("2024-06-03", 3), limit=2)
+
+        assert [s["date"] for s in result["slots"]] == ["2024-06-03", "2024-06-04"]
+        assert "9@2024-06-03" in result["errors"]
+
+
+class TestSearchAvailableSlotsTool:
+    @pytest.mark.asyncio
+    async def test_defaults_to_providers_of_the_service(self, monkeypatch):
+        """Sin provider_ids se consultan todos los proveedores del servicio, con atribución"""
+        monkeypatch.setenv("SIMPLYBOOK_CACHE_ENABLED", "false")
+        requests = []
+        shared = httpx.AsyncClient(transport=_availability_api(requests))
+        routes = BookingsRoutes("test_company", "test_login", "test_password", http_client=shared)
+        mcp = FastMCP("test")
+        routes.register_tools(mcp)
+
+        with patch.object(routes, "ensure_authenticated", AsyncMock(return_value=True)), \
+                patch.object(routes, "get_auth_headers", return_value={"X-Token": "t"}):
+            async with Client(mcp) as mcp_client:
+                found = (await mcp_client.call_tool(
+                    "search_available_slots", {"service_id": "7", "date": "2024-06-03"})).data
+                partial = (await mcp_client.call_tool(
+                    "search_available_slots", {"service_id": "7", "date": "2024-06-03", "provider_ids": ["2", "9"]})).data
+        await shared.aclose()
+
+        assert requests[0].url.params["filter[service_id]"] == "7"
+        assert [(s["time"], s["provider_id"]) for s in found["slots"]] == [
+            ("09:00:00", "2"), ("10:00:00", "1"), ("10:00:00", "2"), ("12:00:00", "1")
+        ]
+        assert found["slots"][0]["provider_name"] == "Proveedor 2"
+        assert found["providers"] == ["1", "2", "3"]
+        assert partial["count"] == 2
+        assert partial["errors"] == {"9": "HTTP 404"}
+
+
+class TestAvailabilityRange:
+    def test_split_date_range(self):
+        """Los rangos largos se dividen en ventanas consecutivas sin huecos"""
+        assert split_date_range("2024-06-01", "2024-06-14", 7) == [
+            ("2024-06-01", "2024-06-07"), ("2024-06-08", "2024-06-14")
+        ]
+        assert split_date_range("2024-06-01", "2024-06-01", 7) == [("2024-06-01", "2024-06-01")]
+        with pytest.raises(ValueError):
+            split_date_range("2024-06-10", "2024-06-01")
+
+    @pytest.mark.asyncio
+    async def test_range_matches_per_day_search(self, monkeypatch):
+        """Dos semanas en dos llamadas a /timeline/slots, con los mismos turnos que día por día"""
+        monkeypatch.setenv("SIMPLYBOOK_BASE_URL", "http://simulator")
+        # Las consultas día por día de la comparación no deben esperar al limitador
+        monkeypatch.setattr(rate_limiter, "enabled", False)
+        app = create_app(seed=7, clients=10, bookings=40, days=14)
+        paths = []
+
+        async def record(request: httpx.Request):
+            paths.append(request.url.path)
+
+        shared = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        bookings = BookingsClient(await _login(shared), shared)
+        shared.event_hooks["request"] = [record]
+        provider = app.state.simulator.data.providers[0]
+        service_id = provider["services"][0]
+        first_day = date.today() + timedelta(days=1)
+        days = [(first_day + timedelta(days=offset)).isoformat() for offset in range(14)]
+
+        slots = await bookings.get_available_slots_range(service_id, provider["id"], days[0], days[-1], window_days=7)
+        assert paths == ["/admin/timeline/slots"] * 2
+
+        expected = []
+        for day in days:
+            expected.extend((slot["date"], slot["time"])
+                            for slot in await bookings.get_available_slots(service_id, provider["id"], day))
+        assert [(slot["date"], slot["time"]) for slot in slots] == expected
+        assert expected
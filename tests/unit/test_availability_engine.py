@@ -0,0 +1,99 @@
+import pytest
+import httpx
+from datetime import datetime
+from fastmcp import FastMCP, Client
+from unittest.mock import AsyncMock, patch
+from src.simplybook.availability_engine import AvailabilityEngine, subtract_intervals, calendar_entries
+from src.simplybook.bookings.routes import BookingsRoutes
+from src.simplybook.rate_limiter import rate_limiter
+from tests.simulator import create_app
+from tests.unit.test_simulator import _login
+
+DAY = "2024-06-03"
+
+
+def _at(hour: int, minute: int = 0) -> datetime:
+    return datetime(2024, 6, 3, hour, minute)
+
+
+class TestAvailabilityEngine:
+    def test_subtract_intervals(self):
+        """Los tramos ocupados, superpuestos o no, se quitan de los libres"""
+        free = [(_at(9), _at(17))]
+        busy = [(_at(10), _at(11)), (_at(10, 30), _at(12)), (_at(16), _at(18))]
+        assert subtract_intervals(free, busy) == [(_at(9), _at(10)), (_at(12), _at(16))]
+
+    def test_free_slots(self):
+        """Reservas, notas que bloquean y descansos se restan de la jornada"""
+        engine = AvailabilityEngine()
+        engine.add_work_day(1, {"date": DAY, "time_from": "09:00:00", "time_to": "13:00:00",
+                                "breaks": [{"time_from": "12:00:00", "time_to": "12:30:00"}]})
+        engine.add_work_day(1, {"date": "2024-06-04", "is_day_off": True})
+        engine.add_booking({"provider_id": 1, "start_datetime": f"{DAY} 09:30:00", "end_datetime": f"{DAY} 10:00:00"})
+        engine.add_booking({"provider": {"id": 1}, "status": "canceled",
+                            "start_datetime": f"{DAY} 11:00:00", "end_datetime": f"{DAY} 11:30:00"})
+        engine.add_block({"provider_id": None, "service_id": 2, "time_blocked": True,
+                          "start_date_time": f"{DAY} 10:00:00", "end_date_time": f"{DAY} 11:00:00"})
+
+        assert engine.free_slots(1, DAY, 30, service_id=1) == [
+            "09:00:00", "10:00:00", "10:30:00", "11:00:00", "11:30:00", "12:30:00"
+        ]
+        assert engine.free_slots(1, DAY, 30, service_id=2) == ["09:00:00", "11:00:00", "11:30:00", "12:30:00"]
+        assert engine.free_slots(1, DAY, 60, service_id=1, step=30) == ["10:00:00", "10:30:00", "11:00:00"]
+        assert engine.free_slots(1, "2024-06-04", 30) == []
+
+    def test_work_days_per_service(self):
+        """La jornada cargada para un servicio no se usa para los demás servicios del proveedor"""
+        engine = AvailabilityEngine()
+        engine.add_work_day(1, {"date": DAY, "time_from": "09:00:00", "time_to": "11:00:00"}, service_id=1)
+        engine.add_work_day(1, {"date": DAY, "time_from": "14:00:00", "time_to": "15:00:00",
+                                "breaks": [{"time_from": "14:00:00", "time_to": "14:30:00"}]}, service_id=2)
+
+        assert engine.free_slots(1, DAY, 60, service_id=1) == ["09:00:00", "10:00:00"]
+        assert engine.free_slots(1, DAY, 30, service_id=2) == ["14:30:00"]
+        assert engine.free_slots(1, DAY, 30, service_id=3) == []
+
+    def test_calendar_entries(self):
+        """El calendario puede venir como lista de reservas o con reservas, notas y descansos"""
+        assert calendar_entries([{"id": 1}]) == {"bookings": [{"id": 1}], "notes": None, "breaks": []}
+        assert calendar_entries({"bookings": [], "notes": [{"id": 2}]})["notes"] == [{"id": 2}]
+
+
+class TestComputeAvailabilityTool:
+    @pytest.mark.asyncio
+    async def test_matches_upstream_with_few_calls(self, monkeypatch):
+        """El cálculo local coincide con la API y usa unas pocas consultas en bloque"""
+        monkeypatch.setenv("SIMPLYBOOK_BASE_URL", "http://simulator")
+        monkeypatch.setenv("SIMPLYBOOK_CACHE_ENABLED", "false")
+        monkeypatch.setattr(rate_limiter, "enabled", False)
+        app = create_app(seed=7, clients=10, bookings=120, days=10)
+        shared = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        headers = await _login(shared)
+        paths = []
+
+        async def record(request: httpx.Request):
+            paths.append(request.url.path)
+
+        shared.event_hooks["request"] = [record]
+        routes = BookingsRoutes("sim_company", "admin", "secret", http_client=shared)
+        mcp = FastMCP("test")
+        routes.register_tools(mcp)
+
+        with patch.object(routes, "ensure_authenticated", AsyncMock(return_value=True)), \
+                patch.object(routes, "get_auth_headers", return_value=headers):
+            async with Client(mcp) as mcp_client:
+                result = (await mcp_client.call_tool("compute_availability", {
+                    "date_from": app.state.simulator.data.today.isoformat(), "days": 10,
+                    "include_slots": True, "validate": True, "validate_samples": 40
+                })).data
+
+        services = app.state.simulator.data.services
+        pairs = sum(len(s["providers"]) for s in services)
+        assert result["count"] == 10 * pairs
+        assert result["validation"]["checked"] == 40
+        assert result["validation"]["mismatches"] == []
+        engine_calls = [path for path in paths if path != "/admin/schedule/available-slots"]
+        assert sorted(set(engine_calls)) == ["/admin/calendar", "/admin/calendar-notes", "/admin/schedule", "/admin/services"]
+        # Una jornada por par proveedor/servicio y un solo /calendar para todos
+        assert engine_calls.count("/admin/schedule") == pairs
+        assert engine_calls.count("/admin/calendar") == 1
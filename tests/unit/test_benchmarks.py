@@ -0,0 +1,59 @@
+import json
+import pytest
+from tests.benchmarks import run_benchmarks, compare_results
+from tests.benchmarks.harness import percentile, summarize_latencies, BENCHMARK_ENVIRONMENT
+
+
+def _result(p95: float, rps: float, upstream: float) -> dict:
+    return {"tools": {"get_clients_list": {
+        "latency_ms": {"p50": 10.0, "p95": p95, "p99": p95},
+        "throughput_rps": rps,
+        "upstream_calls_per_tool_call": upstream,
+        "cpu_ms_per_call": 2.0
+    }}}
+
+
+class TestBenchmarks:
+    def test_percentiles(self):
+        """Percentil por rango más cercano"""
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 0.50) == 50.0
+        assert percentile(values, 0.95) == 95.0
+        assert percentile(values, 0.99) == 99.0
+        assert summarize_latencies([3.0, 1.0, 2.0])["max"] == 3.0
+        assert percentile([], 0.5) == 0.0
+
+    def test_compare_detects_regressions(self):
+        """Peor p95, menos req/s o más llamadas a la API cuentan como regresión"""
+        baseline = _result(p95=20.0, rps=100.0, upstream=1.0)
+
+        _, regressions = compare_results(baseline, _result(p95=21.0, rps=98.0, upstream=1.0))
+        assert regressions == []
+
+        _, regressions = compare_results(baseline, _result(p95=30.0, rps=60.0, upstream=2.0))
+        assert [r.split(":")[0] for r in regressions] == [
+            "get_clients_list latency_ms.p95",
+            "get_clients_list latency_ms.p99",
+            "get_clients_list throughput_rps",
+            "get_clients_list upstream_calls_per_tool_call"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_against_canned_fake(self, monkeypatch, tmp_path):
+        """Corrida corta: todas las invocaciones exitosas y una llamada a la API por invocación"""
+        for name, value in BENCHMARK_ENVIRONMENT.items():
+            monkeypatch.setenv(name, value)
+        monkeypatch.setenv("ENABLE_API_LOGGING", "false")
+        monkeypatch.setenv("SIMPLYBOOK_API_LOG_FILE", str(tmp_path / "api.jsonl"))
+        monkeypatch.delenv("SIMPLYBOOK_BASE_URL", raising=False)
+
+        results = await run_benchmarks(tools=["get_clients_list", "get_available_slots"],
+                                       calls=6, concurrency=3, warmup=1)
+
+        for tool, result in results["tools"].items():
+            assert result["errors"] == 0, tool
+            assert result["upstream_calls_per_tool_call"] == 1.0
+            assert result["latency_ms"]["p50"] <= result["latency_ms"]["p99"]
+            assert result["cpu_ms_per_call"] > 0
+        assert results["meta"]["fake"] == "canned"
+        json.dumps(results)
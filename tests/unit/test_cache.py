@@ -0,0 +1,286 @@
+import asyncio
+import httpx
+import pytest
+from src.simplybook.cache import TTLCache, reference_cache, get_ttl, slot_cache
+from src.simplybook.bookings.client import BookingsClient
+from src.simplybook.services.client import ServicesClient
+from src.simplybook.providers.client import ProvidersClient
+from src.simplybook.notes.client import NotesClient
+from src.simplybook.rate_limiter import rate_limiter
+
+
+class TestTTLCache:
+    @pytest.mark.asyncio
+    async def test_hit_and_miss(self):
+        """La segunda lectura se sirve desde cache"""
+        cache = TTLCache(max_entries=10)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {"value": 1}
+
+        assert await cache.get_or_load("k", "services", loader) == {"value": 1}
+        assert await cache.get_or_load("k", "services", loader) == {"value": 1}
+        assert len(calls) == 1
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiry(self):
+        """Una entrada expirada se vuelve a cargar"""
+        cache = TTLCache(max_entries=10)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return len(calls)
+
+        await cache.get_or_load("k", "services", loader, ttl=0.01)
+        await asyncio.sleep(0.02)
+        assert await cache.get_or_load("k", "services", loader, ttl=0.01) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self):
+        """Las lecturas concurrentes de una clave ausente ejecutan un solo loader"""
+        cache = TTLCache(max_entries=10)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "value"
+
+        results = await asyncio.gather(*[cache.get_or_load("k", "services", loader) for _ in range(10)])
+
+        assert results == ["value"] * 10
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_loader_does_not_cancel_waiters(self):
+        """Si se cancela la invocación que carga, las que esperan la misma clave cargan de nuevo"""
+        cache = TTLCache(max_entries=10)
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        first = asyncio.ensure_future(cache.get_or_load("k", "services", loader))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_load("k", "services", loader))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "value"
+        assert first.cancelled()
+        assert len(calls) == 2
+        assert await cache.get_or_load("k", "services", loader) == "value"
+        assert len(calls) == 2
+
+    @pytest.mark.asyncio
+    async def test_waiter_cancellation_keeps_the_load(self):
+        """Cancelar una invocación que espera no afecta la carga en curso"""
+        cache = TTLCache(max_entries=10)
+
+        async def loader():
+            await asyncio.sleep(0.02)
+            return "value"
+
+        first = asyncio.ensure_future(cache.get_or_load("k", "services", loader))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_load("k", "services", loader))
+        await asyncio.sleep(0.005)
+        second.cancel()
+
+        assert await first == "value"
+        assert second.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """Un error del loader no queda en cache"""
+        cache = TTLCache(max_entries=10)
+
+        async def failing():
+            raise ValueError("boom")
+
+        async def loader():
+            return "ok"
+
+        with pytest.raises(ValueError):
+            await cache.get_or_load("k", "services", failing)
+        assert await cache.get_or_load("k", "services", loader) == "ok"
+
+    @pytest.mark.asyncio
+    async def test_lru_bound(self):
+        """La cache no supera max_entries y desaloja la menos usada"""
+        cache = TTLCache(max_entries=2)
+
+        async def loader():
+            return 1
+
+        for key in ("a", "b", "c"):
+            await cache.get_or_load(key, "services", loader)
+
+        assert cache.stats()["entries"] == 2
+        assert "a" not in cache._entries
+
+    def test_ttl_env_override(self, monkeypatch):
+        """El TTL de un grupo se puede sobrescribir por variable de entorno"""
+        monkeypatch.setenv("SIMPLYBOOK_CACHE_TTL_SERVICES", "42")
+        assert get_ttl("services") == 42
+
+
+class TestReferenceDataCaching:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        reference_cache.clear()
+        yield
+        reference_cache.clear()
+
+    @pytest.fixture
+    def shared(self):
+        calls = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            calls.append((request.method, request.url.path))
+            return httpx.Response(200, json=[{"id": 1}])
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client.calls = calls
+        return client
+
+    @pytest.mark.asyncio
+    async def test_services_are_cached(self, shared):
+        """get_services solo consulta la API una vez"""
+        services = ServicesClient({"X-Company-Login": "c1"}, shared)
+
+        await services.get_services()
+        await services.get_services()
+
+        assert shared.calls == [("GET", "/admin/services")]
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_update_provider_invalidates(self, shared):
+        """update_provider invalida la cache de proveedores y la de servicios (que listan sus proveedores)"""
+        providers = ProvidersClient({"X-Company-Login": "c1"}, shared)
+        services = ServicesClient({"X-Company-Login": "c1"}, shared)
+
+        await providers.get_providers()
+        await services.get_services()
+        await providers.update_provider("1", {"name": "x"})
+        await providers.get_providers()
+        await services.get_services()
+
+        assert [c for c in shared.calls if c[0] == "GET"] == [
+            ("GET", "/admin/providers"),
+            ("GET", "/admin/services"),
+            ("GET", "/admin/providers"),
+            ("GET", "/admin/services")
+        ]
+        await shared.aclose()
+
+
+class TestSlotCache:
+    @pytest.fixture
+    def api(self):
+        requests = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            if request.url.path == "/admin/schedule/available-slots":
+                await asyncio.sleep(0.01)
+                day = request.url.params["date"]
+                return httpx.Response(200, json=[{"id": f"{day} 09:00:00", "date": day, "time": "09:00:00"}])
+            if request.method == "DELETE":
+                return httpx.Response(200, json={"id": 5, "provider_id": 2, "start_datetime": "2024-06-03 09:00:00"})
+            return httpx.Response(200, json={"bookings": [{"id": 6, "provider_id": 2, "start_datetime": "2024-06-04 10:00:00"}]})
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        client.requests = requests
+        return client
+
+    def _slot_lookups(self, api) -> list:
+        return [(r.url.params["provider_id"], r.url.params["date"])
+                for r in api.requests if r.url.path == "/admin/schedule/available-slots"]
+
+    @pytest.mark.asyncio
+    async def test_repeated_and_concurrent_lookups(self, api):
+        """Consultas iguales, simultáneas o repetidas, van una sola vez a la API"""
+        bookings = BookingsClient({"X-Company-Login": "c1"}, api)
+
+        await asyncio.gather(*(bookings.get_available_slots(1, 2, "2024-06-03") for _ in range(5)))
+        await bookings.get_available_slots(1, 2, "2024-06-03")
+        await bookings.get_available_slots(1, 2, "2024-06-03", count=2)
+
+        assert self._slot_lookups(api) == [("2", "2024-06-03")] * 2
+        assert slot_cache.stats()["hits"] == 5
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_always_queries(self, api):
+        """Con use_cache=False la consulta va siempre a la API"""
+        bookings = BookingsClient({"X-Company-Login": "c1"}, api)
+
+        await bookings.get_available_slots(1, 2, "2024-06-03")
+        await bookings.get_available_slots(1, 2, "2024-06-03", use_cache=False)
+
+        assert self._slot_lookups(api) == [("2", "2024-06-03")] * 2
+
+    @pytest.mark.asyncio
+    async def test_bookings_invalidate_affected_provider_and_date(self, api):
+        """Crear o cancelar invalida solo el proveedor y la fecha afectados; editar, toda la empresa"""
+        bookings = BookingsClient({"X-Company-Login": "c1"}, api)
+
+        async def lookup_all():
+            for provider_id, day in (("2", "2024-06-03"), ("2", "2024-06-04"), ("3", "2024-06-03")):
+                await bookings.get_available_slots(1, provider_id, day)
+
+        await lookup_all()
+        await bookings.cancel_booking("5")
+        await bookings.create_booking({"provider_id": 2, "start_datetime": "2024-06-04 10:00:00"})
+        await lookup_all()
+        assert self._slot_lookups(api)[3:] == [("2", "2024-06-03"), ("2", "2024-06-04")]
+
+        await bookings.edit_booking("6", {"start_datetime": "2024-06-05 10:00:00"})
+        await lookup_all()
+        assert len(self._slot_lookups(api)) == 8
+
+    @pytest.mark.asyncio
+    async def test_blocking_notes_invalidate_slots(self, api, monkeypatch):
+        """Una nota que bloquea horario invalida su proveedor y fechas; sin proveedor, toda la empresa"""
+        monkeypatch.setattr(rate_limiter, "enabled", False)
+        bookings = BookingsClient({"X-Company-Login": "c1"}, api)
+        notes = NotesClient({"X-Company-Login": "c1"}, api)
+
+        async def lookup_all():
+            for provider_id, day in (("2", "2024-06-03"), ("2", "2024-06-04"), ("3", "2024-06-03")):
+                await bookings.get_available_slots(1, provider_id, day)
+
+        await lookup_all()
+        await notes.create_note({"provider_id": 2, "time_blocked": True,
+                                 "start_date_time": "2024-06-03 12:00:00", "end_date_time": "2024-06-03 13:00:00"})
+        await lookup_all()
+        assert self._slot_lookups(api)[3:] == [("2", "2024-06-03")]
+
+        await notes.create_note({"provider_id": None, "time_blocked": True,
+                                 "start_date_time": "2024-06-04 12:00:00", "end_date_time": "2024-06-04 13:00:00"})
+        await lookup_all()
+        assert len(self._slot_lookups(api)) == 7
+
+        await notes.delete_note("9")
+        await lookup_all()
+        assert len(self._slot_lookups(api)) == 10
+
+    @pytest.mark.asyncio
+    async def test_invalidation_during_lookup(self, api):
+        """Una consulta en curso al reservar no deja en cache turnos desactualizados"""
+        bookings = BookingsClient({"X-Company-Login": "c1"}, api)
+
+        lookup = asyncio.ensure_future(bookings.get_available_slots(1, 2, "2024-06-03"))
+        await asyncio.sleep(0)
+        await bookings.cancel_booking("5")
+        await lookup
+        await bookings.get_available_slots(1, 2, "2024-06-03")
+
+        assert len(self._slot_lookups(api)) == 2
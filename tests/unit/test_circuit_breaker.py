@@ -0,0 +1,149 @@
+import pytest
+import httpx
+from unittest.mock import MagicMock
+from src.simplybook import http_client as http_client_module
+from src.simplybook.circuit_breaker import CircuitBreakerRegistry, endpoint_family, CLOSED, OPEN, HALF_OPEN
+from src.simplybook.exceptions import CircuitOpenError
+from src.simplybook.rate_limiter import AdaptiveRateLimiter
+from src.simplybook.retry import RetryPolicy
+from src.simplybook.http_client import LoggingHTTPClient
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.bookings.routes import BookingsRoutes
+from src.simplybook.health.routes import HealthRoutes
+
+
+@pytest.fixture
+def breakers(monkeypatch):
+    """Circuit breakers aislados, sin limitador ni reintentos"""
+    registry = CircuitBreakerRegistry(enabled=True, failure_threshold=2, recovery_timeout=60)
+    monkeypatch.setattr(http_client_module, "circuit_breakers", registry)
+    monkeypatch.setattr(http_client_module, "rate_limiter", AdaptiveRateLimiter(enabled=False))
+    monkeypatch.setattr(http_client_module, "retry_policy", RetryPolicy(max_attempts=1))
+    return registry
+
+
+def _transport(calls, status=503):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(status, json={})
+    return httpx.MockTransport(handler)
+
+
+class TestCircuitBreaker:
+    def test_endpoint_family(self):
+        """Las URLs se agrupan por familia de endpoints"""
+        assert endpoint_family("https://user-api-v2.simplybook.me/admin/bookings/123/approve") == "/bookings"
+        assert endpoint_family("https://user-api-v2.simplybook.me/admin/schedule?date_from=x") == "/schedule"
+        assert endpoint_family("https://user-api-v2.simplybook.me/admin/auth/refresh-token") == "/admin/auth"
+
+    def test_opens_after_threshold(self):
+        """El circuito se abre tras N fallos consecutivos y rechaza peticiones"""
+        breaker = CircuitBreakerRegistry(enabled=True, failure_threshold=3, recovery_timeout=60).get("/bookings")
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError) as exc_info:
+            breaker.before_request()
+        assert exc_info.value.family == "/bookings"
+        assert exc_info.value.retry_in > 0
+
+    def test_half_open_probe(self):
+        """Pasado el timeout deja salir una prueba; si tiene éxito se cierra"""
+        breaker = CircuitBreakerRegistry(enabled=True, failure_threshold=1, recovery_timeout=0).get("/invoices")
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        breaker.before_request()
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+    def test_failed_probe_reopens(self):
+        """Si la prueba en half-open falla el circuito vuelve a abrirse"""
+        breaker = CircuitBreakerRegistry(enabled=True, failure_threshold=1, recovery_timeout=0).get("/invoices")
+        breaker.record_failure()
+        breaker.before_request()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert breaker.stats()["times_opened"] == 2
+
+
+class TestHTTPClientCircuitBreaker:
+    @pytest.mark.asyncio
+    async def test_fails_fast_when_open(self, breakers):
+        """Con el circuito abierto no se envían peticiones"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_transport(calls))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            await client.get("/bookings")
+            await client.get("/bookings/1")
+            with pytest.raises(CircuitOpenError):
+                await client.get("/bookings")
+            # Otras familias no se ven afectadas
+            await client.get("/invoices")
+
+        assert len(calls) == 3
+        assert breakers.stats()["/bookings"]["state"] == OPEN
+        assert breakers.stats()["/invoices"]["state"] == CLOSED
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_client_errors_do_not_trip(self, breakers):
+        """Los 4xx son errores del cliente y no abren el circuito"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_transport(calls, status=404))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            for _ in range(5):
+                await client.get("/bookings/1")
+
+        assert breakers.stats()["/bookings"]["state"] == CLOSED
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_route_returns_structured_error(self, breakers):
+        """La herramienta devuelve un error estructurado con el circuito abierto"""
+        breakers.get("/bookings").record_failure()
+        breakers.get("/bookings").record_failure()
+
+        mcp = MagicMock()
+        tools = {}
+        mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+        routes = BookingsRoutes("company", "login", "password", token_manager=TokenManager(persist=False))
+        routes.token_manager.set_token("company", "test")
+        routes.register_tools(mcp)
+
+        result = await tools["get_booking_details"]("1")
+
+        assert result["error_type"] == "circuit_open"
+        assert result["endpoint_family"] == "/bookings"
+
+    @pytest.mark.asyncio
+    async def test_status_tool(self, breakers, monkeypatch):
+        """La herramienta de estado informa el estado de cada circuito"""
+        from src.simplybook.health import routes as health_routes
+        monkeypatch.setattr(health_routes, "circuit_breakers", breakers)
+        breakers.get("/schedule").record_failure()
+        breakers.get("/schedule").record_failure()
+
+        mcp = MagicMock()
+        tools = {}
+        mcp.tool.return_value = lambda func: tools.setdefault(func.__name__, func)
+        HealthRoutes().register_tools(mcp)
+
+        result = await tools["get_api_status"]()
+
+        assert result["healthy"] is False
+        assert result["circuit_breakers"]["/schedule"]["state"] == OPEN
+        assert "rate_limiter" in result
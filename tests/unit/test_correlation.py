@@ -0,0 +1,86 @@
+import json
+import pytest
+import httpx
+from unittest.mock import MagicMock
+from fastmcp import FastMCP, Client
+from src.simplybook import http_client as http_client_module
+from src.simplybook import middleware as middleware_module
+from src.simplybook.correlation import new_request_id, tool_call, current_tool_call, REQUEST_ID_HEADER
+from src.simplybook.http_client import LoggingHTTPClient
+from src.simplybook.logger import SimplyBookLogger
+from src.simplybook.middleware import CorrelationMiddleware
+from tests.unit.test_logger import _CollectingHandler
+
+
+class TestRequestIds:
+    def test_ids_are_unique_and_ordered(self):
+        """Los IDs generados en el mismo milisegundo no se repiten y conservan el orden"""
+        ids = [new_request_id() for _ in range(10000)]
+
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+        assert all(len(request_id) == 26 for request_id in ids)
+
+    def test_tool_call_context(self):
+        """El contexto de la invocación solo existe dentro del bloque"""
+        assert current_tool_call() is None
+        with tool_call("get_bookings") as call_id:
+            assert current_tool_call() == {"call_id": call_id, "tool": "get_bookings"}
+        assert current_tool_call() is None
+
+
+class TestRequestIdPropagation:
+    @pytest.mark.asyncio
+    async def test_request_id_sent_upstream_and_logged(self, monkeypatch):
+        """Cada petición lleva su ID en X-Request-ID y el log lo asocia a la herramienta"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_correlation", handlers=[handler])
+        monkeypatch.setattr(http_client_module, "api_logger", api_logger)
+
+        sent = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, json={"ok": True})
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        client = LoggingHTTPClient("https://example.test/admin", {"X-Token": "abc"}, shared)
+        with tool_call("get_bookings") as call_id:
+            await client.get("/bookings")
+            await client.get("/bookings")
+        await shared.aclose()
+        api_logger.close()
+
+        request_ids = [request.headers[REQUEST_ID_HEADER] for request in sent]
+        assert len(set(request_ids)) == 2
+
+        entries = [json.loads(message.split(": ", 1)[1]) for message in handler.messages]
+        assert [entry["request_id"] for entry in entries] == [request_ids[0]] * 2 + [request_ids[1]] * 2
+        assert all(entry["call_id"] == call_id and entry["tool"] == "get_bookings" for entry in entries)
+        # El header de correlación no es sensible: se loggea tal cual
+        assert entries[0]["headers"][REQUEST_ID_HEADER] == request_ids[0]
+        assert entries[0]["headers"]["X-Token"] == "***HIDDEN***"
+
+    @pytest.mark.asyncio
+    async def test_middleware_assigns_call_id(self, monkeypatch):
+        """El middleware abre una invocación por cada llamada a herramienta y registra su duración"""
+        api_logger = MagicMock()
+        monkeypatch.setattr(middleware_module, "api_logger", api_logger)
+
+        mcp = FastMCP("test")
+        mcp.add_middleware(CorrelationMiddleware())
+
+        @mcp.tool()
+        async def whoami() -> dict:
+            return current_tool_call()
+
+        async with Client(mcp) as mcp_client:
+            first = (await mcp_client.call_tool("whoami")).data
+            second = (await mcp_client.call_tool("whoami")).data
+
+        assert first["tool"] == "whoami"
+        assert first["call_id"] != second["call_id"]
+        logged = [call.args for call in api_logger.log_tool_call.call_args_list]
+        assert [(call_id, tool) for call_id, tool, _ in logged] == [
+            (first["call_id"], "whoami"), (second["call_id"], "whoami")
+        ]
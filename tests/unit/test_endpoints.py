@@ -0,0 +1,95 @@
+import pytest
+import httpx
+from src.simplybook.cache import get_ttl
+from src.simplybook.endpoints import (
+    endpoint_name, get_endpoint_policy, policy_for_url, resolve_url, endpoint_url, admin_url
+)
+from src.simplybook.http_client import LoggingHTTPClient, encode_params
+from src.simplybook.providers.client import ProvidersClient
+from src.simplybook.statistics.client import StatisticsClient
+
+API = "https://user-api-v2.simplybook.me"
+
+
+class TestEndpointRegistry:
+    def test_endpoint_name_longest_match(self):
+        """Gana la ruta registrada más específica"""
+        assert endpoint_name(f"{API}/admin/bookings/123/approve") == "bookings"
+        assert endpoint_name(f"{API}/admin/clients/fields") == "client_fields"
+        assert endpoint_name(f"{API}/admin/clients/42") == "clients"
+        assert endpoint_name(f"{API}/admin/calendar-notes/types/default") == "note_types"
+        assert endpoint_name(f"{API}/admin/calendar") == "calendar"
+        assert endpoint_name(f"{API}/admin/auth/refresh-token") == "auth"
+        assert endpoint_name(f"{API}/admin/unknown") is None
+
+    def test_env_overrides(self, monkeypatch):
+        """SIMPLYBOOK_ENDPOINT_<NOMBRE>_<POLÍTICA> sobrescribe el registro"""
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_BOOKINGS_MAX_ATTEMPTS", "1")
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_SERVICES_CACHE_TTL", "not-a-number")
+        assert get_endpoint_policy("bookings")["max_attempts"] == 1
+        assert get_endpoint_policy("services")["cache_ttl"] == 300
+        assert policy_for_url(f"{API}/admin/unknown") == {}
+
+    def test_cache_ttl_from_registry(self, monkeypatch):
+        """El TTL de la cache sale del registro salvo SIMPLYBOOK_CACHE_TTL_<GRUPO>"""
+        monkeypatch.delenv("SIMPLYBOOK_CACHE_TTL_STATUSES", raising=False)
+        assert get_ttl("statuses") == 900
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_STATUSES_CACHE_TTL", "30")
+        assert get_ttl("statuses") == 30
+        assert get_ttl("unregistered") == 300
+
+    def test_base_url_per_endpoint(self, monkeypatch):
+        """Un endpoint puede ir a otro servidor (p. ej. un proxy con cache)"""
+        monkeypatch.delenv("SIMPLYBOOK_BASE_URL", raising=False)
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_SERVICES_BASE_URL", "http://cache-proxy:8080/")
+        assert resolve_url(f"{API}/admin/services/3?x=1") == "http://cache-proxy:8080/admin/services/3?x=1"
+        assert resolve_url(f"{API}/admin/bookings") == f"{API}/admin/bookings"
+        assert endpoint_url("services", "/3") == "http://cache-proxy:8080/admin/services/3"
+        assert admin_url() == f"{API}/admin"
+
+    def test_encode_params(self):
+        """Los filtros anidados usan la notación de corchetes de la API"""
+        assert encode_params({"page": 1, "filter": {"search": "ana", "services": [1, 2], "x": None}}) == {
+            "page": 1, "filter[search]": "ana", "filter[services][0]": 1, "filter[services][1]": 2
+        }
+        assert encode_params({"products": [1, 2]}) == {"products": [1, 2]}
+        assert encode_params(None) is None
+
+
+class TestEndpointPolicies:
+    @pytest.mark.asyncio
+    async def test_max_attempts_per_endpoint(self, monkeypatch):
+        """max_attempts del endpoint limita los reintentos de la política global"""
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_BOOKINGS_MAX_ATTEMPTS", "1")
+        calls = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            return httpx.Response(503)
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        response = await LoggingHTTPClient(f"{API}/admin", {}, shared).get("/bookings")
+        await shared.aclose()
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_clients_use_registry_urls(self, monkeypatch):
+        """Filtros anidados codificados y rutas válidas en clientes que armaban URLs rotas"""
+        monkeypatch.delenv("SIMPLYBOOK_BASE_URL", raising=False)
+        monkeypatch.setenv("SIMPLYBOOK_CACHE_ENABLED", "false")
+        sent = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, json={"data": [], "metadata": {"pages_count": 1}})
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        await ProvidersClient({"X-Token": "t"}, shared).get_providers(service_id="5")
+        await StatisticsClient({"X-Token": "t"}, shared).generate_report({"from": "2024-01-01"})
+        await shared.aclose()
+
+        assert sent[0].url.path == "/admin/providers"
+        assert sent[0].url.params["filter[service_id]"] == "5"
+        assert str(sent[1].url) == f"{API}/admin/detailed-report"
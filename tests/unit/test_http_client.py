@@ -0,0 +1,71 @@
+import pytest
+import httpx
+from src.simplybook.http_client import LoggingHTTPClient, create_http_client, get_pool_config
+from src.simplybook.bookings.client import BookingsClient
+
+
+def _mock_transport(calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"ok": True})
+    return httpx.MockTransport(handler)
+
+
+class TestSharedHTTPClient:
+    def test_pool_config_from_env(self, monkeypatch):
+        """Test de lectura de la configuración del pool desde variables de entorno"""
+        monkeypatch.setenv("SIMPLYBOOK_MAX_CONNECTIONS", "7")
+        monkeypatch.setenv("SIMPLYBOOK_MAX_KEEPALIVE_CONNECTIONS", "3")
+        monkeypatch.setenv("SIMPLYBOOK_HTTP2", "false")
+
+        config = get_pool_config()
+
+        assert config["max_connections"] == 7
+        assert config["max_keepalive_connections"] == 3
+        assert config["http2"] is False
+
+    @pytest.mark.asyncio
+    async def test_create_http_client(self, monkeypatch):
+        """Test de creación del pool compartido"""
+        monkeypatch.setenv("SIMPLYBOOK_HTTP2", "false")
+        client = create_http_client()
+        try:
+            assert isinstance(client, httpx.AsyncClient)
+        finally:
+            await client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_shared_client_is_not_closed(self):
+        """El pool compartido sobrevive al contexto de LoggingHTTPClient"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_mock_transport(calls))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            response = await client.get("/bookings")
+            assert response.status_code == 200
+
+        assert not shared.is_closed
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_own_client_is_closed(self):
+        """Sin pool compartido el cliente propio se cierra al salir del contexto"""
+        client = LoggingHTTPClient("https://example.test/admin", {})
+        async with client:
+            pass
+
+        assert client.client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_clients_reuse_shared_pool(self):
+        """Varias llamadas de un cliente de datos reutilizan el mismo pool"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_mock_transport(calls))
+        bookings = BookingsClient({"X-Token": "test"}, shared)
+
+        await bookings.get_booking_details("1")
+        await bookings.get_booking_details("2")
+
+        assert len(calls) == 2
+        assert not shared.is_closed
+        await shared.aclose()
@@ -0,0 +1,251 @@
+import gzip
+import json
+import logging
+import threading
+import time
+import pytest
+from src.simplybook.logger import SimplyBookLogger, JsonLinesFormatter, CompressingRotatingFileHandler, LOG_MODES
+
+
+class _CollectingHandler(logging.Handler):
+    """Handler que guarda los mensajes formateados (y opcionalmente es lento)"""
+
+    def __init__(self, delay: float = 0.0, gate: threading.Event = None):
+        super().__init__()
+        self.messages = []
+        self.threads = []
+        self.delay = delay
+        self.gate = gate
+
+    def emit(self, record):
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        self.threads.append(threading.current_thread().name)
+        self.messages.append(self.format(record))
+
+
+class TestSimplyBookLogger:
+    def test_single_line_json(self):
+        """Cada entrada se escribe en una sola línea con JSON compacto"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_single_line", handlers=[handler])
+
+        request_id = api_logger.log_request("GET", "https://example.test/bookings", {}, params={"page": 1})
+        api_logger.log_response(request_id, 200, {"data": [1, 2]}, duration_ms=12.5)
+        api_logger.flush()
+        api_logger.close()
+
+        assert len(handler.messages) == 2
+        assert all("\n" not in message for message in handler.messages)
+        request = json.loads(handler.messages[0].split(": ", 1)[1])
+        assert request["params"] == {"page": 1}
+        response = json.loads(handler.messages[1].split(": ", 1)[1])
+        assert response["response_data"] == {"data": [1, 2]}
+
+    def test_writes_in_background_thread(self):
+        """El log no espera al handler: la escritura ocurre en otro hilo"""
+        gate = threading.Event()
+        handler = _CollectingHandler(gate=gate)
+        api_logger = SimplyBookLogger(name="test_api_background", handlers=[handler])
+
+        start = time.monotonic()
+        for _ in range(20):
+            api_logger.log_request("GET", "https://example.test/bookings", {})
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 1
+        assert handler.messages == []
+        gate.set()
+        api_logger.flush()
+        api_logger.close()
+
+        assert len(handler.messages) == 20
+        assert threading.current_thread().name not in handler.threads
+
+    def test_bounded_queue_drops(self):
+        """Con la cola llena las entradas se descartan y se cuentan"""
+        gate = threading.Event()
+        handler = _CollectingHandler(gate=gate)
+        api_logger = SimplyBookLogger(name="test_api_drops", handlers=[handler], queue_size=2)
+
+        for _ in range(10):
+            api_logger.log_error("req_1", "boom")
+
+        stats = api_logger.stats()
+        assert stats["dropped"] >= 7
+        assert stats["enqueued"] + stats["dropped"] == 10
+        gate.set()
+        api_logger.close()
+
+
+def _logged_response(api_logger, handler, body, url="https://example.test/admin/bookings", status_code=200):
+    api_logger.log_response("req_1", status_code, duration_ms=1.0, url=url, body=body,
+                            response_headers={"Content-Type": "application/json", "Set-Cookie": "secret"})
+    api_logger.flush()
+    return json.loads(handler.messages[-1].split(": ", 1)[1])
+
+
+def _mode_config(mode="full", overrides=None, max_body_bytes=10, sample_rate=3):
+    return {"mode": mode, "overrides": overrides or {}, "max_body_bytes": max_body_bytes, "sample_rate": sample_rate}
+
+
+class TestLogModes:
+    def test_full_mode_decodes_in_writer(self):
+        """En modo full el cuerpo se decodifica y sanitiza al escribir"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_mode_full", handlers=[handler], mode_config=_mode_config())
+
+        entry = _logged_response(api_logger, handler, b'{"id": 1, "token": "abc"}')
+        api_logger.close()
+
+        assert entry["response_data"] == {"id": 1, "token": "***HIDDEN***"}
+        assert entry["response_headers"]["Set-Cookie"] == "***HIDDEN***"
+
+    def test_truncated_mode(self):
+        """En modo truncated solo se guardan los primeros N bytes"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_mode_truncated", handlers=[handler],
+                                      mode_config=_mode_config(mode="truncated"))
+
+        entry = _logged_response(api_logger, handler, b'{"data": [1, 2, 3, 4, 5, 6]}')
+        api_logger.close()
+
+        assert entry["response_body"] == '{"data": ['
+        assert entry["truncated"] is True
+        assert "response_data" not in entry
+
+    def test_headers_mode_override_per_endpoint(self):
+        """El modo se puede configurar por familia de endpoints"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_mode_override", handlers=[handler],
+                                      mode_config=_mode_config(overrides={"/calendar": "headers"}))
+
+        calendar = _logged_response(api_logger, handler, b'{"big": true}', url="https://example.test/admin/calendar?x=1")
+        bookings = _logged_response(api_logger, handler, b'{"id": 1}')
+        error = _logged_response(api_logger, handler, b'{"message": "boom"}',
+                                 url="https://example.test/admin/calendar", status_code=500)
+        api_logger.close()
+
+        assert calendar["log_mode"] == "headers"
+        assert "response_body" not in calendar and "response_data" not in calendar
+        assert calendar["response_size"] == len(b'{"big": true}')
+        assert bookings["response_data"] == {"id": 1}
+        # Los errores conservan al menos el cuerpo truncado
+        assert error["log_mode"] == "truncated"
+
+    def test_sampled_mode(self):
+        """En modo sampled se guarda el cuerpo completo 1 de cada N"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_mode_sampled", handlers=[handler],
+                                      mode_config=_mode_config(mode="sampled", sample_rate=3))
+
+        modes = [_logged_response(api_logger, handler, b'{"id": 1}')["log_mode"] for _ in range(6)]
+        api_logger.close()
+
+        assert modes == ["headers", "headers", "full", "headers", "headers", "full"]
+
+    def test_sensitive_request_headers_hidden(self):
+        """Los headers sensibles se ocultan sin importar mayúsculas"""
+        api_logger = SimplyBookLogger(name="test_api_headers", handlers=[_CollectingHandler()])
+        safe = api_logger._sanitize_headers({"X-Token": "abc", "X-Company-Login": "acme", "Accept": "json"})
+        api_logger.close()
+
+        assert safe == {"X-Token": "***HIDDEN***", "X-Company-Login": "***HIDDEN***", "Accept": "json"}
+
+    def test_refresh_token_hidden(self):
+        """El refresh_token se oculta en el cuerpo del request y en las respuestas en modo full"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name="test_api_refresh_token", handlers=[handler], mode_config=_mode_config())
+
+        api_logger.log_request("POST", "https://example.test/admin/auth/refresh-token", {},
+                               data={"company": "acme", "refresh_token": "REFRESH456"})
+        entry = _logged_response(api_logger, handler, b'{"token": "SECRET123", "refresh_token": "REFRESH456"}',
+                                 url="https://example.test/admin/auth/refresh-token")
+        api_logger.close()
+
+        assert "REFRESH456" not in handler.messages[0]
+        assert entry["response_data"] == {"token": "***HIDDEN***", "refresh_token": "***HIDDEN***"}
+
+    @pytest.mark.parametrize("mode", LOG_MODES)
+    def test_auth_tokens_never_logged(self, mode):
+        """Ningún modo escribe el token ni el refresh_token de las respuestas de auth"""
+        handler = _CollectingHandler()
+        api_logger = SimplyBookLogger(name=f"test_api_auth_{mode}", handlers=[handler],
+                                      mode_config=_mode_config(mode=mode, max_body_bytes=4096, sample_rate=1))
+
+        body = b'{"token": "SECRET123", "refresh_token": "REFRESH456", "company": "acme"}'
+        for url in ("https://example.test/admin/auth", "https://example.test/admin/auth/refresh-token"):
+            _logged_response(api_logger, handler, body, url=url)
+        api_logger.close()
+
+        assert len(handler.messages) == 2
+        assert not any("SECRET123" in message or "REFRESH456" in message for message in handler.messages)
+
+
+def _jsonl_handler(path, **kwargs) -> CompressingRotatingFileHandler:
+    handler = CompressingRotatingFileHandler(str(path), **kwargs)
+    handler.setFormatter(JsonLinesFormatter())
+    return handler
+
+
+class TestJsonLinesFile:
+    def test_entries_are_json_lines(self, tmp_path):
+        """Cada entrada es un objeto JSON por línea con su tipo de evento"""
+        path = tmp_path / "api.jsonl"
+        api_logger = SimplyBookLogger(name="test_api_jsonl", handlers=[_jsonl_handler(path)])
+
+        request_id = api_logger.log_request("GET", "https://example.test/admin/bookings", {"X-Token": "abc"})
+        api_logger.log_response(request_id, 200, duration_ms=12.5, body=b'{"id": 1}')
+        api_logger.log_error(request_id, "boom")
+        api_logger.close()
+
+        entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [entry["event"] for entry in entries] == ["request", "response", "error"]
+        assert entries[0]["level"] == "INFO"
+        assert entries[2]["level"] == "ERROR"
+        assert all(entry["request_id"] == request_id for entry in entries)
+
+    def test_rotation_by_size_compresses_segments(self, tmp_path):
+        """Al superar el tamaño se rota y el segmento anterior queda comprimido"""
+        path = tmp_path / "api.jsonl"
+        api_logger = SimplyBookLogger(name="test_api_rotate_size",
+                                      handlers=[_jsonl_handler(path, max_bytes=200, backups=3)])
+
+        for i in range(10):
+            api_logger.log_error(f"req_{i}", "x" * 100)
+        api_logger.close()
+
+        with gzip.open(f"{path}.1.gz", "rt", encoding="utf-8") as f:
+            rotated = [json.loads(line) for line in f]
+        assert rotated and all(entry["event"] == "error" for entry in rotated)
+        assert path.stat().st_size < 400
+
+    def test_retention_cap(self, tmp_path):
+        """Solo se conservan los últimos `backups` segmentos rotados"""
+        path = tmp_path / "api.jsonl"
+        api_logger = SimplyBookLogger(name="test_api_retention",
+                                      handlers=[_jsonl_handler(path, max_bytes=50, backups=2)])
+
+        for i in range(10):
+            api_logger.log_error(f"req_{i}", "x" * 100)
+        api_logger.close()
+
+        segments = sorted(p.name for p in tmp_path.iterdir())
+        assert segments == ["api.jsonl", "api.jsonl.1.gz", "api.jsonl.2.gz"]
+
+    def test_rotation_by_time(self, tmp_path):
+        """Pasado el intervalo se rota aunque el archivo sea pequeño"""
+        path = tmp_path / "api.jsonl"
+        handler = _jsonl_handler(path, rotate_interval=3600, backups=3)
+        api_logger = SimplyBookLogger(name="test_api_rotate_time", handlers=[handler])
+
+        api_logger.log_error("req_1", "antes")
+        api_logger.flush()
+        handler._rollover_at = time.time() - 1
+        api_logger.log_error("req_2", "después")
+        api_logger.close()
+
+        with gzip.open(f"{path}.1.gz", "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["request_id"] == "req_1"
+        assert json.loads(path.read_text(encoding="utf-8"))["request_id"] == "req_2"
@@ -0,0 +1,129 @@
+import pytest
+import httpx
+from fastmcp import FastMCP, Client
+from src.simplybook import http_client as http_client_module
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.health.metrics import register_metrics_route, pool_stats
+from src.simplybook.http_client import LoggingHTTPClient
+from src.simplybook.metrics import (
+    MetricsRegistry, metrics, upstream_request_duration, tool_duration, auth_refreshes, CONTENT_TYPE
+)
+from src.simplybook.middleware import CorrelationMiddleware
+from src.simplybook.rate_limiter import AdaptiveRateLimiter
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    metrics.clear()
+    yield
+    metrics.clear()
+
+
+class TestMetricsRegistry:
+    def test_histogram_text_format(self):
+        """Los buckets son acumulativos y terminan en +Inf con la suma y el total"""
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latencia", ("endpoint",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, endpoint="/bookings")
+        histogram.observe(0.5, endpoint="/bookings")
+        histogram.observe(3.0, endpoint="/bookings")
+
+        lines = registry.render().splitlines()
+
+        assert "# TYPE latency_seconds histogram" in lines
+        assert 'latency_seconds_bucket{endpoint="/bookings",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{endpoint="/bookings",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{endpoint="/bookings",le="+Inf"} 3' in lines
+        assert 'latency_seconds_sum{endpoint="/bookings"} 3.55' in lines
+        assert 'latency_seconds_count{endpoint="/bookings"} 3' in lines
+
+    def test_counter_and_collected_metrics(self):
+        """Los contadores y las métricas calculadas se renderizan con etiquetas escapadas"""
+        registry = MetricsRegistry()
+        counter = registry.counter("events_total", "Eventos", ("kind",))
+        counter.inc(kind='say "hi"')
+        counter.inc(2, kind='say "hi"')
+
+        text = registry.render([("queue_depth", "gauge", "Cola", [({}, 4)])])
+
+        assert 'events_total{kind="say \\"hi\\""} 3' in text
+        assert "# TYPE queue_depth gauge\nqueue_depth 4" in text
+
+    def test_wrong_labels_rejected(self):
+        """Observar con etiquetas distintas a las declaradas es un error"""
+        with pytest.raises(ValueError):
+            upstream_request_duration.observe(1.0, endpoint="/bookings")
+
+
+class TestInstrumentation:
+    @pytest.mark.asyncio
+    async def test_upstream_duration_per_endpoint_and_status(self, monkeypatch):
+        """Cada petición se mide por familia de endpoints, método y estado"""
+        monkeypatch.setattr(http_client_module, "rate_limiter", AdaptiveRateLimiter(enabled=False))
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(404 if request.url.path.endswith("/missing") else 200, json={})
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        client = LoggingHTTPClient("https://example.test/admin", {}, shared)
+        await client.get("/bookings/1")
+        await client.get("/bookings/2")
+        await client.get("/clients/missing")
+        await shared.aclose()
+
+        assert upstream_request_duration.count(endpoint="/bookings", method="GET", status="200") == 2
+        assert upstream_request_duration.count(endpoint="/clients", method="GET", status="404") == 1
+
+    @pytest.mark.asyncio
+    async def test_auth_refresh_counts(self):
+        """Cada obtención de token se cuenta por motivo y resultado"""
+        manager = TokenManager(persist=False)
+
+        async def login():
+            manager.set_token("metrics_company", "token_1")
+
+        async def failed_login():
+            return {"error": "Credenciales inválidas"}
+
+        await manager.get_or_authenticate("metrics_company", login)
+        await manager.reauthenticate("metrics_company", "token_1", failed_login)
+
+        assert auth_refreshes.value(reason="login", result="success") == 1
+        assert auth_refreshes.value(reason="token_rejected", result="failure") == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self):
+        """GET /metrics devuelve latencia por herramienta y el estado de los componentes"""
+        mcp = FastMCP("test")
+        mcp.add_middleware(CorrelationMiddleware())
+
+        @mcp.tool()
+        async def ping() -> str:
+            return "pong"
+
+        shared = httpx.AsyncClient()
+        register_metrics_route(mcp, shared)
+
+        async with Client(mcp) as mcp_client:
+            await mcp_client.call_tool("ping")
+        assert tool_duration.count(tool="ping", outcome="success") == 1
+
+        app = mcp.http_app(transport="sse")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp") as http:
+            response = await http.get("/metrics")
+        await shared.aclose()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == CONTENT_TYPE
+        assert 'simplybook_tool_duration_seconds_count{tool="ping",outcome="success"} 1' in response.text
+        for name in ("simplybook_cache_hit_ratio", "simplybook_rate_limiter_queue_depth",
+                     "simplybook_pool_utilization", "simplybook_auth_refresh_total"):
+            assert f"# TYPE {name} " in response.text
+
+    def test_pool_stats(self):
+        """El uso del pool se lee del pool de conexiones de httpcore"""
+        client = httpx.AsyncClient(limits=httpx.Limits(max_connections=7))
+
+        stats = pool_stats(client)
+
+        assert stats == {"connections": 0, "active": 0, "idle": 0, "queued": 0, "max_connections": 7}
@@ -0,0 +1,204 @@
+import asyncio
+import pytest
+import httpx
+from src.simplybook.pagination import iter_items, collect_items, split_page, fetch_all_pages, lookahead_limit, limited_result
+from src.simplybook.bookings.client import BookingsClient
+from src.simplybook.clients.client import ClientsClient
+
+
+def _paged_transport(calls, total, on_page, with_metadata=True):
+    pages_count = (total + on_page - 1) // on_page
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        page = int(request.url.params.get("page", 1))
+        start = (page - 1) * on_page
+        data = [{"id": i} for i in range(start, min(start + on_page, total))]
+        if not with_metadata:
+            return httpx.Response(200, json=data)
+        return httpx.Response(200, json={
+            "data": data,
+            "metadata": {"items_count": total, "pages_count": pages_count, "page": page, "on_page": on_page}
+        })
+    return httpx.MockTransport(handler)
+
+
+class TestPagination:
+    def test_split_page(self):
+        """Test de separación de elementos y metadata"""
+        assert split_page({"data": [1, 2], "metadata": {"pages_count": 3}}) == ([1, 2], 3)
+        assert split_page([1, 2]) == ([1, 2], None)
+        assert split_page(None) == ([], None)
+
+    @pytest.mark.asyncio
+    async def test_iter_bookings_all_pages(self):
+        """Recorre todas las páginas según metadata.pages_count"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_paged_transport(calls, total=25, on_page=10))
+        bookings = BookingsClient({"X-Token": "test"}, shared)
+
+        items = await collect_items(bookings.iter_bookings(on_page=10, status="confirmed"))
+
+        assert [item["id"] for item in items] == list(range(25))
+        assert len(calls) == 3
+        assert all(call.url.params["filter[status]"] == "confirmed" for call in calls)
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_max_items_stops_fetching(self):
+        """Con max_items no se piden páginas que no se van a usar"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_paged_transport(calls, total=100, on_page=10))
+        bookings = BookingsClient({"X-Token": "test"}, shared)
+
+        items = await collect_items(bookings.iter_bookings(on_page=10, max_items=15))
+
+        assert len(items) == 15
+        assert len(calls) == 2
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_without_metadata_stops_on_short_page(self):
+        """Sin metadata se detiene al recibir una página incompleta"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_paged_transport(calls, total=12, on_page=5, with_metadata=False))
+        bookings = BookingsClient({"X-Token": "test"}, shared)
+
+        items = await collect_items(bookings.iter_bookings(on_page=5))
+
+        assert len(items) == 12
+        assert len(calls) == 3
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_prefetch_next_page(self):
+        """La página siguiente se pide mientras se consume la actual"""
+        requested = []
+        release = asyncio.Event()
+
+        async def fetch_page(page):
+            requested.append(page)
+            if page == 2:
+                await release.wait()
+            return {"data": [page], "metadata": {"pages_count": 2}}
+
+        iterator = iter_items(fetch_page)
+        first = await iterator.__anext__()
+        await asyncio.sleep(0)
+
+        assert first == 1
+        assert requested == [1, 2]
+        release.set()
+        assert await iterator.__anext__() == 2
+        await iterator.aclose()
+
+
+class TestParallelPages:
+    @pytest.mark.asyncio
+    async def test_fetch_all_preserves_order(self):
+        """Las páginas llegan desordenadas pero el resultado conserva el orden"""
+        async def fetch_page(page):
+            # Las primeras páginas tardan más que las últimas
+            await asyncio.sleep(0.01 * (6 - page))
+            return {"data": [page * 10, page * 10 + 1], "metadata": {"pages_count": 5}}
+
+        items = await fetch_all_pages(fetch_page, on_page=2)
+
+        assert items == [10, 11, 20, 21, 30, 31, 40, 41, 50, 51]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No se descargan más páginas a la vez que el límite configurado"""
+        active = 0
+        peak = 0
+
+        async def fetch_page(page):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"data": [page], "metadata": {"pages_count": 10}}
+
+        items = await fetch_all_pages(fetch_page, on_page=1, concurrency=3)
+
+        assert items == list(range(1, 11))
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_max_items_limits_pages(self):
+        """Con max_items solo se piden las páginas necesarias"""
+        requested = []
+
+        async def fetch_page(page):
+            requested.append(page)
+            return {"data": list(range((page - 1) * 10, page * 10)), "metadata": {"pages_count": 50}}
+
+        items = await fetch_all_pages(fetch_page, on_page=10, max_items=25)
+
+        assert items == list(range(25))
+        assert sorted(requested) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("max_items", [5, 15])
+    async def test_max_items_without_metadata(self, max_items):
+        """Sin pages_count también se respeta max_items, aunque sea menor que la página"""
+        requested = []
+
+        async def fetch_page(page):
+            requested.append(page)
+            return list(range((page - 1) * 10, page * 10))
+
+        items = await fetch_all_pages(fetch_page, on_page=10, max_items=max_items)
+
+        assert items == list(range(max_items))
+        assert requested == ([1] if max_items < 10 else [1, 2])
+
+    @pytest.mark.asyncio
+    async def test_error_cancels_pending_pages(self):
+        """Un error en una página cancela las descargas pendientes"""
+        cancelled = []
+
+        async def fetch_page(page):
+            if page == 2:
+                raise RuntimeError("boom")
+            if page > 2:
+                try:
+                    await asyncio.sleep(1)
+                except asyncio.CancelledError:
+                    cancelled.append(page)
+                    raise
+            return {"data": [page], "metadata": {"pages_count": 4}}
+
+        with pytest.raises(RuntimeError):
+            await fetch_all_pages(fetch_page, on_page=1, concurrency=4)
+
+        assert sorted(cancelled) == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_fetch_all_clients(self):
+        """ClientsClient descarga todas las páginas en paralelo"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_paged_transport(calls, total=45, on_page=10))
+        clients = ClientsClient({"X-Token": "test"}, shared)
+
+        items = await clients.fetch_all_clients(search="ana", on_page=10)
+
+        assert [item["id"] for item in items] == list(range(45))
+        assert len(calls) == 5
+        assert all(call.url.params["filter[search]"] == "ana" for call in calls)
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("total,truncated", [(20, False), (21, True)])
+    async def test_truncated_only_when_items_left(self, total, truncated):
+        """truncated solo se informa si quedaron elementos fuera del límite"""
+        shared = httpx.AsyncClient(transport=_paged_transport([], total=total, on_page=10))
+        clients = ClientsClient({"X-Token": "test"}, shared)
+
+        items = await clients.fetch_all_clients(on_page=10, max_items=lookahead_limit(20))
+        result = limited_result(items, 20)
+
+        assert result["count"] == 20
+        assert result["truncated"] is truncated
+        await shared.aclose()
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import pytest
+import httpx
+from src.simplybook import http_client as http_client_module
+from src.simplybook.rate_limiter import AdaptiveRateLimiter, parse_retry_after
+from src.simplybook.retry import RetryPolicy
+from src.simplybook.http_client import LoggingHTTPClient
+
+
+class TestAdaptiveRateLimiter:
+    @pytest.mark.asyncio
+    async def test_burst_then_throttle(self):
+        """Tras agotar el burst las peticiones esperan según la tasa"""
+        limiter = AdaptiveRateLimiter(rate=20, burst=2, enabled=True)
+
+        start = time.monotonic()
+        for _ in range(4):
+            await limiter.acquire()
+        elapsed = time.monotonic() - start
+
+        # 2 inmediatas + 2 a 20 req/s = ~0.1 s
+        assert elapsed >= 0.08
+        assert limiter.stats()["requests"] == 4
+        assert limiter.stats()["waits"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_queue_depth(self):
+        """La profundidad de cola refleja las peticiones esperando"""
+        limiter = AdaptiveRateLimiter(rate=10, burst=1, enabled=True)
+        await limiter.acquire()
+
+        tasks = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert limiter.stats()["queue_depth"] == 3
+
+        await asyncio.gather(*tasks)
+        assert limiter.stats()["queue_depth"] == 0
+
+    def test_429_halves_rate(self):
+        """Un 429 reduce la tasa a la mitad y una ráfaga cuenta una sola vez"""
+        limiter = AdaptiveRateLimiter(rate=8, burst=8, min_rate=1, enabled=True)
+
+        limiter.observe(httpx.Response(429))
+        limiter.observe(httpx.Response(429))
+
+        assert limiter.rate == 4
+        assert limiter.stats()["throttled"] == 2
+
+    def test_token_403_does_not_throttle(self):
+        """Un 403 por token inválido no es un límite de peticiones"""
+        limiter = AdaptiveRateLimiter(rate=8, enabled=True)
+
+        limiter.observe(httpx.Response(403, text="Invalid token"))
+        assert limiter.rate == 8
+
+        limiter.observe(httpx.Response(403, text="Too many requests"))
+        assert limiter.rate == 4
+
+    def test_recovers_on_success(self):
+        """Las respuestas exitosas recuperan la tasa hasta la configurada"""
+        limiter = AdaptiveRateLimiter(rate=4, min_rate=1, recovery=1, enabled=True)
+        limiter.throttle()
+        assert limiter.rate == 2
+
+        for _ in range(5):
+            limiter.observe(httpx.Response(200))
+        assert limiter.rate == 4
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses(self):
+        """Retry-After pausa todas las peticiones"""
+        limiter = AdaptiveRateLimiter(rate=100, burst=10, enabled=True)
+        limiter.observe(httpx.Response(429, headers={"Retry-After": "0.1"}))
+
+        start = time.monotonic()
+        await limiter.acquire()
+        assert time.monotonic() - start >= 0.09
+
+    def test_parse_retry_after(self):
+        """Retry-After en segundos o fecha HTTP"""
+        assert parse_retry_after("3") == 3.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("invalid") is None
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_http_client_uses_global_limiter(self, monkeypatch):
+        """LoggingHTTPClient pasa todas las peticiones por el limitador global"""
+        limiter = AdaptiveRateLimiter(rate=100, burst=100, enabled=True)
+        monkeypatch.setattr(http_client_module, "rate_limiter", limiter)
+        monkeypatch.setattr(http_client_module, "retry_policy", RetryPolicy(max_attempts=1))
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(429)))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            await client.get("/bookings")
+            await client.post("/bookings", json={})
+
+        assert limiter.stats()["requests"] == 2
+        assert limiter.stats()["throttled"] == 2
+        await shared.aclose()
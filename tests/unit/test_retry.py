@@ -0,0 +1,135 @@
+import time
+import pytest
+import httpx
+from src.simplybook import http_client as http_client_module
+from src.simplybook.retry import RetryPolicy
+from src.simplybook.rate_limiter import AdaptiveRateLimiter
+from src.simplybook.http_client import LoggingHTTPClient
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    """Política rápida y limitador deshabilitado para no esperar en los tests"""
+    policy = RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01, max_elapsed=5,
+                         budget_ratio=0.2, budget_max=10)
+    monkeypatch.setattr(http_client_module, "retry_policy", policy)
+    monkeypatch.setattr(http_client_module, "rate_limiter", AdaptiveRateLimiter(enabled=False))
+    return policy
+
+
+def _flaky_transport(calls, failures, status=503, error=None):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            if error is not None:
+                raise error("boom", request=request)
+            return httpx.Response(status)
+        return httpx.Response(200, json={"ok": True})
+    return httpx.MockTransport(handler)
+
+
+class TestRetryPolicy:
+    def test_backoff_is_bounded(self):
+        """El backoff con jitter nunca supera max_delay"""
+        policy = RetryPolicy(base_delay=1, max_delay=4)
+        for attempt in range(10):
+            assert 0 <= policy.backoff(attempt) <= min(4, 2 ** attempt)
+
+    def test_non_idempotent_status_not_retried(self):
+        """Un POST con 503 no se reintenta"""
+        policy = RetryPolicy(max_attempts=3)
+        started = time.monotonic()
+        assert policy.retry_delay(0, started, False, response=httpx.Response(503)) is None
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is not None
+
+    def test_client_errors_not_retried(self):
+        """Los 4xx (salvo 429) no se reintentan"""
+        policy = RetryPolicy(max_attempts=3)
+        assert policy.retry_delay(0, time.monotonic(), True, response=httpx.Response(404)) is None
+
+    def test_max_elapsed(self):
+        """No se reintenta si se superaría el tiempo máximo"""
+        policy = RetryPolicy(max_attempts=5, max_elapsed=1)
+        started = time.monotonic() - 2
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is None
+
+    def test_retry_budget(self):
+        """El presupuesto limita los reintentos a una fracción de las peticiones"""
+        policy = RetryPolicy(max_attempts=3, base_delay=0, budget_ratio=0.5, budget_max=2)
+        started = time.monotonic()
+
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is not None
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is not None
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is None
+        assert policy.stats()["budget_exhausted"] == 1
+
+        policy.record_request()
+        policy.record_request()
+        assert policy.retry_delay(0, started, True, response=httpx.Response(503)) is not None
+
+
+class TestHTTPClientRetries:
+    @pytest.mark.asyncio
+    async def test_get_retried_on_5xx(self, policy):
+        """Un GET que recibe 503 se reintenta hasta obtener respuesta"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_flaky_transport(calls, failures=2))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            response = await client.get("/bookings")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, policy):
+        """Tras max_attempts se devuelve la última respuesta"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_flaky_transport(calls, failures=5))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            response = await client.get("/bookings")
+
+        assert response.status_code == 503
+        assert len(calls) == 3
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_post_not_retried(self, policy):
+        """Un POST no se repite ante 5xx para no duplicar efectos"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_flaky_transport(calls, failures=1))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            response = await client.post("/bookings", json={})
+
+        assert response.status_code == 503
+        assert len(calls) == 1
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_post_retried_on_connect_error(self, policy):
+        """Si la conexión falla la petición no se envió y un POST sí se reintenta"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_flaky_transport(calls, failures=1, error=httpx.ConnectError))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            response = await client.post("/bookings", json={})
+
+        assert response.status_code == 200
+        assert len(calls) == 2
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_read_error_on_post_raises(self, policy):
+        """Un error de lectura en un POST no se reintenta"""
+        calls = []
+        shared = httpx.AsyncClient(transport=_flaky_transport(calls, failures=1, error=httpx.ReadError))
+
+        async with LoggingHTTPClient("https://example.test/admin", {}, shared) as client:
+            with pytest.raises(httpx.ReadError):
+                await client.post("/bookings", json={})
+
+        assert len(calls) == 1
+        await shared.aclose()
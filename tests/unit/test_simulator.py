@@ -0,0 +1,118 @@
+import pytest
+import httpx
+from datetime import date, timedelta
+from src.simplybook.auth.client import AuthClient
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.bookings.client import BookingsClient
+from src.simplybook.http_client import get_base_url, DEFAULT_BASE_URL
+from src.simplybook.pagination import collect_items
+from tests.simulator import create_app, SimulatorData
+
+SIMULATOR_URL = "http://simulator"
+
+
+@pytest.fixture
+def simulator(monkeypatch):
+    """Simulador en memoria con los clientes reales apuntando a él"""
+    monkeypatch.setenv("SIMPLYBOOK_BASE_URL", SIMULATOR_URL + "/")
+    return create_app(seed=7, clients=30, bookings=80, days=5)
+
+
+@pytest.fixture
+def shared(simulator):
+    # ASGITransport no abre conexiones: no hace falta cerrar el cliente
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=simulator), base_url=SIMULATOR_URL)
+
+
+async def _login(shared) -> dict:
+    auth = AuthClient(shared, TokenManager(persist=False))
+    result = await auth.authenticate("sim_company", "admin", "secret")
+    assert result["success"] is True
+    return {"X-Company-Login": "sim_company", "X-Token": result["token"]}
+
+
+def _next_working_day() -> date:
+    day = date.today() + timedelta(days=1)
+    return day if day.weekday() != 6 else day + timedelta(days=1)
+
+
+class TestSimulator:
+    def test_base_url_override(self, monkeypatch):
+        """SIMPLYBOOK_BASE_URL reemplaza la URL de la API (sin barra final)"""
+        monkeypatch.delenv("SIMPLYBOOK_BASE_URL", raising=False)
+        assert get_base_url() == DEFAULT_BASE_URL
+        monkeypatch.setenv("SIMPLYBOOK_BASE_URL", "http://127.0.0.1:8100/")
+        assert get_base_url() == "http://127.0.0.1:8100"
+        assert BookingsClient({}).base_url == "http://127.0.0.1:8100/admin"
+
+    def test_data_is_deterministic(self):
+        """La misma semilla genera los mismos datos y nunca reservas superpuestas"""
+        first = SimulatorData(seed=3, clients=20, bookings=60, days=5, today=date(2026, 1, 5))
+        second = SimulatorData(seed=3, clients=20, bookings=60, days=5, today=date(2026, 1, 5))
+        assert first.bookings == second.bookings
+
+        active = [b for b in first.bookings if b["status"] != "canceled"]
+        for booking in active:
+            overlapping = [b for b in active
+                           if b["provider_id"] == booking["provider_id"] and b["id"] != booking["id"]
+                           and b["start_datetime"] < booking["end_datetime"]
+                           and booking["start_datetime"] < b["end_datetime"]]
+            assert overlapping == []
+
+    @pytest.mark.asyncio
+    async def test_requires_token(self, shared):
+        """Sin X-Token válido el simulador responde 401 como la API real"""
+        response = await shared.get("/admin/bookings", headers={"X-Company-Login": "sim_company"})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_paginated_bookings(self, simulator, shared):
+        """Los clientes reales recorren todas las páginas con los filtros de la API"""
+        bookings = BookingsClient(await _login(shared), shared)
+
+        items = await collect_items(bookings.iter_bookings(on_page=10, status="confirmed"))
+
+        expected = [b for b in simulator.state.simulator.data.bookings if b["status"] == "confirmed"]
+        assert len(items) == len(expected)
+        assert {b["id"] for b in items} == {b["id"] for b in expected}
+        stats = simulator.state.simulator.stats()
+        assert stats["requests"]["GET /admin/bookings"] == -(-len(expected) // 10)
+
+    @pytest.mark.asyncio
+    async def test_booking_takes_slot(self, shared):
+        """Una reserva creada deja de aparecer en los turnos disponibles"""
+        bookings = BookingsClient(await _login(shared), shared)
+        day = _next_working_day().isoformat()
+
+        before = await bookings.get_available_slots(1, 0, day)
+        assert before == []
+
+        providers = (await shared.get("/admin/services/1", headers=bookings.headers)).json()["providers"]
+        before = await bookings.get_available_slots(1, providers[0], day)
+        created = await bookings.create_booking({
+            "service_id": 1, "provider_id": providers[0], "client_id": 1,
+            "start_datetime": before[0]["id"]
+        })
+        after = await bookings.get_available_slots(1, providers[0], day)
+
+        assert created["bookings"][0]["start_datetime"] == before[0]["id"]
+        assert [slot["id"] for slot in after] == [slot["id"] for slot in before[1:]]
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self, shared, simulator):
+        """Superado el cupo el simulador responde 429 con Retry-After"""
+        simulator.state.simulator.config.update({"rate_limit": 1, "rate_limit_burst": 2})
+
+        statuses = [(await shared.post("/admin/auth", json={})).status_code for _ in range(3)]
+
+        assert statuses == [401, 401, 429]
+        assert simulator.state.simulator.stats()["rate_limited"] == 1
+
+    @pytest.mark.asyncio
+    async def test_error_injection(self, shared):
+        """Los errores se inyectan solo en las rutas configuradas"""
+        await shared.post("/__simulator/config", json={"error_rate": 1, "error_paths": ["/admin/bookings"]})
+
+        assert (await shared.get("/admin/bookings")).status_code == 503
+        assert (await shared.post("/admin/auth", json={})).status_code == 401
+        assert (await shared.get("/__simulator/stats")).json()["injected_errors"] == 1
@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+import httpx
+from fastmcp import FastMCP, Client
+from unittest.mock import MagicMock
+from src.simplybook import middleware as middleware_module
+from src.simplybook.correlation import tool_call, remaining_time
+from src.simplybook.exceptions import DeadlineExceededError
+from src.simplybook.http_client import LoggingHTTPClient, request_timeout
+from src.simplybook.endpoints import get_endpoint_policy
+from src.simplybook.middleware import CorrelationMiddleware, get_tool_deadline
+
+API = "https://user-api-v2.simplybook.me"
+
+
+class TestTimeoutProfiles:
+    def test_endpoint_timeouts(self, monkeypatch):
+        """Cada endpoint toma sus timeouts del registro y el resto usa los globales"""
+        monkeypatch.delenv("SIMPLYBOOK_HTTP_TIMEOUT", raising=False)
+        monkeypatch.setenv("SIMPLYBOOK_ENDPOINT_BOOKINGS_CONNECT_TIMEOUT", "2")
+
+        assert request_timeout(get_endpoint_policy("timeline")).read == 5
+        assert request_timeout(get_endpoint_policy("detailed_report")).read == 120
+        bookings = request_timeout(get_endpoint_policy("bookings"))
+        assert (bookings.connect, bookings.read, bookings.pool) == (2, 30, 10)
+
+    def test_timeouts_clamped_to_remaining_time(self):
+        """Ningún timeout supera el tiempo que le queda a la herramienta"""
+        timeout = request_timeout(get_endpoint_policy("calendar"), remaining=3.0)
+        assert (timeout.connect, timeout.read, timeout.write, timeout.pool) == (3.0, 3.0, 3.0, 3.0)
+
+    def test_tool_deadlines(self, monkeypatch):
+        """Tiempo límite por herramienta con valores por defecto y variables de entorno"""
+        monkeypatch.delenv("SIMPLYBOOK_TOOL_DEADLINE", raising=False)
+        monkeypatch.setenv("SIMPLYBOOK_TOOL_DEADLINE_GET_CLIENTS_LIST", "0")
+
+        assert get_tool_deadline("get_available_slots") == 15
+        assert get_tool_deadline("get_all_bookings") == 120
+        assert get_tool_deadline("get_services") == 60
+        assert get_tool_deadline("get_clients_list") is None
+
+    def test_global_deadline_applies_to_every_tool(self, monkeypatch):
+        """SIMPLYBOOK_TOOL_DEADLINE reemplaza los defaults por herramienta; 0 los desactiva todos"""
+        monkeypatch.setenv("SIMPLYBOOK_TOOL_DEADLINE", "0")
+        monkeypatch.setenv("SIMPLYBOOK_TOOL_DEADLINE_GET_SERVICES", "30")
+
+        assert get_tool_deadline("get_available_slots") is None
+        assert get_tool_deadline("get_all_bookings") is None
+        assert get_tool_deadline("get_services") == 30
+
+        monkeypatch.setenv("SIMPLYBOOK_TOOL_DEADLINE", "300")
+        assert get_tool_deadline("get_available_slots") == 300
+
+
+class TestToolDeadline:
+    @pytest.mark.asyncio
+    async def test_request_fails_with_deadline_error(self):
+        """Un timeout recortado por el tiempo límite no se reintenta y no abre el circuito"""
+        calls = []
+
+        async def respond(request: httpx.Request) -> httpx.Response:
+            calls.append(request.extensions["timeout"])
+            await asyncio.sleep(0.2)
+            raise httpx.ReadTimeout("timeout", request=request)
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        with tool_call("get_available_slots", budget=0.1):
+            with pytest.raises(DeadlineExceededError) as error:
+                await LoggingHTTPClient(f"{API}/admin", {}, shared).get("/timeline/slots")
+            assert remaining_time() < 0
+        await shared.aclose()
+
+        assert len(calls) == 1
+        assert calls[0]["read"] <= 0.1
+        assert error.value.to_response()["error_type"] == "deadline_exceeded"
+        assert error.value.details["tool"] == "get_available_slots"
+
+    @pytest.mark.asyncio
+    async def test_middleware_cuts_slow_tool(self, monkeypatch):
+        """La invocación se corta al agotar el tiempo límite pedido en _meta.timeout_ms"""
+        monkeypatch.setattr(middleware_module, "api_logger", MagicMock())
+        monkeypatch.setattr(middleware_module, "DEADLINE_GRACE", 0.0)
+
+        mcp = FastMCP("test")
+        mcp.add_middleware(CorrelationMiddleware())
+
+        @mcp.tool()
+        async def slow() -> dict:
+            await asyncio.sleep(5)
+            return {"done": True}
+
+        @mcp.tool()
+        async def budget() -> dict:
+            return {"remaining": remaining_time()}
+
+        async with Client(mcp) as mcp_client:
+            remaining = (await mcp_client.call_tool("budget", meta={"timeout_ms": 2000})).data["remaining"]
+            result = await mcp_client.call_tool("slow", meta={"timeout_ms": 100}, raise_on_error=False)
+
+        assert 0 < remaining <= 2
+        assert result.is_error
+        assert "tiempo límite" in result.content[0].text
@@ -0,0 +1,74 @@
+import httpx
+import pytest
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.auth.token_auth import TokenAuth
+from src.simplybook.bookings.client import BookingsClient
+
+
+class TestTokenAuth:
+    @pytest.fixture
+    def token_manager(self):
+        manager = TokenManager(persist=False)
+        manager.set_token("ta_company", "stale_token")
+        yield manager
+        manager.clear_token("ta_company")
+
+    def _build_client(self, token_manager, seen_tokens, logins, status_for_stale=401):
+        def handler(request: httpx.Request) -> httpx.Response:
+            seen_tokens.append(request.headers.get("X-Token"))
+            if request.headers.get("X-Token") == "stale_token":
+                return httpx.Response(status_for_stale, json={"message": "Token is invalid"})
+            return httpx.Response(200, json={"id": 1})
+
+        async def authenticate():
+            logins.append(1)
+            token_manager.set_token("ta_company", "fresh_token")
+            return {"success": True}
+
+        return httpx.AsyncClient(
+            transport=httpx.MockTransport(handler),
+            auth=TokenAuth(token_manager, "ta_company", authenticate)
+        )
+
+    @pytest.mark.asyncio
+    async def test_401_reauthenticates_and_replays(self, token_manager):
+        """Un 401 invalida el token, re-autentica y repite la petición"""
+        seen_tokens, logins = [], []
+        shared = self._build_client(token_manager, seen_tokens, logins)
+        bookings = BookingsClient({"X-Company-Login": "ta_company", "X-Token": "stale_token"}, shared)
+
+        result = await bookings.get_booking_details("1")
+
+        assert result == {"id": 1}
+        assert seen_tokens == ["stale_token", "fresh_token"]
+        assert logins == [1]
+        assert token_manager.get_token("ta_company") == "fresh_token"
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_401_single_login(self, token_manager):
+        """Varias peticiones rechazadas a la vez comparten una única re-autenticación"""
+        import asyncio
+        seen_tokens, logins = [], []
+        shared = self._build_client(token_manager, seen_tokens, logins)
+        headers = {"X-Company-Login": "ta_company", "X-Token": "stale_token"}
+
+        results = await asyncio.gather(*[
+            BookingsClient(headers, shared).get_booking_details(str(i)) for i in range(5)
+        ])
+
+        assert all(r == {"id": 1} for r in results)
+        assert logins == [1]
+        await shared.aclose()
+
+    @pytest.mark.asyncio
+    async def test_requests_without_token_are_untouched(self, token_manager):
+        """Las peticiones sin X-Token (login) no se reintentan"""
+        seen_tokens, logins = [], []
+        shared = self._build_client(token_manager, seen_tokens, logins)
+
+        response = await shared.post("https://example.test/admin/auth", json={})
+
+        assert response.status_code == 200
+        assert logins == []
+        await shared.aclose()
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import os
+import time
+import pytest
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.base_routes import BaseRoutes
+
+
+class TestTokenManager:
+    @pytest.fixture
+    def token_manager(self):
+        manager = TokenManager()
+        yield manager
+        manager.clear_token("tm_company")
+
+    def test_set_and_get_token(self, token_manager):
+        """Test de guardado y lectura del token en memoria"""
+        token_manager.set_token("tm_company", "token_1")
+
+        assert token_manager.get_token("tm_company") == "token_1"
+        assert os.path.exists(token_manager.get_token_file_path("tm_company"))
+
+    def test_get_token_does_not_reread_disk(self, token_manager):
+        """El token se sirve desde memoria aunque el archivo cambie"""
+        token_manager.set_token("tm_company", "token_1")
+        with open(token_manager.get_token_file_path("tm_company"), "w") as f:
+            json.dump({"token": "token_disk", "created_at": time.time()}, f)
+
+        assert token_manager.get_token("tm_company") == "token_1"
+
+    def test_warm_start_from_disk(self, token_manager):
+        """Un TokenManager nuevo arranca con el token persistido"""
+        token_manager.set_token("tm_company", "token_1")
+
+        fresh = TokenManager()
+        assert fresh.get_token("tm_company") == "token_1"
+
+    def test_expired_token(self, token_manager):
+        """Un token más antiguo que max_age no se devuelve"""
+        token_manager.set_token("tm_company", "token_1")
+        token_manager._tokens["tm_company"]["created_at"] = time.time() - 7200
+
+        assert token_manager.get_token("tm_company") is None
+
+    @pytest.mark.asyncio
+    async def test_single_flight_authentication(self, token_manager):
+        """Las corrutinas concurrentes comparten una única autenticación"""
+        calls = []
+
+        async def authenticate():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            token_manager.set_token("tm_company", "token_shared")
+            return {"success": True}
+
+        tokens = await asyncio.gather(*[
+            token_manager.get_or_authenticate("tm_company", authenticate)
+            for _ in range(10)
+        ])
+
+        assert len(calls) == 1
+        assert tokens == ["token_shared"] * 10
+
+    @pytest.mark.asyncio
+    async def test_routers_share_token_manager(self, token_manager):
+        """Los routers que comparten TokenManager no se re-autentican"""
+        token_manager.set_token("tm_company", "token_1")
+        first = BaseRoutes("tm_company", "login", "password", token_manager=token_manager)
+        second = BaseRoutes("tm_company", "login", "password", token_manager=token_manager)
+
+        assert await first.ensure_authenticated() is True
+        assert await second.ensure_authenticated() is True
+        assert second.get_auth_headers()["X-Token"] == "token_1"
+
+
+class TestTokenRefresh:
+    @pytest.fixture
+    def token_manager(self):
+        manager = TokenManager(max_age=3600, refresh_margin=300, persist=False)
+        yield manager
+        manager.clear_token("tm_refresh")
+
+    def test_seconds_until_refresh(self, token_manager):
+        """La renovación se programa refresh_margin segundos antes de expirar"""
+        assert token_manager.seconds_until_refresh("tm_refresh") == 0
+        token_manager.set_token("tm_refresh", "token_1", "refresh_1")
+
+        assert 3290 < token_manager.seconds_until_refresh("tm_refresh") <= 3300
+        assert token_manager.get_refresh_token("tm_refresh") == "refresh_1"
+
+    @pytest.mark.asyncio
+    async def test_refresh_uses_refresh_token(self, token_manager):
+        """Un token próximo a expirar se renueva sin hacer login"""
+        token_manager.set_token("tm_refresh", "token_1", "refresh_1")
+        token_manager._tokens["tm_refresh"]["created_at"] = time.time() - 3400
+        logins = []
+
+        async def refresh(refresh_token):
+            assert refresh_token == "refresh_1"
+            token_manager.set_token("tm_refresh", "token_2", "refresh_2")
+            return {"token": "token_2"}
+
+        async def authenticate():
+            logins.append(1)
+            return {"success": True}
+
+        token = await token_manager.refresh("tm_refresh", refresh, authenticate)
+
+        assert token == "token_2"
+        assert logins == []
+
+    @pytest.mark.asyncio
+    async def test_refresh_falls_back_to_login(self, token_manager):
+        """Si el refresh_token es rechazado se hace login completo"""
+        token_manager.set_token("tm_refresh", "token_1", "refresh_1")
+        token_manager._tokens["tm_refresh"]["created_at"] = time.time() - 3400
+
+        async def refresh(refresh_token):
+            raise Exception("401 Unauthorized")
+
+        async def authenticate():
+            token_manager.set_token("tm_refresh", "token_login", "refresh_login")
+            return {"success": True}
+
+        token = await token_manager.refresh("tm_refresh", refresh, authenticate)
+
+        assert token == "token_login"
+
+    @pytest.mark.asyncio
+    async def test_auto_refresh_logs_in_at_startup(self, token_manager):
+        """La tarea en segundo plano obtiene el token antes de la primera herramienta"""
+        async def refresh(refresh_token):
+            return {}
+
+        async def authenticate():
+            token_manager.set_token("tm_refresh", "token_startup")
+            return {"success": True}
+
+        token_manager.start_auto_refresh("tm_refresh", refresh, authenticate)
+        await asyncio.sleep(0.05)
+        await token_manager.stop_auto_refresh()
+
+        assert token_manager.get_token("tm_refresh") == "token_startup"
@@ -0,0 +1,106 @@
+import pytest
+import httpx
+from contextlib import contextmanager
+from fastmcp import FastMCP, Client
+from src.simplybook import tracing as tracing_module
+from src.simplybook.auth.token_manager import TokenManager
+from src.simplybook.base_routes import BaseRoutes
+from src.simplybook.middleware import CorrelationMiddleware
+from src.simplybook.providers.client import ProvidersClient
+from src.simplybook.tracing import configure_tracing, span, shutdown_tracing
+
+
+class _FakeSpan:
+    def __init__(self, name, attributes, parent):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+
+class _FakeTracer:
+    """Tracer mínimo que registra los spans y su padre, sin opentelemetry-sdk"""
+
+    def __init__(self):
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def start_as_current_span(self, name, attributes=None):
+        current = _FakeSpan(name, dict(attributes or {}), self._stack[-1].name if self._stack else None)
+        self.spans.append(current)
+        self._stack.append(current)
+        try:
+            yield current
+        finally:
+            self._stack.pop()
+
+
+class TestTracing:
+    def test_disabled_by_default(self):
+        """Sin SIMPLYBOOK_TRACING_ENABLED no se configura nada y span() no hace nada"""
+        assert configure_tracing({"enabled": False}) is False
+        with span("noop") as current:
+            assert current is None
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_tool_to_http(self, monkeypatch):
+        """Herramienta -> autenticación -> método del cliente -> petición HTTP"""
+        tracer = _FakeTracer()
+        monkeypatch.setattr(tracing_module, "_tracer", tracer)
+
+        sent = []
+
+        def respond(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200, json={"id": 1})
+
+        shared = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        token_manager = TokenManager(persist=False)
+        token_manager.set_token("trace_company", "token_1")
+        routes = BaseRoutes("trace_company", "login", "password", shared, token_manager)
+
+        mcp = FastMCP("test")
+        mcp.add_middleware(CorrelationMiddleware())
+
+        @mcp.tool()
+        async def get_provider() -> dict:
+            await routes.ensure_authenticated()
+            return await ProvidersClient(routes.get_auth_headers(), shared).get_provider("1")
+
+        monkeypatch.setattr(tracing_module, "inject_context", lambda headers: None)
+        async with Client(mcp) as mcp_client:
+            await mcp_client.call_tool("get_provider")
+        await shared.aclose()
+
+        spans = [(s.name, s.parent) for s in tracer.spans]
+        assert spans == [
+            ("tool get_provider", None),
+            ("BaseRoutes.ensure_authenticated", "tool get_provider"),
+            ("ProvidersClient.get_provider", "tool get_provider"),
+            ("HTTP GET", "ProvidersClient.get_provider")
+        ]
+        http_span = tracer.spans[-1]
+        assert http_span.attributes["http.response.status_code"] == 200
+        assert http_span.attributes["simplybook.endpoint"] == "/providers"
+        assert http_span.attributes["simplybook.request_id"] == sent[0].headers["X-Request-ID"]
+
+    def test_sdk_exporter(self):
+        """Con opentelemetry-sdk los spans anidados llegan al exportador"""
+        pytest.importorskip("opentelemetry.sdk")
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+        exporter = InMemorySpanExporter()
+        assert configure_tracing({"enabled": True, "service_name": "test"}, exporter=exporter)
+        try:
+            with span("outer"):
+                with span("inner", **{"simplybook.endpoint": "/bookings"}):
+                    pass
+        finally:
+            shutdown_tracing()
+
+        finished = {s.name: s for s in exporter.get_finished_spans()}
+        assert finished["inner"].parent.span_id == finished["outer"].context.span_id
+        assert finished["inner"].attributes["simplybook.endpoint"] == "/bookings"
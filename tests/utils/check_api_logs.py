@@ -3,70 +3,52 @@
 Script para verificar y analizar los logs de la API de SimplyBook.me
 """
 
+import glob
+import gzip
 import json
 import os
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 
 
-def read_api_logs(log_file: str = "logs/simplybook_api.log") -> List[Dict[str, Any]]:
-    """Leer y parsear los logs de la API"""
-    logs = []
-    
-    if not os.path.exists(log_file):
+LOG_FILE = os.getenv("SIMPLYBOOK_API_LOG_FILE", "logs/simplybook_api.jsonl")
+
+
+def get_log_segments(log_file: str = LOG_FILE) -> List[str]:
+    """Segmentos del log del más antiguo al más reciente: .N.gz, ..., .1.gz y el archivo activo"""
+    rotated = glob.glob(f"{glob.escape(log_file)}.*.gz")
+    rotated.sort(key=lambda path: int(path[len(log_file) + 1:-3]) if path[len(log_file) + 1:-3].isdigit() else 0,
+                 reverse=True)
+    return rotated + ([log_file] if os.path.exists(log_file) else [])
+
+
+def iter_api_logs(log_file: str = LOG_FILE, include_rotated: bool = True) -> Iterator[Dict[str, Any]]:
+    """Recorrer las entradas del log JSON Lines una a una, sin cargar el archivo entero"""
+    segments = get_log_segments(log_file) if include_rotated else [log_file]
+    for segment in segments:
+        opener = gzip.open if segment.endswith(".gz") else open
+        with opener(segment, 'rt', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"⚠️  Línea {line_number} de {segment} no es JSON válido: {e}")
+
+
+def read_api_logs(log_file: str = LOG_FILE, include_rotated: bool = True) -> List[Dict[str, Any]]:
+    """Leer y parsear los logs de la API (una entrada JSON por línea)"""
+    if not get_log_segments(log_file):
         print(f"❌ Archivo de log no encontrado: {log_file}")
-        return logs
+        return []
     
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-            
-        # Dividir por líneas de log (timestamp al inicio)
-        lines = content.split('\n')
-        current_log = ""
-        in_json = False
-        
-        for line in lines:
-            # Verificar si es una nueva línea de log (empieza con timestamp)
-            if line.startswith('2025-') and ('API REQUEST' in line or 'API RESPONSE' in line or 'API ERROR' in line):
-                # Procesar el log anterior si existe
-                if current_log and in_json:
-                    try:
-                        # Extraer el JSON del log
-                        start_idx = current_log.find('{')
-                        if start_idx != -1:
-                            json_str = current_log[start_idx:]
-                            log_entry = json.loads(json_str)
-                            logs.append(log_entry)
-                    except json.JSONDecodeError as e:
-                        print(f"⚠️  Error parseando JSON: {e}")
-                        print(f"   Log: {current_log[:100]}...")
-                
-                # Iniciar nuevo log
-                current_log = line
-                in_json = '{' in line
-            elif in_json and line.strip():
-                # Continuar acumulando el JSON
-                current_log += '\n' + line
-            elif in_json and not line.strip():
-                # Línea vacía, seguir acumulando
-                current_log += '\n'
-        
-        # Procesar el último log
-        if current_log and in_json:
-            try:
-                start_idx = current_log.find('{')
-                if start_idx != -1:
-                    json_str = current_log[start_idx:]
-                    log_entry = json.loads(json_str)
-                    logs.append(log_entry)
-            except json.JSONDecodeError as e:
-                print(f"⚠️  Error parseando último JSON: {e}")
-    
+        return list(iter_api_logs(log_file, include_rotated))
     except Exception as e:
         print(f"❌ Error leyendo logs: {e}")
-    
-    return logs
+        return []
 
 
 def analyze_logs(logs: List[Dict[str, Any]]) -> None:
@@ -79,9 +61,9 @@ def analyze_logs(logs: List[Dict[str, Any]]) -> None:
     print("=" * 60)
     
     # Estadísticas generales
-    requests = [log for log in logs if "request_id" in log and "method" in log]
-    responses = [log for log in logs if "request_id" in log and "status_code" in log]
-    errors = [log for log in logs if "error" in log]
+    requests = [log for log in logs if log.get("event") == "request"]
+    responses = [log for log in logs if log.get("event") == "response"]
+    errors = [log for log in logs if log.get("event") == "error" or (log.get("event") == "response" and "error" in log)]
     
     print(f"📤 Requests: {len(requests)}")
     print(f"📥 Responses: {len(responses)}")
@@ -131,6 +113,27 @@ def analyze_logs(logs: List[Dict[str, Any]]) -> None:
         print(f"   Máximo: {max_duration:.2f}ms")
         print(f"   Mínimo: {min_duration:.2f}ms")
     
+    # Duración por herramienta: cada invocación con sus requests (mismo call_id)
+    tool_calls = [log for log in logs if log.get("event") == "tool"]
+    if tool_calls:
+        upstream_calls = {}
+        for req in requests:
+            if req.get("call_id"):
+                upstream_calls[req["call_id"]] = upstream_calls.get(req["call_id"], 0) + 1
+        
+        tools = {}
+        for call in tool_calls:
+            stats = tools.setdefault(call.get("tool", "N/A"), {"calls": 0, "duration": 0.0, "requests": 0})
+            stats["calls"] += 1
+            stats["duration"] += call.get("duration_ms") or 0
+            stats["requests"] += upstream_calls.get(call.get("call_id"), 0)
+        
+        print(f"\n🛠️  Herramientas:")
+        for tool, stats in sorted(tools.items(), key=lambda x: x[1]["duration"], reverse=True):
+            print(f"   {tool}: {stats['calls']} llamadas, "
+                  f"{stats['duration'] / stats['calls']:.2f}ms promedio, "
+                  f"{stats['requests'] / stats['calls']:.1f} requests por llamada")
+    
     # Mostrar errores recientes
     if errors:
         print(f"\n❌ Errores recientes:")
@@ -140,12 +143,14 @@ def analyze_logs(logs: List[Dict[str, Any]]) -> None:
 
 def show_recent_requests(logs: List[Dict[str, Any]], limit: int = 10) -> None:
     """Mostrar los requests más recientes"""
-    requests = [log for log in logs if "request_id" in log and "method" in log]
+    requests = [log for log in logs if log.get("event") == "request"]
     
     if not requests:
         print("📭 No se encontraron requests")
         return
     
+    responses_by_id = {log.get("request_id"): log for log in logs if log.get("event") == "response"}
+    
     # Ordenar por timestamp
     requests.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
     
@@ -159,11 +164,7 @@ def show_recent_requests(logs: List[Dict[str, Any]], limit: int = 10) -> None:
         url = req.get("url", "N/A")
         
         # Buscar la respuesta correspondiente
-        response = None
-        for resp in logs:
-            if resp.get("request_id") == request_id and "status_code" in resp:
-                response = resp
-                break
+        response = responses_by_id.get(request_id)
         
         status_code = response.get("status_code", "N/A") if response else "N/A"
         duration = response.get("duration_ms", "N/A") if response else "N/A"
@@ -193,14 +194,12 @@ def main():
     # Mostrar requests recientes
     show_recent_requests(logs, limit=5)
     
-    # Mostrar archivo de log
-    log_file = "logs/simplybook_api.log"
-    if os.path.exists(log_file):
-        file_size = os.path.getsize(log_file)
-        print(f"📁 Archivo de log: {log_file}")
+    # Mostrar archivos de log
+    for segment in get_log_segments():
+        file_size = os.path.getsize(segment)
+        print(f"📁 Archivo de log: {segment}")
         print(f"📏 Tamaño: {file_size} bytes")
-        print(f"📅 Última modificación: {datetime.fromtimestamp(os.path.getmtime(log_file))}")
-
+        print(f"📅 Última modificación: {datetime.fromtimestamp(os.path.getmtime(segment))}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file